@@ -86,6 +86,10 @@ alter table public.sl_players
 create index idx_players_name
     on public.sl_players (name);
 
+-- 선수 이름 앞부분 검색 (/api/players?q=, lower(name) LIKE 'abc%' - collation과 관계없이 사용 가능)
+create index idx_players_name_lower
+    on public.sl_players (lower(name) text_pattern_ops);
+
 create table public.sl_team_season_map
 (
     id        serial
@@ -122,10 +126,12 @@ create table public.sl_player_squads
 alter table public.sl_player_squads
     owner to hongun;
 
+-- 경기/경기별 기록은 game_date 기준 연도별 파티션 (backend/partitions.py가 파티션 생성, 오래된 연도 분리/보관)
+-- 파티션 키가 기본 키에 들어가야 하므로 기본 키는 (id, game_date)
+-- 수집 스크립트는 이미 저장된 경기의 game_date를 바꾸지 않으므로 id만으로도 한 행입니다.
 create table public.sl_games
 (
-    id           bigint                   not null
-        primary key,
+    id           bigint                   not null,
     season_id    integer
         references public.sl_seasons,
     league_id    bigint
@@ -139,17 +145,37 @@ create table public.sl_games
     home_score   integer,
     away_score   integer,
     score_detail jsonb                    default '{}'::jsonb,
-    created_at   timestamp with time zone default now()
-);
+    created_at   timestamp with time zone default now(),
+    primary key (id, game_date)
+) partition by range (game_date);
 
 alter table public.sl_games
     owner to hongun;
 
+-- 연도 파티션이 없는 날짜(스텁 경기의 1970-01-01 등)를 받는 기본 파티션
+create table public.sl_games_default
+    partition of public.sl_games default;
+
 create index idx_games_date
     on public.sl_games (game_date);
 
-create index idx_games_league
-    on public.sl_games (league_id);
+-- 리그별 최신순 (league_id 단독 조회도 이 인덱스의 앞부분으로 처리)
+create index idx_games_league_date
+    on public.sl_games (league_id, game_date desc);
+
+-- 경기결과/홈 화면: 리그의 끝난 경기 최신순 (status IN 조건이 같거나 좁은 쿼리에서 사용)
+create index idx_games_results
+    on public.sl_games (league_id, game_date desc)
+    where status in ('STATUS_FINAL', 'STATUS_FULL_TIME', 'STATUS_POSTPONED');
+
+-- 경기일정 화면: 리그의 남은/진행 중 경기 날짜순
+create index idx_games_upcoming
+    on public.sl_games (league_id, game_date)
+    where status in ('STATUS_SCHEDULED', 'STATUS_FIRST_HALF', 'STATUS_SECOND_HALF', 'STATUS_IN_PROGRESS');
+
+-- 시즌 단위 조회 (naver_schedule.pending_months 등)
+create index idx_games_season
+    on public.sl_games (season_id, game_date);
 
 create table public.sl_player_season_stats
 (
@@ -174,13 +200,66 @@ alter table public.sl_player_season_stats
 create index idx_player_stats_json
     on public.sl_player_season_stats using gin (stats);
 
-create table public.sl_player_game_stats
+-- 시즌 기록 JSONB에서 뽑은 종목별 주요 스탯 (backend/hot_stats.py가 수집 시 함께 저장)
+-- stat_key: avg, hr, ab, era, ip (야구) / goals, assists (축구) / pts (농구) ...
+create table public.sl_player_stat_values
 (
-    id             serial
+    id         serial
         primary key,
-    game_id        bigint
-        references public.sl_games
+    player_id  bigint
+        references public.sl_players
             on delete cascade,
+    season_id  integer
+        references public.sl_seasons
+            on delete cascade,
+    team_id    bigint           not null
+        references public.sl_teams,
+    stat_key   varchar(20)      not null,
+    value      double precision not null,
+    updated_at timestamp with time zone default now(),
+    unique (player_id, season_id, team_id, stat_key)
+);
+
+alter table public.sl_player_stat_values
+    owner to hongun;
+
+-- 순위 조회 (시즌 + 스탯 → 값 순서) 인덱스 범위 스캔
+create index idx_stat_values_rank
+    on public.sl_player_stat_values (season_id, stat_key, value desc);
+
+-- 순위표 증분 갱신 시 지난 갱신 이후 바뀐 행 찾기 (backend/leaderboards.py)
+create index idx_stat_values_updated
+    on public.sl_player_stat_values (updated_at);
+
+-- 시즌 x 스탯 상위 N명 순위표 (backend/leaderboards.py가 수집 후 갱신, 웹은 기본 키로 한 번에 조회)
+create table public.sl_leaderboards
+(
+    season_id   integer          not null
+        references public.sl_seasons
+            on delete cascade,
+    stat_key    varchar(20)      not null,
+    rank        integer          not null,
+    player_id   bigint           not null
+        references public.sl_players
+            on delete cascade,
+    team_id     bigint
+        references public.sl_teams,
+    player_name varchar(100),
+    team_name   varchar(100),
+    value       double precision not null,
+    updated_at  timestamp with time zone default now(),
+    primary key (season_id, stat_key, rank)
+);
+
+alter table public.sl_leaderboards
+    owner to hongun;
+
+-- game_date: sl_games.game_date 복사본 (경기와 같은 연도 파티션에 저장, 수집 시 sl_games에서 채움)
+create table public.sl_player_game_stats
+(
+    id             serial,
+    game_id        bigint                   not null,
+    game_date      timestamp with time zone not null,
     player_id      bigint
         references public.sl_players
             on delete cascade,
@@ -189,9 +268,20 @@ create table public.sl_player_game_stats
     minutes_played integer,
     rating         numeric(3, 1),
     stats          jsonb default '{}'::jsonb not null,
-    unique (game_id, player_id)
-);
+    primary key (id, game_date),
+    unique (game_id, player_id, game_date),
+    constraint sl_player_game_stats_game_fk
+        foreign key (game_id, game_date) references public.sl_games (id, game_date)
+            on delete cascade
+) partition by range (game_date);
 
 alter table public.sl_player_game_stats
     owner to hongun;
 
+create table public.sl_player_game_stats_default
+    partition of public.sl_player_game_stats default;
+
+-- 선수 상세 화면의 최근 경기 기록 (파티션마다 player_id로 찾아 최신순으로 합침)
+create index idx_player_game_stats_player
+    on public.sl_player_game_stats (player_id, game_date desc);
+
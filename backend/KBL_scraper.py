@@ -1,5 +1,4 @@
 import os
-import time
 import re
 import json
 import psycopg2
@@ -11,6 +10,7 @@ from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+import page_waits
 
 # --- 환경 설정 ---
 def load_env(path: Path) -> None:
@@ -62,12 +62,10 @@ class KBLFullScraper:
     def scrape_teams(self):
         print("\n🏀 [1단계] 팀 정보 수집 시작...")
         self.driver.get("https://www.kbl.or.kr/team/intro")
-        time.sleep(3) # 로딩 대기
         
         try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "team_list"))
-            )
+            # 로딩 대기 (목록이 나타나는 즉시 진행)
+            page_waits.wait_css(self.driver, ".team_list", "KBL 팀 목록", timeout=20)
             soup = BeautifulSoup(self.driver.page_source, 'html.parser')
             team_list = soup.select(".team_list li")
             
@@ -108,11 +106,10 @@ class KBLFullScraper:
     def scrape_players(self):
         print("\n🏀 [2단계] 선수 목록 수집 시작...")
         self.driver.get("https://www.kbl.or.kr/player/player")
-        time.sleep(4)
         
         try:
             # 테이블 로딩 확인
-            WebDriverWait(self.driver, 20).until(EC.presence_of_element_located((By.CLASS_NAME, "player_list")))
+            page_waits.wait_css(self.driver, ".player_list", "KBL 선수 목록", timeout=20)
             
             # 전체 페이지 수 파악 (데스크탑 뷰 기준)
             paging_box = WebDriverWait(self.driver, 10).until(
@@ -132,9 +129,8 @@ class KBLFullScraper:
                     select = Select(select_elem)
                     
                     if select.first_selected_option.get_attribute("value") != str(page_num):
-                        select.select_by_value(str(page_num))
-                        time.sleep(2) # 데이터 로딩 대기
-                        WebDriverWait(self.driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, "player_list")))
+                        # 데이터 로딩 대기 (기존 표가 바뀔 때까지)
+                        page_waits.postback(self.driver, lambda: select.select_by_value(str(page_num)), ".player_list tbody", "KBL 선수 페이지 이동")
                     
                     # 파싱
                     self.parse_and_save_players()
@@ -142,7 +138,7 @@ class KBLFullScraper:
                 except Exception as e:
                     print(f"    ⚠️ {page_num}페이지 에러: {e}")
                     self.driver.refresh()
-                    time.sleep(3)
+                    page_waits.wait_css(self.driver, ".player_list", "KBL 새로고침", timeout=20)
                     continue
 
         except Exception as e:
@@ -203,12 +199,9 @@ class KBLFullScraper:
     def scrape_schedule(self):
         print("\n🏀 [3단계] 경기 일정 수집 시작...")
         self.driver.get("https://www.kbl.or.kr/match/schedule?type=SCHEDULE")
-        time.sleep(5)
         
         try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "schedule_list"))
-            )
+            page_waits.wait_css(self.driver, ".schedule_list", "KBL 경기 일정", timeout=20)
             soup = BeautifulSoup(self.driver.page_source, 'html.parser')
             
             days = soup.select(".schedule_list .day_list")
@@ -238,6 +231,7 @@ class KBLFullScraper:
         self.scrape_teams()
         self.scrape_players()
         self.scrape_schedule()
+        page_waits.print_stats()
 
 if __name__ == "__main__":
     scraper = KBLFullScraper()
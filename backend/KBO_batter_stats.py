@@ -1,14 +1,15 @@
 import os
 import psycopg2
 import json
-import time
-import re
+import argparse
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from webdriver_manager.chrome import ChromeDriverManager
+from id_resolver import IdResolver
+import kbo_http
+import page_waits
+import html_tables
+import kbo_season_tables
+import hot_stats
+import sync_journal
 
 # --- 환경 설정 ---
 def load_env(path: Path) -> None:
@@ -28,13 +29,237 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT", "5432"),
 }
 
-def get_team_id(cur, team_name):
-    if not team_name: return None
-    cur.execute("SELECT id FROM sl_teams WHERE name LIKE %s LIMIT 1", (f"%{team_name}%",))
-    row = cur.fetchone()
-    return row[0] if row else None
+def get_team_id(resolver, team_name):
+    # sl_teams를 미리 읽어 둔 캐시에서 이름으로 조회
+    return resolver.team_id_by_name(team_name)
 
-def sync_batter_details():
+SEASON_SELECT = "#cphContents_cphContents_cphContents_ddlSeason_ddlSeason"
+
+def scrape_player(driver, p_id, career=True):
+    """
+    브라우저 풀의 워커 스레드에서 실행: 선수 한 명의 통산/기본 기록 페이지를 읽어 파싱 결과만 돌려줍니다.
+    (DB 저장은 메인 스레드에서, 각 페이지는 page_source 한 번으로 파싱)
+    career=False면 통산 기록(Total.aspx)은 건너뛰고 기본 기록만 읽습니다. (순위표로 시즌 기록을 채운 선수)
+    """
+    result = {"career": [], "basic": None}
+
+    if career:
+        # =========================================================
+        # 1. 통산 기록 (Total.aspx)
+        # =========================================================
+        total_url = f"https://www.koreabaseball.com/Record/Player/HitterDetail/Total.aspx?playerId={p_id}"
+        driver.get(total_url)
+        page_waits.wait_ready(driver, "타자 통산 기록 로딩")
+
+        result["career"] = parse_career(html_tables.snapshot(driver))
+        if result["career"] is None:
+            return result # 통산 기록 없으면 다음 선수로
+
+    # =========================================================
+    # 2. 기본 기록 (Basic1.aspx) - 세부 스탯(희생타 등) 보강
+    # =========================================================
+    basic_url = f"https://www.koreabaseball.com/Record/Player/HitterDetail/Basic1.aspx?playerId={p_id}"
+    driver.get(basic_url)
+    page_waits.wait_ready(driver, "타자 기본 기록 로딩")
+
+    result["basic"] = parse_basic(html_tables.snapshot(driver))
+    return result
+
+def scrape_player_http(client, p_id, career=True):
+    """scrape_player의 브라우저 없는 버전 (두 페이지 모두 playerId 쿼리만 있는 일반 GET)"""
+    result = {"career": [], "basic": None}
+    if career:
+        result["career"] = parse_career(client.get_soup("https://www.koreabaseball.com/Record/Player/HitterDetail/Total.aspx", {"playerId": p_id}))
+        if result["career"] is None:
+            return result
+    result["basic"] = parse_basic(client.get_soup("https://www.koreabaseball.com/Record/Player/HitterDetail/Basic1.aspx", {"playerId": p_id}))
+    return result
+
+def parse_career(soup):
+    """통산 기록 표 파싱: [(연도, 팀 이름, stats), ...] / 표가 없으면 None"""
+    # [수정] 클래스 이름 대신 'summary="통산기록"' 속성으로 테이블 찾기 (가장 정확)
+    # 만약 summary가 없다면 테이블 텍스트로 찾음
+    career_table = html_tables.find_table(soup, summary="통산기록", keywords=("연도", "타율"))
+    if not career_table:
+        return None
+
+    career = []
+    # 헤더: 연도, 팀명, AVG, G, PA, AB, R, H, 2B, 3B, HR, TB, RBI, SB, CS, BB, HBP, SO, GDP, SLG, OBP
+    for cols in html_tables.table_rows(career_table, "tbody tr", min_cols=20):
+        year_text = cols[0].text.strip()
+        if not year_text.isdigit(): continue
+        
+        year = int(year_text)
+        team_name = cols[1].text.strip()
+        
+        try:
+            # 데이터 파싱 (순서 중요)
+            # [2]AVG [3]G [4]PA [5]AB [6]R [7]H [8]2B [9]3B [10]HR [11]TB [12]RBI [13]SB [14]CS [15]BB [16]HBP [17]SO [18]GDP [19]SLG [20]OBP
+            slg = cols[19].text.strip()
+            obp = cols[20].text.strip()
+            
+            stats = {
+                "AVG": cols[2].text.strip(),
+                "G": int(cols[3].text.strip()),
+                "PA": int(cols[4].text.strip()),
+                "AB": int(cols[5].text.strip()),
+                "R": int(cols[6].text.strip()),
+                "H": int(cols[7].text.strip()),
+                "2B": int(cols[8].text.strip()),
+                "3B": int(cols[9].text.strip()),
+                "HR": int(cols[10].text.strip()),
+                "TB": int(cols[11].text.strip()), # 루타
+                "RBI": int(cols[12].text.strip()),
+                "SB": int(cols[13].text.strip()),
+                "CS": int(cols[14].text.strip()),
+                "BB": int(cols[15].text.strip()),
+                "HBP": int(cols[16].text.strip()),
+                "SO": int(cols[17].text.strip()),
+                "GDP": int(cols[18].text.strip()),
+                "SLG": slg,
+                "OBP": obp
+            }
+            
+            # OPS
+            try:
+                ops = float(slg) + float(obp)
+                stats["OPS"] = f"{ops:.3f}"
+            except:
+                stats["OPS"] = "0.000"
+
+            career.append((year, team_name, stats))
+        
+        except (AttributeError, IndexError, ValueError):
+            continue # 합계/빈 행 등 형식이 다른 행
+    return career
+
+def parse_basic(soup):
+    """기본 기록 페이지 파싱: (현재 선택된 연도, 세부 스탯) / 없으면 None"""
+    try:
+        # 현재 선택된 시즌 확인
+        selected = soup.select_one(f"{SEASON_SELECT} option[selected]") or soup.select_one(f"{SEASON_SELECT} option")
+        curr_year = int(selected.get_text(strip=True))
+
+        # 테이블 2개 찾기 (주요기록, 세부기록)
+        # summary="...성적으로..." 포함된 테이블들
+        tables = soup.select("table.tbl.tt")
+        
+        detailed_stats = {}
+        
+        # 두 번째 테이블 (세부 기록: BB, IBB, HBP ... SAC, SF)
+        if len(tables) > 1:
+            rows2 = html_tables.table_rows(tables[1], "tbody tr")
+            cols2 = rows2[0] if rows2 else []
+            # 헤더: BB, IBB, HBP, SO, GDP, SLG, OBP, E, SB%, MH, OPS, RISP, PH-BA
+            # 주의: 타자_기본기록.txt 분석 결과, IBB는 1번 인덱스에 있음
+            if len(cols2) >= 10:
+                try:
+                    # 1번째: IBB (고의4구)
+                    detailed_stats["IBB"] = int(cols2[1].text.strip())
+                    
+                    # 첫 번째 테이블의 마지막 컬럼들 확인 (SAC, SF가 여기 있을 수 있음)
+                    # 분석 결과: Table 1 헤더 끝에 SAC, SF가 있음!
+                    # Table 1: ..., SAC, SF
+                    rows1 = html_tables.table_rows(tables[0], "tbody tr")
+                    cols1 = rows1[0] if rows1 else []
+                    
+                    if len(cols1) >= 16:
+                        # [14] SAC (희생번트) [15] SF (희생플라이)
+                        detailed_stats["SAC"] = int(cols1[14].text.strip())
+                        detailed_stats["SF"] = int(cols1[15].text.strip())
+                        
+                except (IndexError, ValueError):
+                    pass
+
+        if detailed_stats:
+            return curr_year, detailed_stats
+
+    except (AttributeError, IndexError, ValueError) as e:
+        # 시즌 선택 박스/테이블이 없는 페이지 (기록 없는 선수 등)
+        print(f"  ⚠️ 세부 스탯 파싱 실패: {e}")
+    return None
+
+def save_player(conn, cur, resolver, p_id, result):
+    """scrape_player 결과를 저장합니다. (메인 스레드, 선수 단위 commit) 통산 기록 저장 중 에러가 나면 False"""
+    if result["career"] is None:
+        print("  ⚠️ 통산 기록 없음 (신인 등)")
+        return True
+
+    try:
+        saved_seasons = 0
+        unchanged = 0
+        hot = hot_stats.make_batch(cur)
+        for year, team_name, stats in result["career"]:
+            # 시즌 ID
+            season_id = resolver.season_id(200, year)
+            team_id = get_team_id(resolver, team_name)
+
+            # DB 저장
+            sql = """
+                INSERT INTO sl_player_season_stats 
+                (player_id, season_id, team_id, stats, updated_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (player_id, season_id, team_id) 
+                DO UPDATE SET stats = sl_player_season_stats.stats || EXCLUDED.stats, updated_at = NOW()
+                WHERE sl_player_season_stats.stats IS DISTINCT FROM sl_player_season_stats.stats || EXCLUDED.stats;
+            """
+            cur.execute(sql, (p_id, season_id, team_id, json.dumps(stats)))
+            saved_seasons += 1
+            if cur.rowcount == 0: unchanged += 1
+            hot_stats.add(hot, "baseball", p_id, season_id, team_id, stats)
+
+        hot.flush()
+        conn.commit()
+        if saved_seasons:
+            print(f"  ✅ 통산 {saved_seasons}개 시즌 저장 완료 (변경 없음 {unchanged})")
+
+    except Exception as e:
+        print(f"  ❌ 통산 기록 처리 에러: {e}")
+        conn.rollback()
+        resolver.reload()  # 롤백된 시즌 INSERT가 캐시에 남지 않도록
+        return False
+
+    if result["basic"]:
+        curr_year, detailed_stats = result["basic"]
+        season_id = resolver.season_id(200, curr_year, create=False)
+        if not season_id: return True
+        try:
+            sql = """
+                UPDATE sl_player_season_stats
+                SET stats = stats || %(stats)s::jsonb, updated_at = NOW()
+                WHERE player_id = %(player_id)s AND season_id = %(season_id)s
+                  AND stats IS DISTINCT FROM stats || %(stats)s::jsonb
+            """
+            cur.execute(sql, {"stats": json.dumps(detailed_stats), "player_id": p_id, "season_id": season_id})
+            conn.commit()
+            print(f"  ✅ {curr_year} 세부 스탯(희생타 등) 보강 완료")
+        except Exception:
+            conn.rollback()
+    return True
+
+# 순위표 모드에서 수집할 시즌 (기본: 2024)
+TABLE_YEARS = [2024]
+
+# 순위표 값 중 정수로 저장하는 항목 (선수별 통산 페이지와 같은 형식으로 맞춤)
+TABLE_INT_KEYS = {"G", "PA", "AB", "R", "H", "2B", "3B", "HR", "TB", "RBI", "SAC", "SF", "SB", "CS", "BB", "IBB", "HBP", "SO", "GDP"}
+
+def normalize_table_stats(stats):
+    """순위표 문자열 값을 통산 페이지 수집과 같은 타입으로 변환 (+ OPS 계산)"""
+    out = {}
+    for key, value in stats.items():
+        if key in TABLE_INT_KEYS:
+            try:
+                value = int(value.replace(',', ''))
+            except ValueError:
+                continue
+        out[key] = value
+    try:
+        out["OPS"] = f"{float(out['SLG']) + float(out['OBP']):.3f}"
+    except (KeyError, ValueError):
+        pass
+    return out
+
+def sync_batter_details(mode=kbo_http.FETCH_MODE, source="tables", years=TABLE_YEARS, journal=None):
     print("⚾ KBO 타자 상세 기록 수집 시작 (테이블 구조 수정됨)...")
     
     conn = psycopg2.connect(**DB_CONFIG)
@@ -45,193 +270,62 @@ def sync_batter_details():
         WHERE biometrics->>'position' IN ('포수', '내야수', '외야수')
     """)
     targets = cur.fetchall()
+    resolver = IdResolver(cur)
     print(f"🎯 수집 대상: {len(targets)}명")
 
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument("user-agent=Mozilla/5.0")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+    names = dict(targets)
 
     try:
-        for p_id, p_name in targets:
-            print(f"\n👤 {p_name} (ID: {p_id}) 수집 중...")
-
-            # =========================================================
-            # 1. 통산 기록 (Total.aspx)
-            # =========================================================
-            total_url = f"https://www.koreabaseball.com/Record/Player/HitterDetail/Total.aspx?playerId={p_id}"
-            driver.get(total_url)
-            time.sleep(1)
-
-            try:
-                # [수정] 클래스 이름 대신 'summary="통산기록"' 속성으로 테이블 찾기 (가장 정확)
-                # 만약 summary가 없다면 테이블 텍스트로 찾음
-                tables = driver.find_elements(By.TAG_NAME, "table")
-                career_table = None
-                
-                for tbl in tables:
-                    if "통산기록" in tbl.get_attribute("summary") or ("연도" in tbl.text and "타율" in tbl.text):
-                        career_table = tbl
-                        break
-                
-                if not career_table:
-                    print(f"  ⚠️ 통산 기록 없음 (신인 등)")
-                    continue # 통산 기록 없으면 다음 선수로
-
-                rows = career_table.find_elements(By.CSS_SELECTOR, "tbody tr")
-                
-                saved_seasons = 0
-                for row in rows:
-                    cols = row.find_elements(By.TAG_NAME, "td")
-                    # 헤더: 연도, 팀명, AVG, G, PA, AB, R, H, 2B, 3B, HR, TB, RBI, SB, CS, BB, HBP, SO, GDP, SLG, OBP
-                    if len(cols) < 20: continue
-
-                    year_text = cols[0].text.strip()
-                    if not year_text.isdigit(): continue
-                    
-                    year = int(year_text)
-                    team_name = cols[1].text.strip()
-                    
-                    # 시즌 ID
-                    cur.execute("SELECT id FROM sl_seasons WHERE league_id=200 AND year=%s", (year,))
-                    s_row = cur.fetchone()
-                    if not s_row:
-                        cur.execute("INSERT INTO sl_seasons (league_id, year, is_current) VALUES (200, %s, false) RETURNING id", (year,))
-                        season_id = cur.fetchone()[0]
-                    else:
-                        season_id = s_row[0]
-
-                    team_id = get_team_id(cur, team_name)
-                    
-                    try:
-                        # 데이터 파싱 (순서 중요)
-                        # [2]AVG [3]G [4]PA [5]AB [6]R [7]H [8]2B [9]3B [10]HR [11]TB [12]RBI [13]SB [14]CS [15]BB [16]HBP [17]SO [18]GDP [19]SLG [20]OBP
-                        slg = cols[19].text.strip()
-                        obp = cols[20].text.strip()
-                        
-                        stats = {
-                            "AVG": cols[2].text.strip(),
-                            "G": int(cols[3].text.strip()),
-                            "PA": int(cols[4].text.strip()),
-                            "AB": int(cols[5].text.strip()),
-                            "R": int(cols[6].text.strip()),
-                            "H": int(cols[7].text.strip()),
-                            "2B": int(cols[8].text.strip()),
-                            "3B": int(cols[9].text.strip()),
-                            "HR": int(cols[10].text.strip()),
-                            "TB": int(cols[11].text.strip()), # 루타
-                            "RBI": int(cols[12].text.strip()),
-                            "SB": int(cols[13].text.strip()),
-                            "CS": int(cols[14].text.strip()),
-                            "BB": int(cols[15].text.strip()),
-                            "HBP": int(cols[16].text.strip()),
-                            "SO": int(cols[17].text.strip()),
-                            "GDP": int(cols[18].text.strip()),
-                            "SLG": slg,
-                            "OBP": obp
-                        }
-                        
-                        # OPS
-                        try:
-                            ops = float(slg) + float(obp)
-                            stats["OPS"] = f"{ops:.3f}"
-                        except:
-                            stats["OPS"] = "0.000"
-
-                        # DB 저장
-                        sql = """
-                            INSERT INTO sl_player_season_stats 
-                            (player_id, season_id, team_id, stats, updated_at)
-                            VALUES (%s, %s, %s, %s, NOW())
-                            ON CONFLICT (player_id, season_id, team_id) 
-                            DO UPDATE SET stats = sl_player_season_stats.stats || EXCLUDED.stats, updated_at = NOW();
-                        """
-                        cur.execute(sql, (p_id, season_id, team_id, json.dumps(stats)))
-                        saved_seasons += 1
-                    
-                    except Exception as e:
-                        # print(f"    ❌ 파싱 에러 ({year}): {e}")
-                        continue
-
+        # 브라우저(또는 HTTP) 풀 하나를 두 단계에서 함께 사용
+        with kbo_http.make_pool(mode, user_agent="Mozilla/5.0") as pool:
+            # 1) 순위표 모드: 연도 x 팀 순위표에서 시즌 기록을 한꺼번에 채움
+            #    통산 기록(Total.aspx)은 이전 시즌 기록이 아직 없는 선수만 방문하고,
+            #    순위표에 없는 이번 시즌 세부 스탯(Basic1.aspx)은 순위표로 저장된 선수 모두 방문
+            basic_only = set()
+            if source == "tables":
+                harvested = kbo_season_tables.sync_from_tables(
+                    conn, cur, resolver, pool, "hitter", years, mode, names, normalize=normalize_table_stats, journal=journal
+                )
+                has_history = kbo_season_tables.history_players(cur, 200, min(years))
                 conn.commit()
-                print(f"  ✅ 통산 {saved_seasons}개 시즌 저장 완료")
+                basic_only = harvested & has_history
+                names = {p_id: name for p_id, name in names.items() if p_id not in has_history or p_id in basic_only}
+                print(f"📋 순위표로 {len(harvested)}명 저장, 통산 기록 보강이 필요한 선수 {len(names) - len(basic_only)}명 "
+                      f"(세부 스탯만 {len(basic_only)}명)")
 
-            except Exception as e:
-                print(f"  ❌ 통산 기록 처리 에러: {e}")
-                conn.rollback()
+            # 최근 실행에서 이미 끝난 선수 페이지는 건너뜀
+            if journal:
+                names = {p_id: name for p_id, name in names.items() if not journal.is_fresh("kbo", None, p_id, None)}
 
-            # =========================================================
-            # 2. 기본 기록 (Basic1.aspx) - 세부 스탯(희생타 등) 보강
-            # =========================================================
-            basic_url = f"https://www.koreabaseball.com/Record/Player/HitterDetail/Basic1.aspx?playerId={p_id}"
-            driver.get(basic_url)
-            time.sleep(1)
-
-            try:
-                # 현재 선택된 시즌 확인
-                year_select = Select(driver.find_element(By.ID, "cphContents_cphContents_cphContents_ddlSeason_ddlSeason"))
-                curr_year = int(year_select.first_selected_option.text)
-                
-                cur.execute("SELECT id FROM sl_seasons WHERE league_id=200 AND year=%s", (curr_year,))
-                s_row = cur.fetchone()
-                if not s_row: continue
-                season_id = s_row[0]
-
-                # 테이블 2개 찾기 (주요기록, 세부기록)
-                # summary="...성적으로..." 포함된 테이블들
-                tables = driver.find_elements(By.CSS_SELECTOR, "table.tbl.tt")
-                
-                detailed_stats = {}
-                
-                # 두 번째 테이블 (세부 기록: BB, IBB, HBP ... SAC, SF)
-                if len(tables) > 1:
-                    row2 = tables[1].find_element(By.CSS_SELECTOR, "tbody tr")
-                    cols2 = row2.find_elements(By.TAG_NAME, "td")
-                    # 헤더: BB, IBB, HBP, SO, GDP, SLG, OBP, E, SB%, MH, OPS, RISP, PH-BA
-                    # 주의: 타자_기본기록.txt 분석 결과, IBB는 1번 인덱스에 있음
-                    if len(cols2) >= 10:
-                        try:
-                            # 1번째: IBB (고의4구)
-                            detailed_stats["IBB"] = int(cols2[1].text.strip())
-                            
-                            # 첫 번째 테이블의 마지막 컬럼들 확인 (SAC, SF가 여기 있을 수 있음)
-                            # 분석 결과: Table 1 헤더 끝에 SAC, SF가 있음!
-                            # Table 1: ..., SAC, SF
-                            row1 = tables[0].find_element(By.CSS_SELECTOR, "tbody tr")
-                            cols1 = row1.find_elements(By.TAG_NAME, "td")
-                            
-                            if len(cols1) >= 16:
-                                # [14] SAC (희생번트) [15] SF (희생플라이)
-                                detailed_stats["SAC"] = int(cols1[14].text.strip())
-                                detailed_stats["SF"] = int(cols1[15].text.strip())
-                                
-                        except: 
-                            pass
-
-                if detailed_stats:
-                    sql = """
-                        UPDATE sl_player_season_stats
-                        SET stats = stats || %s::jsonb, updated_at = NOW()
-                        WHERE player_id = %s AND season_id = %s
-                    """
-                    cur.execute(sql, (json.dumps(detailed_stats), p_id, season_id))
-                    conn.commit()
-                    print(f"  ✅ {curr_year} 세부 스탯(희생타 등) 보강 완료")
-
-            except Exception as e:
-                # print(f"  ⚠️ 세부 스탯 수집 실패: {e}")
-                pass
+            # 2) 선수 페이지는 서로 독립적이므로 풀의 브라우저들이 나눠서 동시에 수집
+            scrape_page = scrape_player_http if mode == "http" else scrape_player
+            def scrape(worker, p_id):
+                return scrape_page(worker, p_id, career=p_id not in basic_only)
+            for p_id, result, err in pool.map(scrape, names):
+                print(f"\n👤 {names[p_id]} (ID: {p_id}) 수집 완료")
+                if err:
+                    print(f"  ❌ 페이지 수집 에러: {err}")
+                    continue
+                if save_player(conn, cur, resolver, p_id, result) and journal:
+                    journal.done("kbo", None, p_id, None)
 
     except Exception as e:
         print(f"❌ 전체 에러: {e}")
     
     finally:
-        driver.quit()
         cur.close()
         conn.close()
+        page_waits.print_stats()
         print("🎉 수집 종료.")
 
 if __name__ == "__main__":
-    sync_batter_details()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="KBO 타자 상세 기록 수집")
+    parser.add_argument("--mode", choices=["selenium", "http"], default=kbo_http.FETCH_MODE, help="selenium: 브라우저 / http: 직접 요청")
+    parser.add_argument("--source", choices=["tables", "players"], default="tables",
+                        help="tables: 리그 순위표 일괄 수집 + 필요한 선수만 개별 페이지 / players: 모든 선수 개별 페이지 (기존 방식)")
+    parser.add_argument("--years", type=int, nargs="+", default=TABLE_YEARS, help="순위표에서 수집할 시즌")
+    parser.add_argument("--restart", action="store_true", help="진행 기록(sync_journal)을 무시하고 처음부터 수집")
+    parser.add_argument("--fresh-hours", type=float, default=sync_journal.FRESH_HOURS, help="이 시간 안에 끝난 팀 순위표/선수는 건너뜀")
+    args = parser.parse_args()
+    with sync_journal.SyncJournal("kbo_batter_stats", fresh_hours=args.fresh_hours, restart=args.restart) as journal:
+        sync_batter_details(mode=args.mode, source=args.source, years=args.years, journal=journal)
\ No newline at end of file
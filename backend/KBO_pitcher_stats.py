@@ -1,14 +1,16 @@
 import os
 import psycopg2
 import json
-import time
-import re
+import argparse
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from webdriver_manager.chrome import ChromeDriverManager
+from id_resolver import IdResolver
+import kbo_http
+import page_waits
+import html_tables
+import kbo_season_tables
+import hot_stats
+import sync_journal
+from kbo_season_tables import parse_ip, SEASON_SELECT_ID
 
 # --- 환경 설정 ---
 def load_env(path: Path) -> None:
@@ -28,35 +30,229 @@ DB_CONFIG = {
     "port": os.getenv("DB_PORT", "5432"),
 }
 
-def get_team_id(cur, team_name):
-    if not team_name: return None
-    cur.execute("SELECT id FROM sl_teams WHERE name LIKE %s LIMIT 1", (f"%{team_name}%",))
-    row = cur.fetchone()
-    return row[0] if row else None
+def get_team_id(resolver, team_name):
+    # sl_teams를 미리 읽어 둔 캐시에서 이름으로 조회
+    return resolver.team_id_by_name(team_name)
 
-def parse_ip(ip_str):
+def scrape_player(driver, p_id, career=True):
     """
-    이닝 문자열 파싱 (예: "14 1/3" -> 14.333, "5" -> 5.0)
+    브라우저 풀의 워커 스레드에서 실행: 투수 한 명의 통산/기본 기록 페이지를 읽어 파싱 결과만 돌려줍니다.
+    (DB 저장은 메인 스레드에서, 각 페이지는 page_source 한 번으로 파싱)
+    career=False면 통산 기록(Total.aspx)은 건너뛰고 기본 기록만 읽습니다. (순위표로 시즌 기록을 채운 선수)
     """
+    result = {"career": [], "basic": None}
+
+    if career:
+        # =========================================================
+        # 1. 통산 기록 (Total.aspx)
+        # =========================================================
+        total_url = f"https://www.koreabaseball.com/Record/Player/PitcherDetail/Total.aspx?playerId={p_id}"
+        driver.get(total_url)
+        page_waits.wait_ready(driver, "투수 통산 기록 로딩")
+
+        result["career"] = parse_career(html_tables.snapshot(driver))
+        if result["career"] is None:
+            return result
+
+    # =========================================================
+    # 2. 기본 기록 (Basic1.aspx) - 세부 스탯 (NP, QS, WHIP 등)
+    # =========================================================
+    basic_url = f"https://www.koreabaseball.com/Record/Player/PitcherDetail/Basic1.aspx?playerId={p_id}"
+    driver.get(basic_url)
+    page_waits.wait_ready(driver, "투수 기본 기록 로딩")
+
+    result["basic"] = parse_basic(html_tables.snapshot(driver))
+    return result
+
+def scrape_player_http(client, p_id, career=True):
+    """scrape_player의 브라우저 없는 버전 (두 페이지 모두 playerId 쿼리만 있는 일반 GET)"""
+    result = {"career": [], "basic": None}
+    if career:
+        result["career"] = parse_career(client.get_soup("https://www.koreabaseball.com/Record/Player/PitcherDetail/Total.aspx", {"playerId": p_id}))
+        if result["career"] is None:
+            return result
+    result["basic"] = parse_basic(client.get_soup("https://www.koreabaseball.com/Record/Player/PitcherDetail/Basic1.aspx", {"playerId": p_id}))
+    return result
+
+def parse_career(soup):
+    """통산 기록 표 파싱: [(연도, 팀 이름, stats), ...] / 표가 없으면 None"""
+    # 테이블 찾기 (summary="통산기록" 또는 헤더 텍스트로 식별)
+    # 투수는 ERA(평균자책점)가 핵심 키워드
+    career_table = html_tables.find_table(soup, summary="통산기록", keywords=("ERA", "승"))
+    if not career_table:
+        return None
+
+    career = []
+    # 헤더: 연도, 팀명, ERA, G, CG, SHO, W, L, SV, HLD, WPCT, TBF, IP, H, HR, BB, HBP, SO, R, ER
+    for cols in html_tables.table_rows(career_table, "tbody tr", min_cols=20):
+        year_text = cols[0].text.strip()
+        if not year_text.isdigit(): continue
+        
+        year = int(year_text)
+        team_name = cols[1].text.strip()
+        
+        try:
+            # 데이터 파싱
+            # [2]ERA [3]G [4]CG [5]SHO [6]W [7]L [8]SV [9]HLD [10]WPCT [11]TBF [12]IP [13]H [14]HR [15]BB [16]HBP [17]SO [18]R [19]ER
+            ip_val = parse_ip(cols[12].text.strip())
+            
+            stats = {
+                "ERA": cols[2].text.strip(),
+                "G": int(cols[3].text.strip()),
+                "CG": int(cols[4].text.strip()),  # 완투
+                "SHO": int(cols[5].text.strip()), # 완봉
+                "W": int(cols[6].text.strip()),   # 승
+                "L": int(cols[7].text.strip()),   # 패
+                "SV": int(cols[8].text.strip()),  # 세이브
+                "HLD": int(cols[9].text.strip()), # 홀드
+                "WPCT": cols[10].text.strip(),    # 승률
+                "TBF": int(cols[11].text.strip()),# 타자수
+                "IP": f"{ip_val:.1f}",            # 이닝 (실수형 문자열로 저장 권장)
+                "H": int(cols[13].text.strip()),  # 피안타
+                "HR": int(cols[14].text.strip()), # 피홈런
+                "BB": int(cols[15].text.strip()), # 볼넷
+                "HBP": int(cols[16].text.strip()),# 사구
+                "SO": int(cols[17].text.strip()), # 삼진
+                "R": int(cols[18].text.strip()),  # 실점
+                "ER": int(cols[19].text.strip())  # 자책점
+            }
+            career.append((year, team_name, stats))
+        
+        except (AttributeError, IndexError, ValueError):
+            continue # 합계/빈 행 등 형식이 다른 행
+    return career
+
+def parse_basic(soup):
+    """기본 기록 페이지 파싱: (현재 선택된 연도, 세부 스탯) / 없으면 None"""
     try:
-        ip_str = ip_str.strip()
-        if ' ' in ip_str:
-            # "14 2/3" 형태
-            whole, frac = ip_str.split(' ')
-            if '/' in frac:
-                num, den = map(int, frac.split('/'))
-                return float(whole) + (num / den)
-        elif '/' in ip_str:
-            # "2/3" 형태 (정수부 없음)
-            num, den = map(int, ip_str.split('/'))
-            return num / den
+        # 현재 시즌 연도 확인
+        selected = soup.select_one(f"#{SEASON_SELECT_ID} option[selected]") or soup.select_one(f"#{SEASON_SELECT_ID} option")
+        curr_year = int(selected.get_text(strip=True))
+
+        # 테이블 파싱 (보통 2개)
+        main_table = None
+        detail_table = None
         
-        # 정수 형태 ("14")
-        return float(ip_str) if ip_str else 0.0
-    except:
-        return 0.0
+        # 테이블 구분 (헤더 텍스트 기준)
+        for tbl in soup.select("table"):
+            txt = tbl.get_text()
+            if "투구수" in txt or "NP" in txt: # 1번 테이블
+                main_table = tbl
+            if "WHIP" in txt or "QS" in txt:   # 2번 테이블
+                detail_table = tbl
+
+        detailed_stats = {}
+
+        # Table 1: ..., TBF, NP, IP, H, 2B, 3B, HR
+        if main_table:
+            cols1 = html_tables.table_rows(main_table, "tbody tr")[0]
+            # TBF(10), NP(11) ... 2B(14), 3B(15) 인덱스 확인 필요
+            # KBO 사이트 구조상 NP는 보통 IP 앞쪽에 위치
+            try:
+                # 전체 텍스트에서 콤마 제거 후 숫자 추출 시도
+                np_text = cols1[11].text.strip().replace(',', '')
+                detailed_stats["NP"] = int(np_text) # 투구수
+            except (IndexError, ValueError): pass
+
+        # Table 2: SAC, SF, BB, IBB, SO, WP, BK, R, ER, BSV, WHIP, AVG, QS
+        if detail_table:
+            cols2 = html_tables.table_rows(detail_table, "tbody tr")[0]
+            
+            try:
+                # [5]WP(폭투) [6]BK(보크) [10]WHIP [12]QS
+                if len(cols2) >= 13:
+                    detailed_stats["WP"] = int(cols2[5].text.strip())
+                    detailed_stats["BK"] = int(cols2[6].text.strip())
+                    detailed_stats["WHIP"] = cols2[10].text.strip()
+                    detailed_stats["QS"] = int(cols2[12].text.strip())
+            except ValueError: pass
+
+        if detailed_stats:
+            return curr_year, detailed_stats
+
+    except (AttributeError, IndexError, ValueError) as e:
+        # 시즌 선택 박스/테이블이 없는 페이지 (기록 없는 선수 등)
+        print(f"  ⚠️ 세부 스탯 파싱 실패: {e}")
+    return None
+
+def save_player(conn, cur, resolver, p_id, result):
+    """scrape_player 결과를 저장합니다. (메인 스레드, 선수 단위 commit) 통산 기록 저장 성공 시 True"""
+    if result["career"] is None:
+        print("  ⚠️ 통산 기록 테이블 미발견 (신인/기록 없음)")
+        return False
+
+    saved = False
+    try:
+        saved_seasons = 0
+        unchanged = 0
+        hot = hot_stats.make_batch(cur)
+        for year, team_name, stats in result["career"]:
+            # 시즌 ID 확보
+            season_id = resolver.season_id(200, year)
+            team_id = get_team_id(resolver, team_name)
+
+            # DB 저장
+            sql = """
+                INSERT INTO sl_player_season_stats 
+                (player_id, season_id, team_id, stats, updated_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (player_id, season_id, team_id) 
+                DO UPDATE SET stats = sl_player_season_stats.stats || EXCLUDED.stats, updated_at = NOW()
+                WHERE sl_player_season_stats.stats IS DISTINCT FROM sl_player_season_stats.stats || EXCLUDED.stats;
+            """
+            cur.execute(sql, (p_id, season_id, team_id, json.dumps(stats)))
+            saved_seasons += 1
+            if cur.rowcount == 0: unchanged += 1
+            hot_stats.add(hot, "baseball", p_id, season_id, team_id, stats)
+
+        hot.flush()
+        conn.commit()
+        saved = True
+        if saved_seasons:
+            print(f"  ✅ 통산 {saved_seasons}개 시즌 저장 완료 (변경 없음 {unchanged})")
+
+    except Exception as e:
+        print(f"  ❌ 통산 기록 처리 에러: {e}")
+        conn.rollback()
+        resolver.reload()  # 롤백된 시즌 INSERT가 캐시에 남지 않도록
+
+    if result["basic"]:
+        curr_year, detailed_stats = result["basic"]
+        season_id = resolver.season_id(200, curr_year, create=False)
+        if not season_id: return saved
+        try:
+            sql = """
+                UPDATE sl_player_season_stats
+                SET stats = stats || %(stats)s::jsonb, updated_at = NOW()
+                WHERE player_id = %(player_id)s AND season_id = %(season_id)s
+                  AND stats IS DISTINCT FROM stats || %(stats)s::jsonb
+            """
+            cur.execute(sql, {"stats": json.dumps(detailed_stats), "player_id": p_id, "season_id": season_id})
+            conn.commit()
+            # print(f"  ✅ {curr_year} 세부 스탯 보강 완료")
+        except Exception:
+            conn.rollback()
+    return saved
 
-def sync_pitcher_details():
+# 순위표 모드에서 수집할 시즌 (기본: 2024)
+TABLE_YEARS = [2024]
+
+# 순위표 값 중 정수로 저장하는 항목 (선수별 통산 페이지와 같은 형식으로 맞춤)
+TABLE_INT_KEYS = {"G", "W", "L", "SV", "HLD", "H", "HR", "BB", "HBP", "SO", "R", "ER"}
+
+def normalize_table_stats(stats):
+    """순위표 문자열 값을 통산 페이지 수집과 같은 타입으로 변환"""
+    out = {}
+    for key, value in stats.items():
+        if key in TABLE_INT_KEYS:
+            try:
+                value = int(value.replace(',', ''))
+            except ValueError:
+                continue
+        out[key] = value
+    return out
+
+def sync_pitcher_details(mode=kbo_http.FETCH_MODE, source="tables", years=TABLE_YEARS, journal=None):
     print("⚾ KBO 투수 상세 기록 수집 시작 (Basic/Career)...")
     
     conn = psycopg2.connect(**DB_CONFIG)
@@ -68,197 +264,65 @@ def sync_pitcher_details():
         WHERE biometrics->>'position' LIKE '%투수%'
     """)
     targets = cur.fetchall()
+    resolver = IdResolver(cur)
     
     print(f"🎯 수집 대상: 총 {len(targets)}명")
 
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
+    names = dict(targets)
     success_count = 0
 
     try:
-        for p_id, p_name in targets:
-            print(f"\n👤 {p_name} (ID: {p_id}) 수집 중...")
-
-            # =========================================================
-            # 1. 통산 기록 (Total.aspx)
-            # =========================================================
-            total_url = f"https://www.koreabaseball.com/Record/Player/PitcherDetail/Total.aspx?playerId={p_id}"
-            driver.get(total_url)
-            time.sleep(1.5)
-
-            try:
-                # 테이블 찾기 (summary="통산기록" 또는 헤더 텍스트로 식별)
-                tables = driver.find_elements(By.TAG_NAME, "table")
-                career_table = None
-                
-                for tbl in tables:
-                    # 투수는 ERA(평균자책점)가 핵심 키워드
-                    if "통산기록" in tbl.get_attribute("summary") or ("ERA" in tbl.text and "승" in tbl.text):
-                        career_table = tbl
-                        break
-                
-                if not career_table:
-                    print(f"  ⚠️ 통산 기록 테이블 미발견 (신인/기록 없음)")
-                    continue
-
-                rows = career_table.find_elements(By.CSS_SELECTOR, "tbody tr")
-                
-                saved_seasons = 0
-                for row in rows:
-                    cols = row.find_elements(By.TAG_NAME, "td")
-                    # 헤더: 연도, 팀명, ERA, G, CG, SHO, W, L, SV, HLD, WPCT, TBF, IP, H, HR, BB, HBP, SO, R, ER
-                    if len(cols) < 20: continue
-
-                    year_text = cols[0].text.strip()
-                    if not year_text.isdigit(): continue
-                    
-                    year = int(year_text)
-                    team_name = cols[1].text.strip()
-                    
-                    # 시즌 ID 확보
-                    cur.execute("SELECT id FROM sl_seasons WHERE league_id=200 AND year=%s", (year,))
-                    s_row = cur.fetchone()
-                    if not s_row:
-                        cur.execute("INSERT INTO sl_seasons (league_id, year, is_current) VALUES (200, %s, false) RETURNING id", (year,))
-                        season_id = cur.fetchone()[0]
-                    else:
-                        season_id = s_row[0]
-
-                    team_id = get_team_id(cur, team_name)
-                    
-                    try:
-                        # 데이터 파싱
-                        # [2]ERA [3]G [4]CG [5]SHO [6]W [7]L [8]SV [9]HLD [10]WPCT [11]TBF [12]IP [13]H [14]HR [15]BB [16]HBP [17]SO [18]R [19]ER
-                        ip_val = parse_ip(cols[12].text.strip())
-                        
-                        stats = {
-                            "ERA": cols[2].text.strip(),
-                            "G": int(cols[3].text.strip()),
-                            "CG": int(cols[4].text.strip()),  # 완투
-                            "SHO": int(cols[5].text.strip()), # 완봉
-                            "W": int(cols[6].text.strip()),   # 승
-                            "L": int(cols[7].text.strip()),   # 패
-                            "SV": int(cols[8].text.strip()),  # 세이브
-                            "HLD": int(cols[9].text.strip()), # 홀드
-                            "WPCT": cols[10].text.strip(),    # 승률
-                            "TBF": int(cols[11].text.strip()),# 타자수
-                            "IP": f"{ip_val:.1f}",            # 이닝 (실수형 문자열로 저장 권장)
-                            "H": int(cols[13].text.strip()),  # 피안타
-                            "HR": int(cols[14].text.strip()), # 피홈런
-                            "BB": int(cols[15].text.strip()), # 볼넷
-                            "HBP": int(cols[16].text.strip()),# 사구
-                            "SO": int(cols[17].text.strip()), # 삼진
-                            "R": int(cols[18].text.strip()),  # 실점
-                            "ER": int(cols[19].text.strip())  # 자책점
-                        }
-
-                        # DB 저장
-                        sql = """
-                            INSERT INTO sl_player_season_stats 
-                            (player_id, season_id, team_id, stats, updated_at)
-                            VALUES (%s, %s, %s, %s, NOW())
-                            ON CONFLICT (player_id, season_id, team_id) 
-                            DO UPDATE SET stats = sl_player_season_stats.stats || EXCLUDED.stats, updated_at = NOW();
-                        """
-                        cur.execute(sql, (p_id, season_id, team_id, json.dumps(stats)))
-                        saved_seasons += 1
-                    
-                    except Exception as e:
-                        # print(f"    ❌ 파싱 에러 ({year}): {e}")
-                        continue
-
+        # 브라우저(또는 HTTP) 풀 하나를 두 단계에서 함께 사용
+        with kbo_http.make_pool(mode) as pool:
+            # 1) 순위표 모드: 연도 x 팀 순위표에서 시즌 기록을 한꺼번에 채움
+            #    통산 기록(Total.aspx)은 이전 시즌 기록이 아직 없는 선수만 방문하고,
+            #    순위표에 없는 이번 시즌 세부 스탯(Basic1.aspx)은 순위표로 저장된 선수 모두 방문
+            basic_only = set()
+            if source == "tables":
+                harvested = kbo_season_tables.sync_from_tables(
+                    conn, cur, resolver, pool, "pitcher", years, mode, names, normalize=normalize_table_stats, journal=journal
+                )
+                has_history = kbo_season_tables.history_players(cur, 200, min(years))
                 conn.commit()
-                success_count += 1
-                print(f"  ✅ 통산 {saved_seasons}개 시즌 저장 완료")
-
-            except Exception as e:
-                print(f"  ❌ 통산 기록 처리 에러: {e}")
-                conn.rollback()
+                basic_only = harvested & has_history
+                names = {p_id: name for p_id, name in names.items() if p_id not in has_history or p_id in basic_only}
+                print(f"📋 순위표로 {len(harvested)}명 저장, 통산 기록 보강이 필요한 선수 {len(names) - len(basic_only)}명 "
+                      f"(세부 스탯만 {len(basic_only)}명)")
 
-            # =========================================================
-            # 2. 기본 기록 (Basic1.aspx) - 세부 스탯 (NP, QS, WHIP 등)
-            # =========================================================
-            basic_url = f"https://www.koreabaseball.com/Record/Player/PitcherDetail/Basic1.aspx?playerId={p_id}"
-            driver.get(basic_url)
-            time.sleep(1)
+            # 최근 실행에서 이미 끝난 선수 페이지는 건너뜀
+            if journal:
+                names = {p_id: name for p_id, name in names.items() if not journal.is_fresh("kbo", None, p_id, None)}
 
-            try:
-                # 현재 시즌 연도 확인
-                year_select = Select(driver.find_element(By.ID, "cphContents_cphContents_cphContents_ddlSeason_ddlSeason"))
-                curr_year = int(year_select.first_selected_option.text)
-                
-                cur.execute("SELECT id FROM sl_seasons WHERE league_id=200 AND year=%s", (curr_year,))
-                s_row = cur.fetchone()
-                if not s_row: continue
-                season_id = s_row[0]
-
-                # 테이블 파싱 (보통 2개)
-                tables = driver.find_elements(By.TAG_NAME, "table")
-                main_table = None
-                detail_table = None
-                
-                # 테이블 구분 (헤더 텍스트 기준)
-                for tbl in tables:
-                    txt = tbl.text
-                    if "투구수" in txt or "NP" in txt: # 1번 테이블
-                        main_table = tbl
-                    if "WHIP" in txt or "QS" in txt:   # 2번 테이블
-                        detail_table = tbl
-
-                detailed_stats = {}
-
-                # Table 1: ..., TBF, NP, IP, H, 2B, 3B, HR
-                if main_table:
-                    row1 = main_table.find_elements(By.CSS_SELECTOR, "tbody tr")[0]
-                    cols1 = row1.find_elements(By.TAG_NAME, "td")
-                    # TBF(10), NP(11) ... 2B(14), 3B(15) 인덱스 확인 필요
-                    # KBO 사이트 구조상 NP는 보통 IP 앞쪽에 위치
-                    try:
-                        # 전체 텍스트에서 콤마 제거 후 숫자 추출 시도
-                        np_text = cols1[11].text.strip().replace(',', '')
-                        detailed_stats["NP"] = int(np_text) # 투구수
-                    except: pass
-
-                # Table 2: SAC, SF, BB, IBB, SO, WP, BK, R, ER, BSV, WHIP, AVG, QS
-                if detail_table:
-                    row2 = detail_table.find_elements(By.CSS_SELECTOR, "tbody tr")[0]
-                    cols2 = row2.find_elements(By.TAG_NAME, "td")
-                    
-                    try:
-                        # [5]WP(폭투) [6]BK(보크) [10]WHIP [12]QS
-                        if len(cols2) >= 13:
-                            detailed_stats["WP"] = int(cols2[5].text.strip())
-                            detailed_stats["BK"] = int(cols2[6].text.strip())
-                            detailed_stats["WHIP"] = cols2[10].text.strip()
-                            detailed_stats["QS"] = int(cols2[12].text.strip())
-                    except: pass
-
-                if detailed_stats:
-                    sql = """
-                        UPDATE sl_player_season_stats
-                        SET stats = stats || %s::jsonb, updated_at = NOW()
-                        WHERE player_id = %s AND season_id = %s
-                    """
-                    cur.execute(sql, (json.dumps(detailed_stats), p_id, season_id))
-                    conn.commit()
-                    # print(f"  ✅ {curr_year} 세부 스탯 보강 완료")
-
-            except Exception:
-                pass
+            # 2) 선수 페이지는 서로 독립적이므로 풀의 브라우저들이 나눠서 동시에 수집
+            scrape_page = scrape_player_http if mode == "http" else scrape_player
+            def scrape(worker, p_id):
+                return scrape_page(worker, p_id, career=p_id not in basic_only)
+            for p_id, result, err in pool.map(scrape, names):
+                print(f"\n👤 {names[p_id]} (ID: {p_id}) 수집 완료")
+                if err:
+                    print(f"  ❌ 페이지 수집 에러: {err}")
+                    continue
+                if save_player(conn, cur, resolver, p_id, result):
+                    success_count += 1
+                    if journal: journal.done("kbo", None, p_id, None)
 
     except Exception as e:
         print(f"❌ 전체 프로세스 에러: {e}")
     
     finally:
-        driver.quit()
         cur.close()
         conn.close()
+        page_waits.print_stats()
         print(f"🎉 총 {success_count}명의 투수 기록 저장 완료.")
 
 if __name__ == "__main__":
-    sync_pitcher_details()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="KBO 투수 상세 기록 수집")
+    parser.add_argument("--mode", choices=["selenium", "http"], default=kbo_http.FETCH_MODE, help="selenium: 브라우저 / http: 직접 요청")
+    parser.add_argument("--source", choices=["tables", "players"], default="tables",
+                        help="tables: 리그 순위표 일괄 수집 + 필요한 선수만 개별 페이지 / players: 모든 선수 개별 페이지 (기존 방식)")
+    parser.add_argument("--years", type=int, nargs="+", default=TABLE_YEARS, help="순위표에서 수집할 시즌")
+    parser.add_argument("--restart", action="store_true", help="진행 기록(sync_journal)을 무시하고 처음부터 수집")
+    parser.add_argument("--fresh-hours", type=float, default=sync_journal.FRESH_HOURS, help="이 시간 안에 끝난 팀 순위표/선수는 건너뜀")
+    args = parser.parse_args()
+    with sync_journal.SyncJournal("kbo_pitcher_stats", fresh_hours=args.fresh_hours, restart=args.restart) as journal:
+        sync_pitcher_details(mode=args.mode, source=args.source, years=args.years, journal=journal)
\ No newline at end of file
@@ -1,16 +1,15 @@
 import os
 import psycopg2
-import time
 import re
+import argparse
 import json
 import hashlib
 from pathlib import Path
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+import kbo_http
+import page_waits
+import html_tables
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
 
 # --- 환경 설정 ---
 def load_env(path: Path) -> None:
@@ -49,7 +48,136 @@ def get_team_id_hash(team_code):
     h = int(hashlib.md5(team_code.encode()).hexdigest()[:6], 16)
     return int(f"800{h}")
 
-def sync_kbo_players_selenium():
+SEARCH_URL = "https://www.koreabaseball.com/Player/Search.aspx"
+
+def scrape_team(driver, team_code):
+    """
+    브라우저 풀의 워커 스레드에서 실행: 팀 한 곳의 선수 검색 결과(모든 페이지)를 파싱합니다.
+    반환: [(페이지 번호, [선수 dict, ...]), ...]
+    """
+    driver.get(SEARCH_URL)
+    page_waits.wait_css(driver, "#cphContents_cphContents_cphContents_ddlTeam", "KBO_player 페이지 로딩")
+
+    select_element = driver.find_element(By.ID, "cphContents_cphContents_cphContents_ddlTeam")
+    select = Select(select_element)
+    page_waits.postback(driver, lambda: select.select_by_value(team_code), ".tEx tbody", "KBO_player 팀 선택")
+
+    pages = []
+    page = 1
+    while True:
+        # page_source 한 번으로 현재 페이지 표 전체를 가져와 파싱
+        soup = html_tables.snapshot(driver)
+        if not soup.select(".tEx tbody tr"): break
+        
+        pages.append((page, parse_search_table(soup)))
+        
+        # 다음 페이지 링크가 있을 때만 클릭
+        next_page = page + 1
+        if not any(a.get_text(strip=True) == str(next_page) for a in soup.select(".paging a")): break
+        try:
+            paging_area = driver.find_element(By.CLASS_NAME, "paging")
+            next_btn = paging_area.find_element(By.LINK_TEXT, str(next_page))
+            page_waits.postback(driver, lambda: driver.execute_script("arguments[0].click();", next_btn), ".tEx tbody", "KBO_player 페이지 이동")
+            page += 1
+        except: break
+
+    return pages
+
+def scrape_team_http(client, team_code):
+    """scrape_team의 브라우저 없는 버전: 팀 드롭다운 선택과 페이징 링크를 postback으로 보냅니다."""
+    form = client.AspNetForm(SEARCH_URL)
+    form.load()
+    soup = form.select("cphContents_cphContents_cphContents_ddlTeam", team_code)
+
+    pages = []
+    page = 1
+    while soup.select(".tEx tbody tr"):
+        pages.append((page, parse_search_table(soup)))
+
+        next_link = next((a for a in soup.select(".paging a") if a.get_text(strip=True) == str(page + 1)), None)
+        if next_link is None: break
+        soup = form.click(next_link)
+        page += 1
+
+    return pages
+
+def parse_search_table(soup):
+    """선수 검색 결과 표 한 페이지 파싱: [선수 dict, ...]"""
+    players = []
+    for cols in html_tables.table_rows(soup, ".tEx tbody tr", min_cols=7):
+        try:
+            # 선수명 & ID
+            kbo_id = html_tables.link_param(cols[1])
+            if not kbo_id: continue
+            player_name = cols[1].find("a").get_text(strip=True)
+
+            # 상세 정보
+            jersey_num_str = cols[0].text.strip()
+            hw_raw = cols[5].text.strip()
+            height, weight = None, None
+            numbers = re.findall(r'\d+', hw_raw)
+            if len(numbers) >= 2:
+                height = int(numbers[0])
+                weight = int(numbers[1])
+            birth_raw = cols[4].text.strip()
+
+            players.append({
+                "kbo_id": int(kbo_id),
+                "name": player_name,
+                "jersey_number": int(jersey_num_str) if jersey_num_str.isdigit() else None,
+                "position": cols[3].text.strip(),
+                "birth_date": birth_raw.replace('.', '-') if birth_raw else None,
+                "height": height,
+                "weight": weight,
+                "school": cols[6].text.strip() or None,
+            })
+
+        except Exception: continue
+    return players
+
+def save_players(cur, players, team_id, team_name, season_id):
+    count = 0
+    for p in players:
+        try:
+            kbo_id = p["kbo_id"]
+            # 2025 이미지는 아직 없을 수 있으니 2024로 시도
+            photo_url = f"https://6ptotvmi5753.edge.naverncp.com/KBO_IMAGE/person/middle/2024/{kbo_id}.jpg"
+
+            biometrics = {
+                "position": p["position"],
+                "school": p["school"],
+                "team": team_name
+            }
+
+            # sl_players 저장
+            cur.execute("""
+                INSERT INTO sl_players 
+                (id, name, birth_date, height_cm, weight_kg, nationality, photo_url, biometrics, created_at, updated_at)
+                VALUES (%s, %s, %s, %s, %s, 'South Korea', %s, %s, NOW(), NOW())
+                ON CONFLICT (id) DO UPDATE 
+                SET name = EXCLUDED.name,
+                    photo_url = EXCLUDED.photo_url,
+                    biometrics = COALESCE(sl_players.biometrics, '{}'::jsonb) || EXCLUDED.biometrics,
+                    updated_at = NOW();
+            """, (kbo_id, p["name"], p["birth_date"], p["height"], p["weight"], photo_url, json.dumps(biometrics)))
+
+            # sl_player_squads 저장
+            cur.execute("""
+                INSERT INTO sl_player_squads 
+                (player_id, team_id, season_id, position, jersey_number, is_active)
+                VALUES (%s, %s, %s, %s, %s, true)
+                ON CONFLICT (player_id, team_id, season_id) 
+                DO UPDATE SET 
+                    position = EXCLUDED.position,
+                    jersey_number = EXCLUDED.jersey_number,
+                    is_active = true;
+            """, (kbo_id, team_id, season_id, p["position"], p["jersey_number"]))
+            count += 1
+
+        except Exception: continue
+    return count
+
+def sync_kbo_players_selenium(mode=kbo_http.FETCH_MODE):
     print("👤 KBO 선수 정보 및 스쿼드 동기화 시작...")
     
     conn = psycopg2.connect(**DB_CONFIG)
@@ -70,132 +198,38 @@ def sync_kbo_players_selenium():
         return
     season_id = season_row[0]
 
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-    
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    
     total_count = 0
     
     try:
-        url = "https://www.koreabaseball.com/Player/Search.aspx"
-        driver.get(url)
-        time.sleep(1)
-
-        for team in KBO_TEAMS:
-            team_code = team['code']
-            team_name = team['name']
-            team_id = get_team_id_hash(team_code)
-            print(f"  ⚾ {team_name} (ID: {team_id}) 수집 시작...")
-
-            try:
-                select_element = driver.find_element(By.ID, "cphContents_cphContents_cphContents_ddlTeam")
-                select = Select(select_element)
-                select.select_by_value(team_code)
-                time.sleep(2)
-
-                page = 1
-                while True:
-                    rows = driver.find_elements(By.CSS_SELECTOR, ".tEx tbody tr")
-                    if len(rows) == 0: break
-                    
-                    page_count = 0
-                    for i, row in enumerate(rows):
-                        cols = row.find_elements(By.TAG_NAME, "td")
-                        if len(cols) < 7: continue
-
-                        try:
-                            # 선수명 & ID
-                            name_link = cols[1].find_element(By.TAG_NAME, "a")
-                            player_name = name_link.text.strip()
-                            href = name_link.get_attribute("href")
-                            
-                            if "playerId=" in href:
-                                kbo_id = int(href.split("playerId=")[1].split("&")[0])
-                            else: continue
-
-                            # 상세 정보
-                            jersey_num_str = cols[0].text.strip()
-                            jersey_number = int(jersey_num_str) if jersey_num_str.isdigit() else None
-                            position = cols[3].text.strip()
-                            birth_raw = cols[4].text.strip()
-                            birth_date = birth_raw.replace('.', '-') if birth_raw else None
-                            
-                            hw_raw = cols[5].text.strip()
-                            height, weight = None, None
-                            numbers = re.findall(r'\d+', hw_raw)
-                            if len(numbers) >= 2:
-                                height = int(numbers[0])
-                                weight = int(numbers[1])
-                            
-                            school_info = cols[6].text.strip() or None
-                            # 2025 이미지는 아직 없을 수 있으니 2024로 시도
-                            photo_url = f"https://6ptotvmi5753.edge.naverncp.com/KBO_IMAGE/person/middle/2024/{kbo_id}.jpg"
-
-                            biometrics = {
-                                "position": position,
-                                "school": school_info,
-                                "team": team_name
-                            }
-
-                            # sl_players 저장
-                            cur.execute("""
-                                INSERT INTO sl_players 
-                                (id, name, birth_date, height_cm, weight_kg, nationality, photo_url, biometrics, created_at, updated_at)
-                                VALUES (%s, %s, %s, %s, %s, 'South Korea', %s, %s, NOW(), NOW())
-                                ON CONFLICT (id) DO UPDATE 
-                                SET name = EXCLUDED.name,
-                                    photo_url = EXCLUDED.photo_url,
-                                    biometrics = COALESCE(sl_players.biometrics, '{}'::jsonb) || EXCLUDED.biometrics,
-                                    updated_at = NOW();
-                            """, (kbo_id, player_name, birth_date, height, weight, photo_url, json.dumps(biometrics)))
-
-                            # sl_player_squads 저장
-                            cur.execute("""
-                                INSERT INTO sl_player_squads 
-                                (player_id, team_id, season_id, position, jersey_number, is_active)
-                                VALUES (%s, %s, %s, %s, %s, true)
-                                ON CONFLICT (player_id, team_id, season_id) 
-                                DO UPDATE SET 
-                                    position = EXCLUDED.position,
-                                    jersey_number = EXCLUDED.jersey_number,
-                                    is_active = true;
-                            """, (kbo_id, team_id, season_id, position, jersey_number))
-                            
-                            page_count += 1
-                            total_count += 1
-
-                        except Exception: continue
-                    
+        # 팀마다 풀의 브라우저 하나가 검색 페이지를 열어 동시에 수집하고, 저장은 여기서 순서대로
+        scrape = scrape_team_http if mode == "http" else scrape_team
+        with kbo_http.make_pool(mode) as pool:
+            teams = {team['code']: team for team in KBO_TEAMS}
+            for team_code, pages, err in pool.map(scrape, teams):
+                team_name = teams[team_code]['name']
+                team_id = get_team_id_hash(team_code)
+                print(f"  ⚾ {team_name} (ID: {team_id}) 수집 결과 저장...")
+
+                if err:
+                    print(f"    ❌ {team_name} 오류: {err}")
+                    continue
+
+                for page, players in pages:
+                    page_count = save_players(cur, players, team_id, team_name, season_id)
+                    total_count += page_count
                     conn.commit()
                     print(f"    - {page}페이지: {page_count}명 완료")
-                    
-                    try:
-                        next_page = page + 1
-                        paging_area = driver.find_element(By.CLASS_NAME, "paging")
-                        next_btn = paging_area.find_element(By.LINK_TEXT, str(next_page))
-                        driver.execute_script("arguments[0].click();", next_btn)
-                        time.sleep(2)
-                        page += 1
-                    except: break
 
                 print(f"    ✅ {team_name} 완료")
-                driver.get(url) 
-                time.sleep(1)
-
-            except Exception as e:
-                print(f"    ❌ {team_name} 오류: {e}")
-                driver.get(url)
-                time.sleep(1)
 
     finally:
-        driver.quit()
         cur.close()
         conn.close()
+        page_waits.print_stats()
         print(f"🎉 총 {total_count}명의 KBO 선수/스쿼드 데이터 동기화 완료.")
 
 if __name__ == "__main__":
-    sync_kbo_players_selenium()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="KBO 선수/스쿼드 수집")
+    parser.add_argument("--mode", choices=["selenium", "http"], default=kbo_http.FETCH_MODE, help="selenium: 브라우저 / http: ASP.NET postback 직접 전송")
+    args = parser.parse_args()
+    sync_kbo_players_selenium(mode=args.mode)
\ No newline at end of file
@@ -1,10 +1,10 @@
 import os
-import requests
+import argparse
 import psycopg2
 import hashlib
-import json
-from datetime import datetime
 from pathlib import Path
+from id_resolver import IdResolver
+import naver_schedule
 
 # --- 환경 설정 ---
 def load_env(path: Path) -> None:
@@ -35,6 +35,9 @@ KLEAGUE_TEAM_MAP = {
     '26': '부천 FC 1995', '27': '김포 FC', '28': '천안 시티 FC', '30': '충북 청주 FC'
 }
 
+# 정규시즌 달 (네이버 일정 API는 월 단위로 요청)
+SEASON_MONTHS = range(3, 12)
+
 def get_game_id_hash(naver_game_id):
     return int(hashlib.sha256(str(naver_game_id).encode('utf-8')).hexdigest()[:15], 16)
 
@@ -47,110 +50,77 @@ def get_team_id_hash(team_code):
         h = int(hashlib.md5(team_code.encode()).hexdigest()[:6], 16)
         return int(f"900{h}")
 
-def ensure_team_exists(cur, team_code, team_name, logo_url=None):
+def ensure_team_exists(resolver, team_code, team_name, logo_url=None):
     if not team_code: return None
     
     full_name = KLEAGUE_TEAM_MAP.get(team_code, team_name)
     internal_id = get_team_id_hash(team_code)
-    
-    cur.execute("SELECT id FROM sl_teams WHERE id = %s", (internal_id,))
-    row = cur.fetchone()
-    if row:
-        if logo_url:
-            cur.execute("UPDATE sl_teams SET logo_url = %s, name = %s WHERE id = %s", (logo_url, full_name, internal_id))
-        return internal_id
-    
-    cur.execute("""
-        INSERT INTO sl_teams (id, name, logo_url, created_at, updated_at) 
-        VALUES (%s, %s, %s, NOW(), NOW()) 
-    """, (internal_id, full_name, logo_url))
-    return internal_id
+    # 캐시에 없거나 이름/로고가 바뀐 경우에만 DB에 씀
+    return resolver.ensure_team(internal_id, full_name, logo_url)
+
+def ensure_league(cur, resolver):
+    league_id = resolver.league_id('k-league')
+    if not league_id:
+        cur.execute("INSERT INTO sl_sports (name, slug) VALUES ('Soccer', 'soccer') ON CONFLICT (name) DO NOTHING")
+        cur.execute("SELECT id FROM sl_sports WHERE slug='soccer'")
+        sport_id = cur.fetchone()[0]
+        league_id = 100
+        cur.execute("INSERT INTO sl_leagues (id, sport_id, name, slug, country, type) VALUES (%s, %s, 'K League', 'k-league', 'South Korea', 'League') ON CONFLICT DO NOTHING", (league_id, sport_id))
+        resolver.remember_league('k-league', league_id)
+    return league_id
+
+def sync_kleague_season(year, months=SEASON_MONTHS, since_last_run=False):
+    """
+    시즌 전체를 한 번에 동기화합니다.
+    모든 달을 동시에 요청(하나의 HTTP Session)하고 gameId로 중복을 제거한 뒤, 한 트랜잭션에서 배치 upsert 합니다.
+    since_last_run=True면 끝나지 않은 경기가 남은 달만 다시 요청합니다.
+    """
+    months = list(months)
+    print(f"⚽ {year}년 K-League 경기 데이터 수집 중... ({months[0]}~{months[-1]}월)")
 
-def sync_kleague_games(year, month):
-    print(f"⚽ {year}년 {month}월 K-League 경기 데이터 수집 중...")
-    
     conn = psycopg2.connect(**DB_CONFIG)
     cur = conn.cursor()
 
     try:
-        cur.execute("SELECT id FROM sl_leagues WHERE slug = 'k-league'")
-        row = cur.fetchone()
-        if row: league_id = row[0]
-        else:
-            cur.execute("INSERT INTO sl_sports (name, slug) VALUES ('Soccer', 'soccer') ON CONFLICT (name) DO NOTHING")
-            cur.execute("SELECT id FROM sl_sports WHERE slug='soccer'")
-            sport_id = cur.fetchone()[0]
-            league_id = 100
-            cur.execute("INSERT INTO sl_leagues (id, sport_id, name, slug, country, type) VALUES (%s, %s, 'K League', 'k-league', 'South Korea', 'League') ON CONFLICT DO NOTHING", (league_id, sport_id))
-
-        cur.execute("SELECT id FROM sl_seasons WHERE league_id = %s AND year = %s", (league_id, year))
-        row = cur.fetchone()
-        if row: season_id = row[0]
-        else:
-            cur.execute("INSERT INTO sl_seasons (league_id, year, is_current) VALUES (%s, %s, true) RETURNING id", (league_id, year))
-            season_id = cur.fetchone()[0]
-
-        url = "https://api-gw.sports.naver.com/schedule/games"
-        params = {
-            "fields": "basic,status,team,score",
-            "upperCategoryId": "kfootball",
-            "categoryId": "kleague",
-            "fromDate": f"{year}-{month:02d}-01",
-            "toDate": f"{year}-{month:02d}-31",
-            "size": 300
-        }
-
-        res = requests.get(url, params=params)
-        data = res.json()
-        games = data.get('result', {}).get('games', [])
-        
-        count = 0
-        for g in games:
+        resolver = IdResolver(cur)
+
+        # 1. 리그 / 시즌 ID 조회 및 생성
+        league_id = ensure_league(cur, resolver)
+        season_id = resolver.season_id(league_id, year, is_current=True)
+
+        # 2. 요청할 달 결정
+        if since_last_run:
+            months = naver_schedule.pending_months(cur, season_id, months)
+            if not months:
+                conn.commit()
+                print(f"✅ {year}년: 끝나지 않은 경기가 있는 달이 없습니다.")
+                return
+            print(f"  🔁 지난 실행 이후 갱신 대상: {months}월")
+
+        # 3. 네이버 API 호출 (달별 동시 요청)
+        games, failed = naver_schedule.fetch_season("kfootball", "kleague", year, months)
+
+        # 4. 한 트랜잭션에서 배치 저장
+        batch = naver_schedule.make_batch(cur)
+        skipped = 0
+        for g in games.values():
             try:
-                game_id_str = g.get('gameId')
-                game_date = g.get('gameDateTime')
-                status_info = g.get('statusInfo', {})
-                status_origin = status_info.get('name', '') if isinstance(status_info, dict) else str(status_info)
-
-                home_code = g.get('homeTeamCode')
-                away_code = g.get('awayTeamCode')
-                home_name = g.get('homeTeamName')
-                away_name = g.get('awayTeamName')
-                home_logo = g.get('homeTeamEmblemUrl')
-                away_logo = g.get('awayTeamEmblemUrl')
-
-                if not game_id_str: continue
-
-                game_db_id = get_game_id_hash(game_id_str)
-                home_id = ensure_team_exists(cur, home_code, home_name, home_logo)
-                away_id = ensure_team_exists(cur, away_code, away_name, away_logo)
-                
-                status_map = { "종료": "STATUS_FINAL", "취소": "STATUS_CANCELLED", "예정": "STATUS_SCHEDULED", "경기중": "STATUS_IN_PROGRESS" }
-                status = status_map.get(status_origin, "STATUS_SCHEDULED")
-                
-                home_score = g.get('homeTeamScore') or 0
-                away_score = g.get('awayTeamScore') or 0
-                if home_score == '': home_score = 0
-                if away_score == '': away_score = 0
-                
-                score_detail = json.dumps(g.get('score', {}))
-
-                sql = """
-                    INSERT INTO sl_games 
-                    (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE 
-                    SET status = EXCLUDED.status,
-                        home_score = EXCLUDED.home_score,
-                        away_score = EXCLUDED.away_score,
-                        score_detail = EXCLUDED.score_detail;
-                """
-                cur.execute(sql, (game_db_id, season_id, league_id, home_id, away_id, game_date, status, home_score, away_score, score_detail))
-                count += 1
-            except Exception: continue
+                p = naver_schedule.parse_game(g)
+                home_id = ensure_team_exists(resolver, *p["home"])
+                away_id = ensure_team_exists(resolver, *p["away"])
+                batch.add((get_game_id_hash(p["game_id"]), season_id, league_id, home_id, away_id, p["game_date"],
+                           p["status"], p["home_score"], p["away_score"], p["score_detail"]))
+            except Exception:
+                skipped += 1
+                continue
+        batch.flush()
 
         conn.commit()
-        print(f"🏁 {year}년 {month}월: 총 {count}경기 저장 완료.")
+        batch.report()
+        msg = f"🏁 {year}년: 총 {batch.rows_written}경기 중 {batch.rows_changed}경기 변경 저장 (변경 없음 {batch.rows_unchanged})."
+        if skipped: msg += f" (건너뜀 {skipped})"
+        if failed: msg += f" ⚠️ 실패한 달: {failed}"
+        print(msg)
     except Exception as e:
         conn.rollback()
         print(f"❌ 에러: {e}")
@@ -158,6 +128,15 @@ def sync_kleague_games(year, month):
         cur.close()
         conn.close()
 
+def sync_kleague_games(year, month):
+    # 기존 월 단위 호출 호환용
+    sync_kleague_season(year, [month])
+
 if __name__ == "__main__":
-    for m in range(3, 12):
-        sync_kleague_games(2024, m)
+    parser = argparse.ArgumentParser(description="K-League 경기 일정 동기화 (네이버)")
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--months", type=int, nargs="+", default=list(SEASON_MONTHS), help="수집할 달 (기본: 시즌 전체)")
+    parser.add_argument("--since-last-run", action="store_true", help="끝나지 않은 경기가 남은 달만 갱신")
+    args = parser.parse_args()
+
+    sync_kleague_season(args.year, args.months, since_last_run=args.since_last_run)
@@ -4,6 +4,8 @@ import json
 import time
 import re
 from pathlib import Path
+from id_resolver import IdResolver
+import hot_stats
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -35,7 +37,7 @@ POSITIONS = {
     'FW': 'fw'
 }
 
-def get_team_id_by_name(cur, team_name):
+def get_team_id_by_name(resolver, team_name):
     if not team_name: return None
     name_map = {
         '전북': '전북 현대', '울산': '울산 HD', '포항': '포항 스틸러스', '제주': '제주 유나이티드',
@@ -47,9 +49,8 @@ def get_team_id_by_name(cur, team_name):
         '충북청주': '충북 청주 FC'
     }
     search_name = name_map.get(team_name, team_name)
-    cur.execute("SELECT id FROM sl_teams WHERE name LIKE %s LIMIT 1", (f"%{search_name}%",))
-    row = cur.fetchone()
-    return row[0] if row else None
+    # sl_teams를 미리 읽어 둔 캐시에서 이름으로 조회
+    return resolver.team_id_by_name(search_name)
 
 def parse_number(text):
     if not text: return 0
@@ -57,6 +58,80 @@ def parse_number(text):
     if text == '-' or text == '': return 0
     return int(re.sub(r'[^\d]', '', text))
 
+def list_url(pos_code, page):
+    return f"https://www.kleague.com/player.do?page={page}&type=all&leagueId=&teamId=&pos={pos_code}"
+
+def detail_url(pid):
+    return f"https://www.kleague.com/record/playerDetail.do?playerId={pid}"
+
+def parse_player_ids(soup):
+    """목록 페이지 → 선수 ID 목록 (선수 박스가 없으면 빈 목록 = 마지막 페이지)"""
+    player_ids = []
+    for box in soup.select(".cont-box.f-wrap.left.player-hover"):
+        try:
+            onclick = box.get('onclick') 
+            pid = re.search(r"onPlayerClicked\((\d+)\)", onclick).group(1)
+            player_ids.append(pid)
+        except:
+            continue
+    return player_ids
+
+def parse_player_detail(detail_soup, pos_name):
+    """상세 페이지 → 선수 기본 정보 dict (seasons: [(year, team_name, stats), ...])"""
+    # --- A. 기본 정보 파싱 ---
+    info_table = detail_soup.select_one(".cont-box.right table.style2 tbody")
+    info_map = {}
+    if info_table:
+        for tr in info_table.find_all("tr"):
+            ths = tr.find_all("th")
+            tds = tr.find_all("td")
+            for i, th in enumerate(ths):
+                key = th.text.strip()
+                val = tds[i].text.strip() if i < len(tds) else ""
+                info_map[key] = val
+
+    birth_str = info_map.get("생년월일", "")
+    photo_img = detail_soup.select_one(".img-box img")
+
+    player = {
+        "name": info_map.get("이름", ""),
+        "en_name": info_map.get("영문명", ""),
+        "team_name": info_map.get("소속구단", ""),
+        "position": info_map.get("포지션", pos_name),
+        "back_no": parse_number(info_map.get("배번", "")),
+        "nation": info_map.get("국적", "South Korea"),
+        "height": parse_number(info_map.get("키", "")),
+        "weight": parse_number(info_map.get("몸무게", "")),
+        "birth_date": birth_str.replace('/', '-') if birth_str else None,
+        "photo_url": photo_img['src'] if photo_img else None,
+        "seasons": [],
+    }
+
+    # --- B. 시즌별 기록 파싱 ---
+    season_section = None
+    titles = detail_soup.select("h3.tit-box.style2")
+    for title in titles:
+        if "시즌별" in title.text:
+            season_section = title.find_next("div", class_="table-wrap")
+            break
+
+    if season_section:
+        season_rows = season_section.select("table tbody tr")
+        for s_row in season_rows:
+            cols = s_row.find_all("td")
+            if len(cols) < 17: continue
+
+            year_txt = cols[0].text.strip()
+            if not year_txt.isdigit(): continue
+
+            stats = {
+                "K1": {"apps": parse_number(cols[2].text), "goals": parse_number(cols[3].text), "assists": parse_number(cols[4].text)},
+                "K2": {"apps": parse_number(cols[5].text), "goals": parse_number(cols[6].text), "assists": parse_number(cols[7].text)},
+                "Total": {"apps": parse_number(cols[14].text), "goals": parse_number(cols[15].text), "assists": parse_number(cols[16].text)}
+            }
+            player["seasons"].append((int(year_txt), cols[1].text.strip(), stats))
+    return player
+
 def scrape_kleague_players():
     print("⚽ K-League 포지션별 선수 전체 수집 시작...")
     
@@ -96,6 +171,8 @@ def scrape_kleague_players():
     
     driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
     
+    resolver = IdResolver(cur)
+    hot = hot_stats.make_batch(cur)
     total_saved = 0
 
     try:
@@ -106,70 +183,33 @@ def scrape_kleague_players():
             
             while True:
                 # 목록 URL 접속
-                list_url = f"https://www.kleague.com/player.do?page={page}&type=all&leagueId=&teamId=&pos={pos_code}"
-                driver.get(list_url)
+                driver.get(list_url(pos_code, page))
                 time.sleep(1)
 
                 soup = BeautifulSoup(driver.page_source, 'html.parser')
                 
-                player_boxes = soup.select(".cont-box.f-wrap.left.player-hover")
+                player_ids = parse_player_ids(soup)
                 
-                if not player_boxes:
+                if not player_ids:
                     print(f"  ✅ {pos_name} 수집 완료 (총 {page-1}페이지)")
                     break
                 
-                print(f"  📄 {page}페이지: {len(player_boxes)}명 발견.")
-                
-                player_ids = []
-                for box in player_boxes:
-                    try:
-                        onclick = box.get('onclick') 
-                        pid = re.search(r"onPlayerClicked\((\d+)\)", onclick).group(1)
-                        player_ids.append(pid)
-                    except:
-                        continue
+                print(f"  📄 {page}페이지: {len(player_ids)}명 발견.")
 
                 # 2. 상세 페이지 순회
                 for pid in player_ids:
                     try:
-                        detail_url = f"https://www.kleague.com/record/playerDetail.do?playerId={pid}"
-                        driver.get(detail_url)
+                        driver.get(detail_url(pid))
                         
                         detail_soup = BeautifulSoup(driver.page_source, 'html.parser')
-                        
-                        # --- A. 기본 정보 파싱 ---
-                        info_table = detail_soup.select_one(".cont-box.right table.style2 tbody")
-                        info_map = {}
-                        if info_table:
-                            for tr in info_table.find_all("tr"):
-                                ths = tr.find_all("th")
-                                tds = tr.find_all("td")
-                                for i, th in enumerate(ths):
-                                    key = th.text.strip()
-                                    val = tds[i].text.strip() if i < len(tds) else ""
-                                    info_map[key] = val
-                        
-                        name = info_map.get("이름", "")
-                        en_name_full = info_map.get("영문명", "")
-                        team_name = info_map.get("소속구단", "")
-                        position = info_map.get("포지션", pos_name) 
-                        back_no = parse_number(info_map.get("배번", ""))
-                        nation = info_map.get("국적", "South Korea")
-                        height = parse_number(info_map.get("키", ""))
-                        weight = parse_number(info_map.get("몸무게", ""))
-                        
-                        birth_str = info_map.get("생년월일", "")
-                        birth_date = birth_str.replace('/', '-') if birth_str else None
-                        
-                        photo_img = detail_soup.select_one(".img-box img")
-                        photo_url = photo_img['src'] if photo_img else None
+                        p = parse_player_detail(detail_soup, pos_name)
                         
                         # biometrics JSON 구성
                         biometrics = {
-                            "position": position,
-                            "back_no": back_no,
-                            "en_name": en_name_full,
-                            "team_name_raw": team_name
+                            "position": p["position"],
+                            "back_no": p["back_no"],
+                            "en_name": p["en_name"],
+                            "team_name_raw": p["team_name"]
                         }
 
                         # 선수 DB 저장 (lastname에 영문명 저장)
@@ -187,64 +227,30 @@ def scrape_kleague_players():
                                 nationality = EXCLUDED.nationality,
                                 biometrics = sl_players.biometrics || EXCLUDED.biometrics,
                                 updated_at = NOW();
-                        """, (pid, name, en_name_full, photo_url, birth_date, height, weight, nation, json.dumps(biometrics)))
+                        """, (pid, p["name"], p["en_name"], p["photo_url"], p["birth_date"], p["height"], p["weight"], p["nation"], json.dumps(biometrics)))
 
-                        # --- B. 시즌별 기록 파싱 ---
-                        season_section = None
-                        titles = detail_soup.select("h3.tit-box.style2")
-                        for title in titles:
-                            if "시즌별" in title.text:
-                                season_section = title.find_next("div", class_="table-wrap")
-                                break
-                        
-                        if season_section:
-                            season_rows = season_section.select("table tbody tr")
-                            for s_row in season_rows:
-                                cols = s_row.find_all("td")
-                                if len(cols) < 17: continue
-                                
-                                year_txt = cols[0].text.strip()
-                                if not year_txt.isdigit(): continue
-                                year = int(year_txt)
-                                s_team_name = cols[1].text.strip()
+                        # 시즌별 기록
+                        for year, s_team_name, stats in p["seasons"]:
+                            # 시즌 ID 조회 (300번 리그에 대해)
+                            season_id = resolver.season_id(300, year)
                                 
-                                stats = {
-                                    "K1": {"apps": parse_number(cols[2].text), "goals": parse_number(cols[3].text), "assists": parse_number(cols[4].text)},
-                                    "K2": {"apps": parse_number(cols[5].text), "goals": parse_number(cols[6].text), "assists": parse_number(cols[7].text)},
-                                    "Total": {"apps": parse_number(cols[14].text), "goals": parse_number(cols[15].text), "assists": parse_number(cols[16].text)}
-                                }
-                                
-                                # 시즌 ID 조회 (300번 리그에 대해)
-                                cur.execute("SELECT id FROM sl_seasons WHERE league_id = 300 AND year = %s", (year,))
-                                sid_row = cur.fetchone()
-                                if not sid_row:
-                                    # 시즌 생성
-                                    cur.execute("INSERT INTO sl_seasons (league_id, year) VALUES (300, %s) RETURNING id", (year,))
-                                    season_id = cur.fetchone()[0]
-                                else:
-                                    season_id = sid_row[0]
-                                    
-                                team_id = get_team_id_by_name(cur, s_team_name)
-                                if team_id:
-                                    cur.execute("""
-                                        INSERT INTO sl_player_season_stats
-                                        (player_id, season_id, team_id, stats, updated_at)
-                                        VALUES (%s, %s, %s, %s, NOW())
-                                        ON CONFLICT (player_id, season_id, team_id)
-                                        DO UPDATE SET stats = EXCLUDED.stats, updated_at = NOW();
-                                    """, (pid, season_id, team_id, json.dumps(stats)))
+                            team_id = get_team_id_by_name(resolver, s_team_name)
+                            if team_id:
+                                cur.execute("""
+                                    INSERT INTO sl_player_season_stats
+                                    (player_id, season_id, team_id, stats, updated_at)
+                                    VALUES (%s, %s, %s, %s, NOW())
+                                    ON CONFLICT (player_id, season_id, team_id)
+                                    DO UPDATE SET stats = EXCLUDED.stats, updated_at = NOW()
+                                    WHERE sl_player_season_stats.stats IS DISTINCT FROM EXCLUDED.stats;
+                                """, (pid, season_id, team_id, json.dumps(stats)))
+                                hot_stats.add(hot, "soccer", pid, season_id, team_id, stats)
 
                         # 현재 스쿼드 정보
-                        curr_team_id = get_team_id_by_name(cur, team_name)
+                        curr_team_id = get_team_id_by_name(resolver, p["team_name"])
                         if curr_team_id:
                             # 2024 시즌 기준
-                            cur.execute("SELECT id FROM sl_seasons WHERE league_id = 300 AND year = 2024")
-                            sid_row = cur.fetchone()
-                            if not sid_row:
-                                cur.execute("INSERT INTO sl_seasons (league_id, year, is_current) VALUES (300, 2024, true) RETURNING id")
-                                curr_sid = cur.fetchone()
-                            else:
-                                curr_sid = sid_row
+                            curr_sid = resolver.season_id(300, 2024, is_current=True)
                                 
                             if curr_sid:
                                 cur.execute("""
@@ -253,12 +259,15 @@ def scrape_kleague_players():
                                     VALUES (%s, %s, %s, %s, %s, true)
                                     ON CONFLICT (player_id, team_id, season_id) 
                                     DO UPDATE SET position = EXCLUDED.position, jersey_number = EXCLUDED.jersey_number, is_active = true;
-                                """, (pid, curr_team_id, curr_sid[0], position, back_no))
+                                """, (pid, curr_team_id, curr_sid, p["position"], p["back_no"]))
                         
+                        hot.flush()
                         total_saved += 1
                         
                     except Exception as e:
                         conn.rollback()
+                        hot.discard()
+                        resolver.reload()  # 롤백된 시즌 INSERT가 캐시에 남지 않도록
                         print(f"    ⚠️ ID {pid} 처리 실패: {e}")
                         continue
 
@@ -269,6 +278,7 @@ def scrape_kleague_players():
         print(f"❌ 에러 발생: {e}")
     finally:
         driver.quit()
+        hot.report()
         cur.close()
         conn.close()
         print(f"🎉 총 {total_saved}명 선수 정보 수집 완료.")
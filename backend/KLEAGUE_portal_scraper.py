@@ -4,6 +4,7 @@ import json
 import time
 import re
 from pathlib import Path
+import hot_stats
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -255,6 +256,7 @@ class KLeaguePlayerClickFixScraper:
                     biometrics = sl_players.biometrics || EXCLUDED.biometrics, updated_at = NOW();
             """
             self.cur.execute(sql_player, (pid, name, en_name, photo_url, birth_date, height, weight, nation, json.dumps(biometrics)))
+            hot = hot_stats.make_batch(self.cur)
 
             for stat in stats_list:
                 team_id = self.get_team_id_by_name(stat['team'])
@@ -267,9 +269,12 @@ class KLeaguePlayerClickFixScraper:
                 sql_stat = """
                     INSERT INTO sl_player_season_stats (player_id, season_id, team_id, stats, updated_at)
                     VALUES (%s, %s, %s, %s, NOW())
-                    ON CONFLICT (player_id, season_id, team_id) DO UPDATE SET stats = EXCLUDED.stats, updated_at = NOW();
+                    ON CONFLICT (player_id, season_id, team_id) DO UPDATE SET stats = EXCLUDED.stats, updated_at = NOW()
+                    WHERE sl_player_season_stats.stats IS DISTINCT FROM EXCLUDED.stats;
                 """
                 self.cur.execute(sql_stat, (pid, season_id, team_id, json.dumps(stat['data'])))
+                hot_stats.add(hot, "soccer", pid, season_id, team_id, stat['data'])
+            hot.flush()
             self.conn.commit()
             print(f"    💾 저장 완료: {name}")
         except Exception as e:
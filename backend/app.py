@@ -1,7 +1,213 @@
 # backend/app.py
+import os
 import time
+import signal
+import heapq
+import argparse
+from datetime import datetime, timedelta, timezone
 
-print("데이터 수집기가 시작되었습니다!")
-while True:
-    print("수집 중... (테스트)")
-    time.sleep(60)
\ No newline at end of file
+import psycopg2
+
+import espn_client
+from update_results import (DB_CONFIG, TARGET_LEAGUES, SQL_TEAM, fetch_scoreboard, sync_league,
+                            parse_scoreboard_event, save_game)
+
+# --- 실시간 경기 수집기 (상주 프로세스) ---
+# update_results.py(한 번 돌고 끝나는 scoreboard 갱신)를 리그별 적응형 주기로 계속 반복합니다.
+#   - 진행 중(state == 'in') 경기가 있으면 LIVE_INTERVAL (기본 15초)
+#   - 곧 시작할 경기가 있으면 SOON_INTERVAL (기본 60초)
+#   - 오늘 경기가 남아 있으면 IDLE_INTERVAL, 없으면 DORMANT_INTERVAL
+# 마지막으로 본 경기 상태/점수를 메모리에 들고 있다가 바뀐 경기만 DB에 씁니다.
+# DB 커넥션과 HTTP Session(espn_client)은 프로세스가 살아 있는 동안 재사용합니다.
+
+LIVE_INTERVAL = int(os.getenv("LIVE_INTERVAL", "15"))
+SOON_INTERVAL = int(os.getenv("SOON_INTERVAL", "60"))
+IDLE_INTERVAL = int(os.getenv("IDLE_INTERVAL", "900"))
+DORMANT_INTERVAL = int(os.getenv("DORMANT_INTERVAL", "3600"))
+# 시작 시각이 이 시간 안으로 다가온 경기는 '곧 시작'으로 봄
+SOON_WINDOW = timedelta(minutes=int(os.getenv("SOON_WINDOW_MINUTES", "30")))
+# 통계 출력 주기 (초)
+STATS_EVERY = int(os.getenv("STATS_EVERY", "3600"))
+
+_running = True
+
+
+def _stop(signum, frame):
+    global _running
+    _running = False
+    print(f"\n🛑 종료 신호 수신 ({signum}), 현재 작업 후 종료합니다.")
+
+
+def scoreboard_season_year(data):
+    """scoreboard 응답의 현재 시즌 연도 (없으면 None)"""
+    leagues = data.get('leagues') or [{}]
+    return (leagues[0].get('season') or {}).get('year')
+
+
+class Collector:
+    def __init__(self, leagues):
+        self.leagues = leagues
+        self.conn = None
+        # 경기 ID -> 마지막으로 저장한 (status, home_score, away_score, score_detail)
+        self.seen = {}
+        # 이미 저장한 팀 정보
+        self.teams = {}
+        # slug -> (시즌 연도, league_id, season_db_id) - scoreboard의 시즌 연도가 바뀌면 다시 저장
+        self.league_ids = {}
+        self.polls = 0
+        self.writes = 0
+        self.unchanged = 0
+
+    # --- DB ---
+    def cursor(self):
+        if self.conn is None or self.conn.closed:
+            self.conn = psycopg2.connect(**DB_CONFIG)
+            print("🔌 DB 연결")
+        return self.conn.cursor()
+
+    def close(self):
+        if self.conn is not None and not self.conn.closed:
+            self.conn.close()
+
+    def preload(self, cur, game_ids):
+        """처음 보는 경기는 DB에 저장된 값을 읽어 와서 비교 기준으로 삼습니다."""
+        missing = [g for g in game_ids if g not in self.seen]
+        if not missing: return
+        cur.execute("""
+            SELECT id, status, home_score, away_score, score_detail
+            FROM sl_games WHERE id = ANY(%s)
+        """, (missing,))
+        for gid, status, hs, as_, detail in cur.fetchall():
+            self.seen[gid] = (status, hs, as_, detail)
+
+    # --- 한 리그 폴링 ---
+    def poll(self, sport, espn_key, slug):
+        """scoreboard를 한 번 확인하고 다음 폴링까지 기다릴 초를 돌려줍니다."""
+        data = fetch_scoreboard(sport, espn_key)
+        self.polls += 1
+
+        games = []
+        for event in data.get('events', []):
+            try:
+                game = parse_scoreboard_event(event)
+            except Exception:
+                continue
+            if game: games.append(game)
+
+        cur = self.cursor()
+        try:
+            season_year = scoreboard_season_year(data)
+            cached = self.league_ids.get(slug)
+            if cached is None or cached[0] != season_year:
+                try:
+                    self.league_ids[slug] = (season_year, *sync_league(cur, sport, slug, data))
+                except (IndexError, KeyError) as e:
+                    print(f"⚠️ League info mismatch for {espn_key}: {e}")
+                    self.conn.rollback()
+                    return DORMANT_INTERVAL
+                if cached is not None:
+                    print(f"🗓️ {slug}: 시즌 변경 {cached[0]} → {season_year}")
+            _, league_id, season_db_id = self.league_ids[slug]
+
+            self.preload(cur, [g["id"] for g in games])
+
+            changed = 0
+            for game in games:
+                snapshot = (game["status"], game["home_score"], game["away_score"], game["score_detail"])
+                if self.seen.get(game["id"]) == snapshot:
+                    self.unchanged += 1
+                    continue
+                for team in game["teams"]:
+                    if self.teams.get(team[0]) != team:
+                        cur.execute(SQL_TEAM, team)
+                        self.teams[team[0]] = team
+                save_game(cur, game, league_id, season_db_id)
+                self.seen[game["id"]] = snapshot
+                changed += 1
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            # 커밋되지 않은 변경은 다음 폴링에서 다시 쓰도록 비교 기준을 비움
+            for game in games:
+                self.seen.pop(game["id"], None)
+            raise
+        finally:
+            cur.close()
+
+        self.writes += changed
+        live = sum(1 for g in games if g["state"] == "in")
+        interval = next_interval(games)
+        if changed or live:
+            print(f"📡 {slug}: 진행 중 {live}경기, 변경 {changed}경기 저장 → {interval}초 후 재확인")
+        return interval
+
+    def run(self):
+        # (다음 실행 시각, 순번, 리그)
+        queue = [(time.monotonic(), i, league) for i, league in enumerate(self.leagues)]
+        heapq.heapify(queue)
+        next_stats = time.monotonic() + STATS_EVERY
+
+        while _running and queue:
+            due, i, league = heapq.heappop(queue)
+            wait = due - time.monotonic()
+            # 종료 신호에 빨리 반응하도록 1초 단위로 나눠 대기
+            while _running and wait > 0:
+                time.sleep(min(wait, 1.0))
+                wait = due - time.monotonic()
+            if not _running: break
+
+            sport, espn_key, slug = league
+            try:
+                interval = self.poll(sport, espn_key, slug)
+            except psycopg2.Error as e:
+                print(f"❌ {slug}: DB 에러, 재연결 예정: {e}")
+                self.close()
+                self.conn = None
+                interval = SOON_INTERVAL
+            except Exception as e:
+                print(f"❌ Error updating {slug}: {e}")
+                interval = SOON_INTERVAL
+            heapq.heappush(queue, (time.monotonic() + interval, i, league))
+
+            if time.monotonic() >= next_stats:
+                self.print_stats()
+                next_stats = time.monotonic() + STATS_EVERY
+
+        self.close()
+        self.print_stats()
+
+    def print_stats(self):
+        print(f"\n📊 폴링 {self.polls}회, 저장 {self.writes}경기, 변경 없음 {self.unchanged}경기")
+        espn_client.print_stats()
+
+
+def next_interval(games, now=None):
+    """리그의 경기 상태로 다음 폴링 간격(초)을 정합니다."""
+    now = now or datetime.now(timezone.utc).replace(tzinfo=None)
+    if any(g["state"] == "in" for g in games):
+        return LIVE_INTERVAL
+    upcoming = [g["game_date"] for g in games if g["state"] == "pre"]
+    # 시작 시각이 지났는데 아직 'pre'인 경기(지연 등)도 곧 시작으로 취급
+    if any(d <= now + SOON_WINDOW for d in upcoming):
+        return SOON_INTERVAL
+    if any(d.date() == now.date() for d in upcoming):
+        return IDLE_INTERVAL
+    if upcoming:
+        # 다음 경기 시작 SOON_WINDOW 전에 깨어나도록 (최대 DORMANT_INTERVAL)
+        until = (min(upcoming) - SOON_WINDOW - now).total_seconds()
+        return int(max(IDLE_INTERVAL, min(DORMANT_INTERVAL, until)))
+    return DORMANT_INTERVAL
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="실시간 경기 결과 수집기")
+    parser.add_argument("--leagues", nargs="+", metavar="SLUG", help="수집할 리그 slug (기본: update_results.TARGET_LEAGUES 전체)")
+    args = parser.parse_args()
+
+    leagues = [l for l in TARGET_LEAGUES if not args.leagues or l[2] in args.leagues]
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    print(f"데이터 수집기가 시작되었습니다! ({len(leagues)}개 리그)")
+    Collector(leagues).run()
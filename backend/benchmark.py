@@ -0,0 +1,324 @@
+import os
+
+# 재생 중에는 디스크 캐시/재시도/속도 제한이 측정값을 흐리므로 끔 (수집 모듈 import 전에 설정)
+os.environ.setdefault("ESPN_CACHE", "0")
+os.environ.setdefault("ESPN_MAX_RETRIES", "0")
+os.environ.setdefault("ESPN_RATE_PER_SEC", "0")
+os.environ.setdefault("KBO_FETCH_MODE", "http")
+
+import json
+import time
+import hashlib
+import argparse
+import resource
+import threading
+import multiprocessing
+from pathlib import Path
+
+import requests
+import psycopg2
+import psycopg2.extensions
+
+# --- 오프라인 벤치마크 ---
+# 수집 파이프라인을 녹화해 둔 HTTP 응답(fixture)으로 재생해서 ESPN / 네이버 / KBO / K리그 사이트 없이 성능을 측정합니다.
+#   1) 녹화:  python benchmark.py --record            (실제 사이트에 접속해 bench_fixtures/<파이프라인>/ 에 응답 저장)
+#   2) 측정:  python benchmark.py [--db fake|postgres] (녹화된 응답만 사용, 네트워크 접속 없음)
+# 파이프라인마다 새 프로세스에서 실행하고 다음 값을 출력합니다.
+#   - 저장 행 수 / 초당 행 수 (INSERT/UPDATE로 보낸 행, execute_values는 행 단위로 셈)
+#   - HTTP 요청 수 (fixture 없음 = miss)
+#   - DB 왕복 횟수 (execute + commit/rollback)
+#   - 최대 메모리 (프로세스 max RSS)
+# --db fake 는 쿼리를 보내지 않는 대역 커넥션입니다. (파싱/행 생성 비용만 측정, 결과 행 수는 보낸 행 기준)
+# --db postgres 는 DB_* 환경 변수의 Postgres에 실제로 씁니다. (벤치마크 전용 DB 사용 권장)
+
+FIXTURE_DIR = Path(os.getenv("BENCH_FIXTURE_DIR", Path(__file__).with_name("bench_fixtures")))
+ESPN_SPORT = os.getenv("BENCH_ESPN_SPORT", "basketball")
+ESPN_LEAGUE = os.getenv("BENCH_ESPN_LEAGUE", "nba")
+SEASON_YEAR = int(os.getenv("BENCH_SEASON_YEAR", "2024"))
+# K리그 파서: 포지션별 목록 페이지 수 상한
+KLEAGUE_PAGES = int(os.getenv("BENCH_KLEAGUE_PAGES", "2"))
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE")
+
+
+class Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.misses = 0
+        self.bytes = 0
+        self.round_trips = 0
+        self.rows = 0
+
+    def add(self, **kw):
+        with self.lock:
+            for k, v in kw.items():
+                setattr(self, k, getattr(self, k) + v)
+
+
+counters = Counters()
+
+
+# ---------------------------------------------------------------------------
+# HTTP 녹화 / 재생
+# ---------------------------------------------------------------------------
+def fixture_key(request):
+    body = request.body or b""
+    if isinstance(body, str): body = body.encode("utf-8")
+    raw = f"{request.method} {request.url}".encode("utf-8") + b"\n" + body
+    return hashlib.sha1(raw).hexdigest()
+
+
+class HttpFixtures:
+    """requests.Session.send를 바꿔 끼워 모든 요청(requests.get 포함)을 녹화하거나 재생합니다."""
+
+    def __init__(self, pipeline, record=False):
+        self.dir = FIXTURE_DIR / pipeline
+        self.record = record
+        self._send = None
+
+    def __enter__(self):
+        self._send = requests.Session.send
+        fixtures = self
+
+        def send(session, request, **kwargs):
+            return fixtures.send(session, request, **kwargs)
+
+        requests.Session.send = send
+        if self.record:
+            self.dir.mkdir(parents=True, exist_ok=True)
+        return self
+
+    def __exit__(self, *exc):
+        requests.Session.send = self._send
+
+    def send(self, session, request, **kwargs):
+        key = fixture_key(request)
+        meta_path, body_path = self.dir / f"{key}.json", self.dir / f"{key}.body"
+        if self.record:
+            res = self._send(session, request, **kwargs)
+            body_path.write_bytes(res.content)
+            meta_path.write_text(json.dumps({
+                "method": request.method, "url": request.url, "status": res.status_code,
+                "headers": {"Content-Type": res.headers.get("Content-Type", "")},
+            }, ensure_ascii=False), encoding="utf-8")
+            counters.add(requests=1, bytes=len(res.content))
+            return res
+
+        res = requests.Response()
+        res.request = request
+        res.url = request.url
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            res._content = body_path.read_bytes()
+            res.status_code = meta["status"]
+            res.headers.update(meta.get("headers", {}))
+            counters.add(requests=1, bytes=len(res._content))
+        except OSError:
+            # 녹화되지 않은 요청은 404로 응답 (스크립트의 기존 에러 처리 경로를 탐)
+            res._content = b"{}"
+            res.status_code = 404
+            counters.add(requests=1, misses=1)
+        res.encoding = requests.utils.get_encoding_from_headers(res.headers) or "utf-8"
+        return res
+
+
+# ---------------------------------------------------------------------------
+# DB 계측
+# ---------------------------------------------------------------------------
+def _is_write(sql):
+    if isinstance(sql, bytes): sql = sql[:20].decode("utf-8", "ignore")
+    return sql.lstrip().upper().startswith(WRITE_PREFIXES)
+
+
+class CountingCursor(psycopg2.extensions.cursor):
+    def execute(self, sql, vars=None):
+        counters.add(round_trips=1, rows=1 if vars is not None and _is_write(sql) else 0)
+        return super().execute(sql, vars)
+
+    def mogrify(self, sql, vars=None):
+        # execute_values는 행마다 mogrify를 호출한 뒤 한 번에 execute 함
+        counters.add(rows=1)
+        return super().mogrify(sql, vars)
+
+
+class CountingConnection(psycopg2.extensions.connection):
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault("cursor_factory", CountingCursor)
+        return super().cursor(*args, **kwargs)
+
+    def commit(self):
+        counters.add(round_trips=1)
+        return super().commit()
+
+    def rollback(self):
+        counters.add(round_trips=1)
+        return super().rollback()
+
+
+class FakeCursor:
+    """쿼리를 보내지 않는 대역 커서. 조회 결과는 항상 (1, SEASON_YEAR) 한 행 / 빈 목록"""
+
+    def __init__(self, conn):
+        self.connection = conn
+        self.rowcount = 1
+        self.closed = False
+
+    def execute(self, sql, vars=None):
+        counters.add(round_trips=1, rows=1 if vars is not None and _is_write(sql) else 0)
+
+    def mogrify(self, sql, vars=None):
+        counters.add(rows=1)
+        if isinstance(sql, bytes): sql = sql.decode("utf-8")
+        return (sql % tuple(repr(v) for v in (vars or ()))).encode("utf-8")
+
+    def fetchone(self):
+        return (1, SEASON_YEAR)
+
+    def fetchall(self):
+        return []
+
+    def __iter__(self):
+        return iter(())
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    encoding = "UTF8"
+    closed = 0
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        counters.add(round_trips=1)
+
+    def rollback(self):
+        counters.add(round_trips=1)
+
+    def close(self):
+        self.closed = 1
+
+
+def install_db(kind):
+    """psycopg2.connect를 계측용 연결로 바꿉니다. (스크립트는 psycopg2.connect(**DB_CONFIG)를 그대로 호출)"""
+    real_connect = psycopg2.connect
+    if kind == "fake":
+        psycopg2.connect = lambda *a, **kw: FakeConnection()
+    else:
+        psycopg2.connect = lambda *a, **kw: real_connect(*a, connection_factory=CountingConnection, **kw)
+
+
+# ---------------------------------------------------------------------------
+# 파이프라인
+# ---------------------------------------------------------------------------
+def run_espn_games():
+    import espn_games
+    espn_games.sync_season_schedule(ESPN_SPORT, ESPN_LEAGUE, full=True, state={})
+
+
+def run_espn_player_game_stats():
+    import espn_player_game_stats
+    espn_player_game_stats.sync_player_game_stats(ESPN_SPORT, ESPN_LEAGUE)
+
+
+def run_kbo_game():
+    import KBO_game
+    KBO_game.sync_kbo_season(SEASON_YEAR)
+
+
+def run_kleague_game():
+    import KLEAGUE_game
+    KLEAGUE_game.sync_kleague_season(SEASON_YEAR)
+
+
+def run_kbo_stat():
+    import KBO_stat
+    KBO_stat.sync_kbo_stats_selenium(SEASON_YEAR, mode="http")
+
+
+def run_kleague_parsers():
+    """K리그 선수 목록/상세 페이지 파서 (DB 없이 파싱만, 시즌 기록 행 수를 rows로 셈)"""
+    from bs4 import BeautifulSoup
+    import KLEAGUE_player
+
+    session = requests.Session()
+    for pos_name, pos_code in KLEAGUE_player.POSITIONS.items():
+        for page in range(1, KLEAGUE_PAGES + 1):
+            soup = BeautifulSoup(session.get(KLEAGUE_player.list_url(pos_code, page)).text, 'html.parser')
+            player_ids = KLEAGUE_player.parse_player_ids(soup)
+            if not player_ids: break
+            for pid in player_ids:
+                res = session.get(KLEAGUE_player.detail_url(pid))
+                if res.status_code != 200: continue
+                player = KLEAGUE_player.parse_player_detail(BeautifulSoup(res.text, 'html.parser'), pos_name)
+                counters.add(rows=1 + len(player["seasons"]))
+
+
+PIPELINES = {
+    "espn_games": run_espn_games,
+    "espn_player_game_stats": run_espn_player_game_stats,
+    "KBO_game": run_kbo_game,
+    "KLEAGUE_game": run_kleague_game,
+    "KBO_stat": run_kbo_stat,
+    "kleague_parsers": run_kleague_parsers,
+}
+
+
+def run_pipeline(name, db, record):
+    """새 프로세스에서 파이프라인 하나를 실행하고 측정값을 돌려줍니다."""
+    install_db(db)
+    error = None
+    start = time.perf_counter()
+    try:
+        with HttpFixtures(name, record=record):
+            PIPELINES[name]()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+    return {
+        "pipeline": name, "db": db, "elapsed": elapsed, "error": error,
+        "rows": counters.rows, "rows_per_sec": counters.rows / elapsed if elapsed else 0.0,
+        "requests": counters.requests, "misses": counters.misses, "http_bytes": counters.bytes,
+        "round_trips": counters.round_trips,
+        # Linux ru_maxrss 단위는 KB
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def print_report(results):
+    print("\n📊 벤치마크 결과")
+    print(f"  {'pipeline':<24}{'time(s)':>9}{'rows':>9}{'rows/s':>10}{'req':>7}{'miss':>6}{'db rt':>8}{'peak MB':>9}")
+    for r in results:
+        print(f"  {r['pipeline']:<24}{r['elapsed']:>9.2f}{r['rows']:>9}{r['rows_per_sec']:>10.0f}"
+              f"{r['requests']:>7}{r['misses']:>6}{r['round_trips']:>8}{r['peak_rss_mb']:>9.0f}")
+        if r["error"]:
+            print(f"    ❌ {r['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="녹화된 응답으로 수집 파이프라인 성능 측정")
+    parser.add_argument("pipelines", nargs="*", metavar="PIPELINE", help=f"측정할 파이프라인 (기본: 전체) {list(PIPELINES)}")
+    parser.add_argument("--db", choices=["fake", "postgres"], default="fake", help="fake: 대역 커넥션 / postgres: DB_* 설정의 실제 DB")
+    parser.add_argument("--record", action="store_true", help="실제 사이트에 접속해 fixture를 새로 녹화")
+    parser.add_argument("--repeat", type=int, default=1, help="파이프라인별 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--save", type=Path, help="결과를 JSON으로 저장 (변경 전/후 비교용)")
+    args = parser.parse_args()
+
+    names = args.pipelines or list(PIPELINES)
+    unknown = [n for n in names if n not in PIPELINES]
+    if unknown:
+        parser.error(f"알 수 없는 파이프라인: {unknown} (가능: {list(PIPELINES)})")
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for name in names:
+            runs = [pool.apply(run_pipeline, (name, args.db, args.record)) for _ in range(1 if args.record else max(1, args.repeat))]
+            results.append(min(runs, key=lambda r: r["elapsed"]))
+
+    print_report(results)
+    if args.save:
+        args.save.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"💾 {args.save} 저장")
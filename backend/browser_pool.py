@@ -0,0 +1,225 @@
+import os
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException, NoSuchElementException
+
+# --- Selenium 브라우저 풀 ---
+# KBO 스크래퍼들이 각자 ChromeDriverManager().install() + Chrome 실행을 하던 것을 대신합니다.
+#   - headless Chrome N개를 미리 띄워 두고 작업마다 빌려줌 (with pool.browser() as driver)
+#   - M 페이지를 열었거나 브라우저가 죽으면 닫고 새로 띄움 (메모리 누수 / 세션 만료 방지)
+#   - chromedriver 경로는 한 번 찾으면 .sync_state/chromedriver.json에 기록해 두고
+#     다음 실행부터는 (오프라인이어도) 그 경로를 그대로 사용
+#   - pool.map(func, items)로 여러 브라우저에서 작업을 동시에 실행
+
+POOL_SIZE = int(os.getenv("KBO_BROWSER_POOL_SIZE", "3"))
+MAX_PAGES = int(os.getenv("KBO_BROWSER_MAX_PAGES", "200"))
+# 이 시간이 지나면 ChromeDriverManager로 드라이버 버전을 다시 확인 (네트워크 필요)
+DRIVER_RECHECK_HOURS = float(os.getenv("CHROMEDRIVER_RECHECK_HOURS", "24"))
+DRIVER_CACHE = Path(__file__).with_name(".sync_state") / "chromedriver.json"
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+_driver_path = None
+_driver_lock = threading.Lock()
+
+
+def resolve_driver_path():
+    """
+    chromedriver 실행 파일 경로.
+    CHROMEDRIVER_PATH 환경변수 > 최근에 확인한 캐시 경로 > ChromeDriverManager().install() 순서로 찾습니다.
+    install()이 실패해도(오프라인 등) 예전에 받아 둔 드라이버가 남아 있으면 그것을 사용합니다.
+    """
+    global _driver_path
+    with _driver_lock:
+        if _driver_path: return _driver_path
+
+        env_path = os.getenv("CHROMEDRIVER_PATH")
+        if env_path:
+            _driver_path = env_path
+            return _driver_path
+
+        cached = None
+        try:
+            cached = json.loads(DRIVER_CACHE.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        cached_ok = cached and Path(cached.get("path", "")).exists()
+        if cached_ok and time.time() - cached.get("checked_at", 0) < DRIVER_RECHECK_HOURS * 3600:
+            _driver_path = cached["path"]
+            return _driver_path
+
+        try:
+            from webdriver_manager.chrome import ChromeDriverManager
+            path = ChromeDriverManager().install()
+        except Exception as e:
+            if not cached_ok: raise
+            print(f"⚠️ chromedriver 확인 실패, 캐시된 드라이버 사용: {e}")
+            _driver_path = cached["path"]
+            return _driver_path
+
+        DRIVER_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = DRIVER_CACHE.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"path": path, "checked_at": time.time()}), encoding="utf-8")
+        os.replace(tmp, DRIVER_CACHE)
+        _driver_path = path
+        return _driver_path
+
+
+def make_options(user_agent=DEFAULT_USER_AGENT):
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    # 안티봇 우회 헤더
+    options.add_argument(f"user-agent={user_agent}")
+    return options
+
+
+class PooledBrowser:
+    """
+    풀에서 빌려준 WebDriver 래퍼. driver.get / find_element 등은 그대로 사용하면 되고,
+    get() 호출 수를 세어 MAX_PAGES를 넘으면 반납 시 브라우저를 교체합니다.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.created_at = time.monotonic()
+
+    def get(self, url):
+        self.pages += 1
+        return self.driver.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def is_alive(self):
+        try:
+            self.driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+
+
+class BrowserPool:
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES, user_agent=DEFAULT_USER_AGENT):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.user_agent = user_agent
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.created = 0
+        self.recycled = 0
+        self.closed = False
+
+    # ------------------------------------------------------------------
+    # 생성 / 종료
+    # ------------------------------------------------------------------
+    def _launch(self):
+        driver = webdriver.Chrome(service=Service(resolve_driver_path()), options=make_options(self.user_agent))
+        with self.lock:
+            self.created += 1
+        return PooledBrowser(driver)
+
+    def start(self):
+        """브라우저 N개를 미리 띄워 둡니다. (Chrome 실행은 병렬로)"""
+        resolve_driver_path()
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            for browser in ex.map(lambda _: self._launch(), range(self.size)):
+                self.idle.put(browser)
+        print(f"🌐 브라우저 풀 준비 완료: {self.size}개 (교체 주기 {self.max_pages}페이지)")
+        return self
+
+    def close(self):
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().quit()
+            except queue.Empty:
+                break
+        print(f"🌐 브라우저 풀 종료 (생성 {self.created}개, 교체 {self.recycled}회)")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ------------------------------------------------------------------
+    # 대여 / 반납
+    # ------------------------------------------------------------------
+    def _release(self, browser, crashed):
+        if crashed or browser.pages >= self.max_pages:
+            browser.quit()
+            with self.lock:
+                self.recycled += 1
+            if self.closed: return
+            try:
+                browser = self._launch()
+            except Exception as e:
+                # 새 브라우저를 못 띄우면 다음 대여 때 다시 시도
+                print(f"⚠️ 브라우저 재시작 실패: {e}")
+                self.idle.put(None)
+                return
+        if self.closed:
+            browser.quit()
+        else:
+            self.idle.put(browser)
+
+    @contextmanager
+    def browser(self):
+        """
+        with pool.browser() as driver: ...
+        블록 안에서 WebDriver 오류가 나고 브라우저가 응답하지 않으면 반납 시 교체합니다.
+        """
+        browser = self.idle.get()
+        if browser is None:
+            try:
+                browser = self._launch()
+            except Exception:
+                # 자리를 돌려놓지 않으면 실패가 쌓일수록 풀이 줄어들다 idle.get()에서 멈춤
+                self.idle.put(None)
+                raise
+        crashed = False
+        try:
+            yield browser
+        except WebDriverException as e:
+            crashed = not isinstance(e, NoSuchElementException) and not browser.is_alive()
+            raise
+        finally:
+            self._release(browser, crashed)
+
+    def map(self, func, items, retries=1):
+        """
+        func(driver, item)을 풀의 브라우저들로 동시에 실행합니다.
+        완료되는 순서대로 (item, 결과, 에러) 를 돌려줍니다. 브라우저가 죽어서 실패한 작업은 새 브라우저로 재시도합니다.
+        """
+        def run(item):
+            for attempt in range(retries + 1):
+                try:
+                    with self.browser() as driver:
+                        return func(driver, item)
+                except WebDriverException:
+                    if attempt >= retries: raise
+
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            futures = {ex.submit(run, item): item for item in items}
+            for fut in as_completed(futures):
+                try:
+                    yield futures[fut], fut.result(), None
+                except Exception as e:
+                    yield futures[fut], None, e
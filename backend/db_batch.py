@@ -0,0 +1,108 @@
+import os
+import time
+
+from psycopg2.extras import execute_values
+
+# --- 다건 Upsert 배치 ---
+# 행을 모아 두었다가 execute_values 한 번(INSERT ... VALUES (..), (..) ... ON CONFLICT ...)으로 저장합니다.
+# 행마다 cur.execute를 호출하던 방식보다 DB 왕복 횟수가 batch_size 배 줄어듭니다.
+#
+# 변경 감지: upsert 문에 'DO UPDATE ... WHERE (기존값) IS DISTINCT FROM (새 값)' 과 'RETURNING 1'을 붙이면
+# 값이 같은 행은 UPDATE 자체가 일어나지 않고(인덱스/WAL 기록 없음) RETURNING에도 나오지 않습니다.
+# 이 경우 실제로 쓰인 행 수를 세어 report()에 '변경 없음' 수를 함께 출력합니다.
+
+DEFAULT_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", "1000"))
+
+# --- 경기 id 잠금 ---
+# sl_games는 game_date 파티션이라 기본 키가 (id, game_date)이고 id만으로는 중복을 막지 못합니다.
+# 수집 스크립트는 'id가 이미 있으면 저장된 날짜 사용' 을 INSERT 안의 SELECT로 확인하는데,
+# 동시에 도는 두 스크립트(app.py 수집기와 sync_master 작업 등)가 서로의 미커밋 행을 못 보고
+# 같은 id를 다른 날짜로 저장할 수 있습니다.
+# 저장 전에 별도 문장으로 id마다 트랜잭션 advisory lock을 잡으면 먼저 잡은 쪽이 커밋할 때까지 기다리고,
+# (READ COMMITTED라) 다음 INSERT 문은 새 스냅샷으로 이미 커밋된 행을 보게 됩니다.
+# 잠금은 commit/rollback 때 풀립니다. 교착을 줄이려고 항상 id 오름차순으로 잡습니다.
+SQL_LOCK_IDS = "SELECT pg_advisory_xact_lock(k) FROM unnest(%s::bigint[]) AS k"
+
+
+def lock_ids(cur, ids):
+    """id마다 pg_advisory_xact_lock (현재 트랜잭션이 끝날 때까지 유지)"""
+    ids = sorted(set(ids))
+    if ids:
+        cur.execute(SQL_LOCK_IDS, (ids,))
+
+
+class UpsertBatch:
+    """
+    sql은 'VALUES %s' 자리표시자를 가진 INSERT 문이어야 합니다.
+    key(row)를 주면 같은 키의 행은 마지막 것만 남깁니다.
+    (한 문장에서 같은 행을 두 번 ON CONFLICT UPDATE 하면 Postgres가 에러를 내므로 필수)
+    before: 이 배치보다 먼저 flush 되어야 하는 배치 목록 (예: FK 대상인 sl_games 스텁)
+    lock: lock(row)가 돌려준 id들을 flush 전에 lock_ids로 잠급니다. (sl_games 저장)
+    """
+
+    def __init__(self, cur, sql, name, template=None, key=None, batch_size=DEFAULT_BATCH_SIZE, before=None, lock=None):
+        self.cur = cur
+        self.sql = sql
+        self.name = name
+        self.template = template
+        self.key = key
+        self.batch_size = max(1, batch_size)
+        self.before = before or []
+        self.lock = lock
+        self.rows = {} if key else []
+        self.returning = "RETURNING" in sql.upper()
+        # 통계
+        self.flushes = 0
+        self.rows_written = 0
+        self.rows_changed = 0
+        self.flush_time = 0.0
+        self.max_flush_time = 0.0
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, row):
+        if self.key:
+            self.rows[self.key(row)] = row
+        else:
+            self.rows.append(row)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 행을 한 번에 저장합니다. (commit은 호출하는 쪽에서)"""
+        for dep in self.before:
+            dep.flush()
+        if not self.rows: return 0
+
+        rows = list(self.rows.values()) if self.key else self.rows
+        start = time.monotonic()
+        if self.lock:
+            lock_ids(self.cur, (self.lock(r) for r in rows))
+        result = execute_values(self.cur, self.sql, rows, template=self.template, page_size=len(rows), fetch=self.returning)
+        elapsed = time.monotonic() - start
+
+        self.flushes += 1
+        self.rows_written += len(rows)
+        self.rows_changed += len(result) if self.returning else len(rows)
+        self.flush_time += elapsed
+        self.max_flush_time = max(self.max_flush_time, elapsed)
+        self.rows = {} if self.key else []
+        return len(rows)
+
+    def discard(self):
+        """롤백 시 아직 저장되지 않은 행을 버립니다."""
+        for dep in self.before:
+            dep.discard()
+        self.rows = {} if self.key else []
+
+    @property
+    def rows_unchanged(self):
+        return self.rows_written - self.rows_changed
+
+    def report(self):
+        if not self.flushes: return
+        avg = self.flush_time / self.flushes
+        unchanged = f" (변경 없음 {self.rows_unchanged})" if self.returning else ""
+        print(f"  🧮 [{self.name}] {self.rows_written}행{unchanged} / {self.flushes}회 flush, "
+              f"평균 {avg*1000:.0f}ms, 최대 {self.max_flush_time*1000:.0f}ms, 합계 {self.flush_time:.1f}s")
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# --- ESPN 응답 디스크 캐시 ---
+# 같은 nightly 실행 안에서 teams 목록 / 로스터가 여러 스크립트에서 반복 요청되므로
+# URL+params 기준으로 응답을 디스크에 저장해 두고 재사용합니다.
+#   - 엔드포인트 종류별 TTL (TTL 안에서는 네트워크 요청 없이 캐시 반환)
+#   - TTL이 지나면 ETag / Last-Modified로 재검증 (304면 본문 재다운로드 없음)
+#   - 전체 용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+# sync_master가 여러 스크립트를 동시에 돌려도 파일 교체(os.replace)가 원자적이라 안전합니다.
+
+ENABLED = os.getenv("ESPN_CACHE", "1") != "0"
+CACHE_DIR = Path(os.getenv("ESPN_CACHE_DIR", Path(__file__).with_name(".http_cache")))
+MAX_BYTES = int(float(os.getenv("ESPN_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+# 엔드포인트 종류별 TTL (초). 목록에 없는 종류는 캐시하지 않습니다.
+TTLS = {
+    "teams": int(os.getenv("ESPN_CACHE_TTL_TEAMS", str(6 * 3600))),    # .../teams?limit=1000
+    "roster": int(os.getenv("ESPN_CACHE_TTL_ROSTER", str(6 * 3600))),  # .../teams/{id}?enable=roster
+}
+
+_evict_lock = threading.Lock()
+
+
+def endpoint_class(url, params=None):
+    """캐시 정책을 고르기 위한 엔드포인트 종류 (캐시 대상이 아니면 None)"""
+    path = urlparse(url).path.rstrip("/")
+    params = params or {}
+    if path.endswith("/teams"):
+        return "teams"
+    if re.search(r"/teams/\d+$", path) and params.get("enable") == "roster":
+        return "roster"
+    return None
+
+
+def cache_key(url, params=None):
+    query = urlencode(sorted((params or {}).items()))
+    return hashlib.sha1(f"{url}?{query}".encode("utf-8")).hexdigest()
+
+
+def _paths(key):
+    return CACHE_DIR / f"{key}.json", CACHE_DIR / f"{key}.body"
+
+
+def load(key):
+    """(메타데이터 dict, 본문 bytes) 또는 None"""
+    meta_path, body_path = _paths(key)
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        body = body_path.read_bytes()
+    except (OSError, ValueError):
+        return None
+    # LRU 판단용 접근 시각 갱신
+    try:
+        os.utime(meta_path)
+    except OSError:
+        pass
+    return meta, body
+
+
+def _write_atomic(path, data):
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def store(key, url, res):
+    """200 응답을 저장합니다."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    meta_path, body_path = _paths(key)
+    meta = {
+        "url": res.url or url,
+        "stored_at": time.time(),
+        "etag": res.headers.get("ETag"),
+        "last_modified": res.headers.get("Last-Modified"),
+        "headers": {"Content-Type": res.headers.get("Content-Type", "application/json")},
+    }
+    _write_atomic(body_path, res.content)
+    _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    evict()
+
+
+def touch(key, meta):
+    """304 재검증 성공 시 저장 시각만 갱신합니다."""
+    meta["stored_at"] = time.time()
+    meta_path, _ = _paths(key)
+    try:
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError:
+        pass
+
+
+def is_fresh(meta, klass):
+    return time.time() - meta.get("stored_at", 0) < TTLS.get(klass, 0)
+
+
+def conditional_headers(meta):
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def to_response(meta, body):
+    """캐시 항목을 requests.Response로 되돌립니다. (기존 res.json() / status_code 코드 그대로 사용 가능)"""
+    res = requests.Response()
+    res.status_code = 200
+    res._content = body
+    res.url = meta.get("url")
+    res.encoding = "utf-8"
+    res.headers = CaseInsensitiveDict(meta.get("headers", {}))
+    res.headers["X-Cache"] = "HIT"
+    return res
+
+
+def evict():
+    """캐시 전체 용량이 MAX_BYTES를 넘으면 최근 접근이 오래된 항목부터 삭제합니다."""
+    with _evict_lock:
+        entries = []
+        total = 0
+        for meta_path in CACHE_DIR.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                size = meta_path.stat().st_size + body_path.stat().st_size
+                last_used = meta_path.stat().st_mtime  # load()/touch() 때 갱신됨
+            except OSError:
+                continue
+            entries.append((last_used, size, meta_path, body_path))
+            total += size
+        if total <= MAX_BYTES: return
+
+        for _, size, meta_path, body_path in sorted(entries):
+            for p in (meta_path, body_path):
+                try:
+                    p.unlink()
+                except OSError:
+                    pass
+            total -= size
+            if total <= MAX_BYTES: break
@@ -0,0 +1,218 @@
+import os
+import re
+import random
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import espn_cache
+
+# --- ESPN 공용 HTTP 클라이언트 ---
+# 모든 ESPN 수집 스크립트가 하나의 Session(keep-alive 커넥션 풀)을 공유합니다.
+# requests.get 대신 espn_client.get(...)을 사용하세요.
+# teams 목록 / 로스터 응답은 espn_cache(디스크 캐시)를 거칩니다. (ESPN_CACHE=0 으로 끄기)
+
+# 호스트당 최대 커넥션 수 (site.api.espn.com / site.web.api.espn.com 각각)
+POOL_MAXSIZE = int(os.getenv("ESPN_POOL_MAXSIZE", "16"))
+# 호스트당 초당 요청 수 (token bucket)
+RATE_PER_SEC = float(os.getenv("ESPN_RATE_PER_SEC", "20"))
+RATE_BURST = int(os.getenv("ESPN_RATE_BURST", "20"))
+# 429/5xx 재시도
+MAX_RETRIES = int(os.getenv("ESPN_MAX_RETRIES", "4"))
+BACKOFF_BASE = float(os.getenv("ESPN_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = float(os.getenv("ESPN_BACKOFF_MAX", "30"))
+DEFAULT_TIMEOUT = float(os.getenv("ESPN_TIMEOUT", "20"))
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+
+class TokenBucket:
+    """호스트 단위 요청 속도 제한기 (여러 스레드에서 공유 가능)"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0: return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_sec = (1 - self.tokens) / self.rate
+            time.sleep(wait_sec)
+
+
+class EndpointStats:
+    """엔드포인트별 요청 수 / 지연 시간 / 재시도 / 에러 카운터"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0, "retries": 0, "errors": 0, "cache_hits": 0, "revalidated": 0})
+
+    def record(self, endpoint, elapsed, retries=0, error=False, cache=None):
+        with self.lock:
+            s = self.data[endpoint]
+            s["count"] += 1
+            s["total"] += elapsed
+            s["max"] = max(s["max"], elapsed)
+            s["retries"] += retries
+            if error: s["errors"] += 1
+            if cache == "hit": s["cache_hits"] += 1
+            if cache == "revalidated": s["revalidated"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {k: dict(v) for k, v in self.data.items()}
+
+    def merge(self, snap):
+        """다른 프로세스에서 모은 snapshot(또는 그 차이)을 더합니다. (espn_shards 워커 → 부모)"""
+        with self.lock:
+            for endpoint, other in snap.items():
+                s = self.data[endpoint]
+                for field, value in other.items():
+                    s[field] = max(s[field], value) if field == "max" else s[field] + value
+
+
+_session = None
+_session_lock = threading.Lock()
+_buckets = {}
+_buckets_lock = threading.Lock()
+stats = EndpointStats()
+
+
+def get_session():
+    """프로세스 공용 Session (최초 호출 시 생성)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                # 재시도는 아래 get()에서 직접 처리 (rate limit과 통계를 함께 관리하기 위해)
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=POOL_MAXSIZE, max_retries=0, pool_block=True)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update(DEFAULT_HEADERS)
+                _session = s
+    return _session
+
+
+def _bucket_for(host):
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(RATE_PER_SEC, RATE_BURST)
+        return _buckets[host]
+
+
+def set_rate_limit(rate, burst=None):
+    """호스트별 초당 요청 수 변경 (이미 만들어진 bucket도 새 값으로 교체)"""
+    global RATE_PER_SEC, RATE_BURST
+    RATE_PER_SEC = float(rate)
+    if burst is not None:
+        RATE_BURST = int(burst)
+    with _buckets_lock:
+        _buckets.clear()
+
+
+def endpoint_key(url):
+    """
+    통계용 엔드포인트 이름 (숫자 ID는 {id}로 치환)
+    예: site.api.espn.com/.../teams/{id}/schedule
+    """
+    parsed = urlparse(url)
+    path = re.sub(r"/\d+(?=/|$)", "/{id}", parsed.path)
+    path = path.replace("/apis/site/v2/sports", "").replace("/apis/common/v3/sports", "")
+    return f"{parsed.netloc}{path}"
+
+
+def _retry_after(res, attempt):
+    header = res.headers.get("Retry-After") if res is not None else None
+    if header and header.isdigit():
+        return min(float(header), BACKOFF_MAX)
+    # 지수 백오프 + jitter
+    return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * (0.5 + random.random() / 2)
+
+
+def get(url, params=None, headers=None, timeout=DEFAULT_TIMEOUT, stream=False):
+    """
+    requests.get 대체 함수.
+    - 공용 Session (keep-alive)
+    - 호스트별 token bucket 속도 제한
+    - 429/5xx 및 커넥션 에러 시 지수 백오프 재시도
+    - teams / roster 응답은 디스크 캐시 (TTL 내 재사용, 이후 ETag/Last-Modified 재검증)
+    - stream=True: 200 응답의 본문을 읽지 않고 돌려줌 (espn_json.items가 소켓에서 바로 파싱)
+    최종 응답(Response)을 그대로 반환하므로 기존 status_code / json() 코드는 그대로 동작합니다.
+    """
+    key = endpoint_key(url)
+    start = time.monotonic()
+
+    klass = espn_cache.endpoint_class(url, params) if espn_cache.ENABLED else None
+    cached = None
+    if klass:
+        ckey = espn_cache.cache_key(url, params)
+        cached = espn_cache.load(ckey)
+        if cached and espn_cache.is_fresh(cached[0], klass):
+            stats.record(key, time.monotonic() - start, cache="hit")
+            return espn_cache.to_response(*cached)
+        if cached:
+            headers = {**(headers or {}), **espn_cache.conditional_headers(cached[0])}
+
+    session = get_session()
+    bucket = _bucket_for(urlparse(url).netloc)
+    attempt = 0
+
+    while True:
+        bucket.acquire()
+        res = None
+        try:
+            res = session.get(url, params=params, headers=headers, timeout=timeout, stream=stream)
+            if res.status_code not in RETRY_STATUS or attempt >= MAX_RETRIES:
+                break
+            res.close()  # 재시도 전에 커넥션 반납 (stream=True면 본문을 읽지 않은 상태)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= MAX_RETRIES:
+                stats.record(key, time.monotonic() - start, retries=attempt, error=True)
+                raise
+        time.sleep(_retry_after(res, attempt))
+        attempt += 1
+
+    elapsed = time.monotonic() - start
+    if cached and res.status_code == 304:
+        espn_cache.touch(ckey, cached[0])
+        stats.record(key, elapsed, retries=attempt, cache="revalidated")
+        return espn_cache.to_response(*cached)
+    if klass and res.status_code == 200:
+        try:
+            espn_cache.store(ckey, url, res)
+        except OSError as e:
+            print(f"⚠️ 캐시 저장 실패 ({key}): {e}")
+    if stream and res.status_code != 200:
+        res.content  # 에러 응답은 작으므로 바로 읽어서 커넥션 반납 (호출하는 쪽은 status_code만 확인)
+    stats.record(key, elapsed, retries=attempt, error=res.status_code >= 400)
+    return res
+
+
+def print_stats():
+    """엔드포인트별 지연 시간 요약 출력 (스크립트 종료 시 호출)"""
+    snap = stats.snapshot()
+    if not snap: return
+    print("\n📈 ESPN API 호출 통계")
+    for key, s in sorted(snap.items(), key=lambda kv: -kv[1]["total"]):
+        avg = s["total"] / s["count"] if s["count"] else 0
+        cache = f", 캐시 {s['cache_hits']}/재검증 {s['revalidated']}" if s["cache_hits"] or s["revalidated"] else ""
+        print(f"  - {key}: {s['count']}회, 평균 {avg*1000:.0f}ms, 최대 {s['max']*1000:.0f}ms, 재시도 {s['retries']}, 에러 {s['errors']}{cache}")
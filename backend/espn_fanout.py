@@ -0,0 +1,87 @@
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import espn_client
+
+# --- 비동기 Fan-out 엔진 ---
+# 선수 단위 gamelog / splits 요청을 동시에 보내고, 파싱 결과를 bounded queue로 흘려보내
+# 단 하나의 DB writer가 순서대로 저장합니다.
+#
+#   fetch(job)  -> 결과 (None이면 저장할 것 없음)   : 워커 스레드에서 실행 (espn_client 공용 Session 사용)
+#   write(item) -> 저장 건수(int)                    : writer 1개가 순차 실행 (psycopg2 커넥션을 한 스레드만 사용)
+#
+# HTTP는 espn_client(requests Session)를 그대로 쓰므로 커넥션 풀/호스트별 rate limit/재시도가 공유됩니다.
+
+DEFAULT_CONCURRENCY = int(os.getenv("ESPN_FANOUT_CONCURRENCY", "16"))
+DEFAULT_QUEUE_SIZE = int(os.getenv("ESPN_FANOUT_QUEUE_SIZE", "256"))
+# fetch 실패는 처음 몇 건만 출력하고 나머지는 개수만 집계 (네트워크 장애 시 로그 폭주 방지)
+FETCH_ERROR_LOG_LIMIT = int(os.getenv("ESPN_FANOUT_ERROR_LOG_LIMIT", "20"))
+
+_DONE = object()
+
+
+async def _fetch_worker(jobs, fetch, queue, summary, executor):
+    loop = asyncio.get_running_loop()
+    for job in jobs:
+        try:
+            item = await loop.run_in_executor(executor, fetch, job)
+        except Exception as e:
+            summary["fetch_errors"] += 1
+            if summary["fetch_errors"] <= FETCH_ERROR_LOG_LIMIT:
+                print(f"    ⚠️ fetch 실패 {job}: {type(e).__name__}: {e}")
+                if summary["fetch_errors"] == FETCH_ERROR_LOG_LIMIT:
+                    print("    ⚠️ 이후 fetch 실패는 개수만 집계합니다.")
+            continue
+        summary["fetched"] += 1
+        if item is not None:
+            # 큐가 가득 차면 여기서 대기 (DB가 느리면 fetch도 자연스럽게 늦춰짐)
+            await queue.put(item)
+
+
+async def _writer(queue, write, summary, progress_every):
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            return
+        try:
+            summary["saved"] += await asyncio.to_thread(write, item) or 0
+        except Exception as e:
+            summary["write_errors"] += 1
+            print(f"    ⚠️ 저장 실패: {e}")
+        summary["written"] += 1
+        if progress_every and summary["written"] % progress_every == 0:
+            print(f"    … {summary['written']}건 처리 (저장 {summary['saved']}, 큐 {queue.qsize()})")
+
+
+async def fan_out(jobs, fetch, write, concurrency=DEFAULT_CONCURRENCY, queue_size=DEFAULT_QUEUE_SIZE, progress_every=500):
+    """jobs를 concurrency개 워커로 동시에 fetch하고, 결과를 writer 하나가 저장합니다."""
+    summary = {"fetched": 0, "fetch_errors": 0, "written": 0, "write_errors": 0, "saved": 0}
+    queue = asyncio.Queue(maxsize=queue_size)
+    job_iter = iter(jobs)  # 워커들이 하나의 iterator를 나눠 소비
+    concurrency = max(1, concurrency)
+
+    # 기본 executor는 스레드 수가 작으므로 동시성 한도만큼 전용 풀을 사용
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="espn-fetch") as executor:
+        writer = asyncio.create_task(_writer(queue, write, summary, progress_every))
+        workers = [asyncio.create_task(_fetch_worker(job_iter, fetch, queue, summary, executor)) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            await queue.put(_DONE)
+            await writer
+    return summary
+
+
+def run(jobs, fetch, write, concurrency=DEFAULT_CONCURRENCY, queue_size=DEFAULT_QUEUE_SIZE, rate=None):
+    """
+    동기 코드에서 호출하는 진입점. 실행 요약(dict)에 소요 시간(elapsed)을 더해 반환합니다.
+    rate를 주면 호스트별 초당 요청 수를 그 값으로 제한합니다.
+    """
+    if rate is not None:
+        espn_client.set_rate_limit(rate)
+    start = time.monotonic()
+    summary = asyncio.run(fan_out(jobs, fetch, write, concurrency=concurrency, queue_size=queue_size))
+    summary["elapsed"] = time.monotonic() - start
+    return summary
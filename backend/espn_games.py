@@ -1,9 +1,12 @@
 import os
 from pathlib import Path
-import requests
+import argparse
+import espn_client
+import espn_shards
+import db_batch
 import psycopg2
 import json
-from datetime import datetime
+from datetime import datetime, date, timedelta
 
 # --- 설정 (환경에 맞게 수정하세요) ---
 def load_env(path: Path) -> None:
@@ -47,8 +50,180 @@ TARGET_LEAGUES = [
 def get_db_connection():
     return psycopg2.connect(**DB_CONFIG)
 
-def sync_season_schedule(sport, league_slug):
-    print(f"🚀 [{league_slug}] 경기 일정(Schedule) 동기화 시작...")
+# --- 증분 동기화 상태 ---
+# 리그별 high-water mark: 이 시각 이전 경기는 모두 끝난(DONE_STATUSES) 상태로 저장되어 있음
+STATE_PATH = Path(__file__).with_name(".sync_state") / "espn_games.json"
+# 더 이상 바뀌지 않는 상태 (축구는 STATUS_FULL_TIME으로 끝나고, 연기/취소 경기는 FINAL이 되지 않음)
+DONE_STATUSES = ("STATUS_FINAL", "STATUS_FULL_TIME", "STATUS_POSTPONED", "STATUS_CANCELED")
+# 증분 모드는 팀별 /schedule 대신 scoreboard?dates= 로 high-water mark ~ 오늘+LOOKAHEAD_DAYS 구간만 받음
+# (mark 이전 경기는 모두 끝났으므로 다시 받을 필요 없음, 구간은 WINDOW_CHUNK_DAYS 단위로 나눠 요청)
+# 구간이 MAX_WINDOW_DAYS보다 길면(비시즌 뒤 새 시즌 등) 팀별 일정으로 시즌 전체를 다시 받음
+LOOKAHEAD_DAYS = int(os.getenv("ESPN_GAMES_LOOKAHEAD_DAYS", "14"))
+WINDOW_CHUNK_DAYS = 7
+MAX_WINDOW_DAYS = int(os.getenv("ESPN_GAMES_MAX_WINDOW_DAYS", "60"))
+# 구간 하나에 들어올 수 있는 최대 이벤트 수 (MLB 한 주 ≈ 100경기)
+EVENT_LIMIT = 1000
+
+# sl_games는 game_date 연도별 파티션이라 충돌 키가 (id, game_date)입니다.
+# 이미 저장된 경기는 저장된 game_date를 그대로 써서(일정 변경으로 날짜가 바뀌어도) 같은 행을 갱신합니다.
+# 다른 스크립트와 동시에 같은 경기를 저장하지 않도록 배치가 flush 전에 경기 id를 잠급니다. (db_batch.lock_ids)
+SQL_GAMES = """
+    INSERT INTO sl_games
+    (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
+    SELECT v.id, v.season_id, v.league_id, v.home_team_id, v.away_team_id,
+           COALESCE((SELECT g.game_date FROM sl_games g WHERE g.id = v.id LIMIT 1), v.game_date),
+           v.status, v.home_score, v.away_score, v.score_detail
+    FROM (VALUES %s) AS v (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
+    ON CONFLICT (id, game_date) DO UPDATE
+    SET status = EXCLUDED.status,
+        home_score = EXCLUDED.home_score,
+        away_score = EXCLUDED.away_score,
+        score_detail = EXCLUDED.score_detail
+    WHERE (sl_games.status, sl_games.home_score, sl_games.away_score, sl_games.score_detail)
+          IS DISTINCT FROM (EXCLUDED.status, EXCLUDED.home_score, EXCLUDED.away_score, EXCLUDED.score_detail)
+    RETURNING 1;
+"""
+
+# VALUES 목록이 SELECT를 거치므로 타입을 명시
+GAMES_TEMPLATE = "(%s::bigint, %s::int, %s::bigint, %s::bigint, %s::bigint, %s::timestamptz, %s::varchar, %s::int, %s::int, %s::jsonb)"
+
+def load_state():
+    try:
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+def score_value(competitor):
+    """schedule 응답은 {"value": 3.0, ...}, scoreboard 응답은 "3" 문자열로 점수를 줍니다."""
+    score = competitor.get('score')
+    if isinstance(score, dict):
+        score = score.get('value')
+    if score in (None, ''):
+        return None
+    return float(score)
+
+def parse_event(event):
+    """
+    schedule/scoreboard 이벤트 하나를 sl_games 저장용 dict로 변환합니다. 필수 정보가 없으면 None.
+    """
+    game_id = int(event['id'])
+    game_date_str = event.get('date') # "2024-03-20T19:00Z"
+    
+    if not game_date_str: return None
+
+    # 날짜 파싱
+    game_date = datetime.strptime(game_date_str, "%Y-%m-%dT%H:%MZ")
+    
+    # [핵심 수정] 경기 상태 파싱 (KeyError: 'status' 방지)
+    status_obj = event.get('status', {})
+    status_type = status_obj.get('type', {})
+    status = status_type.get('name', 'STATUS_UNKNOWN') # 값이 없으면 UNKNOWN
+    status_detail = status_type.get('detail', 'Unknown')
+    
+    # [핵심 수정] competitions 파싱 (IndexError 방지)
+    competitions_list = event.get('competitions', [])
+    if not competitions_list: return None # 상세 정보 없으면 패스
+    competitions = competitions_list[0]
+    
+    # 홈/어웨이 팀 찾기
+    comp_list = competitions.get('competitors', [])
+    home_team = next((c for c in comp_list if c['homeAway'] == 'home'), {})
+    away_team = next((c for c in comp_list if c['homeAway'] == 'away'), {})
+    
+    # 점수 파싱 (None 처리 안전하게)
+    h_score_val = score_value(home_team)
+    a_score_val = score_value(away_team)
+    
+    # 상세 스코어(이닝/쿼터) JSONB
+    venue_obj = competitions.get('venue', {})
+    return {
+        "id": game_id,
+        "game_date": game_date,
+        "status": status,
+        "home_id": int(home_team.get('id', 0)),
+        "away_id": int(away_team.get('id', 0)),
+        "home_score": int(h_score_val) if h_score_val is not None else None,
+        "away_score": int(a_score_val) if a_score_val is not None else None,
+        "score_detail": {
+            "status_detail": status_detail,
+            "venue": venue_obj.get('fullName', 'Unknown Venue')
+        },
+    }
+
+def load_stored_games(cur, league_id):
+    """DB에 저장된 리그 경기 상태: id -> (status, home_score, away_score)"""
+    cur.execute("SELECT id, status, home_score, away_score FROM sl_games WHERE league_id = %s", (league_id,))
+    return {r[0]: (r[1], r[2], r[3]) for r in cur.fetchall()}
+
+def needs_write(game, stored, high_water):
+    """증분 모드에서 이 경기를 다시 써야 하는지 판단합니다."""
+    prev = stored.get(game["id"])
+    if prev is None:
+        return True
+    # high-water mark 이전 경기는 이미 종료 상태로 저장되어 있음
+    if high_water and game["game_date"].isoformat() < high_water:
+        return False
+    # 이미 끝난 상태로 저장되어 있고 상태/점수도 같으면 건너뜀
+    if prev[0] in DONE_STATUSES and prev == (game["status"], game["home_score"], game["away_score"]):
+        return False
+    return True
+
+def next_high_water(games):
+    """아직 끝나지 않은 가장 이른 경기 시각 (모두 끝났으면 마지막 경기 시각)"""
+    pending = [g["game_date"] for g in games if g["status"] not in DONE_STATUSES]
+    if pending:
+        return min(pending).isoformat()
+    return max(g["game_date"] for g in games).isoformat() if games else None
+
+def fetch_team_schedules(base_url, teams, events_by_id):
+    """팀별 /schedule (시즌 전체). 반환: 받은 이벤트 수"""
+    fetched_events = 0
+    for t in teams:
+        team_core = t.get('team', {})
+        team_id = team_core.get('id')
+        
+        if not team_id: continue # 팀 ID 없으면 패스
+
+        # 팀별 스케줄 API 호출
+        schedule_url = f"{base_url}/{team_id}/schedule"
+        try:
+            s_res = espn_client.get(schedule_url)
+            if s_res.status_code != 200: continue
+            s_data = s_res.json()
+        except:
+            continue
+        
+        for event in s_data.get('events', []):
+            if event.get('id'):
+                events_by_id[event['id']] = event
+                fetched_events += 1
+    return fetched_events
+
+def fetch_window(sport, league_slug, start, end, events_by_id):
+    """scoreboard?dates=YYYYMMDD-YYYYMMDD 로 [start, end] 기간 경기. 반환: 받은 이벤트 수"""
+    url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league_slug}/scoreboard"
+    fetched_events = 0
+    day = start
+    while day <= end:
+        chunk_end = min(end, day + timedelta(days=WINDOW_CHUNK_DAYS - 1))
+        res = espn_client.get(url, params={"dates": f"{day:%Y%m%d}-{chunk_end:%Y%m%d}", "limit": EVENT_LIMIT})
+        res.raise_for_status()
+        for event in res.json().get('events', []):
+            if event.get('id'):
+                events_by_id[event['id']] = event
+                fetched_events += 1
+        day = chunk_end + timedelta(days=1)
+    return fetched_events
+
+def sync_season_schedule(sport, league_slug, full=False, state=None):
+    mode = "전체 재구축" if full else "증분"
+    print(f"🚀 [{league_slug}] 경기 일정(Schedule) 동기화 시작... ({mode})")
     
     conn = get_db_connection()
     cur = conn.cursor()
@@ -57,7 +232,7 @@ def sync_season_schedule(sport, league_slug):
     
     try:
         # 1. 리그 정보 가져오기
-        res = requests.get(base_url, params={'limit': 1000})
+        res = espn_client.get(base_url, params={'limit': 1000})
         # 응답 코드가 200이 아니면 예외 발생
         res.raise_for_status() 
         data = res.json()
@@ -105,100 +280,54 @@ def sync_season_schedule(sport, league_slug):
             """, (league_id, season_year))
             season_db_id = cur.fetchone()[0]
 
-        # 2. 각 팀별 스케줄 순회
-        teams = league_data.get('teams', [])
-        total_games_processed = 0
+        # 2. 경기 수집 (홈/원정 팀 스케줄에 같은 경기가 두 번 나오므로 id 기준으로 합침)
+        state = state if state is not None else {}
+        high_water = None if full else state.get(league_slug)
+        events_by_id = {}
+        window = None
+        if high_water:
+            # mark는 UTC 시각이고 scoreboard dates는 미국 날짜 기준이라 하루 앞에서 시작
+            start = datetime.fromisoformat(high_water).date() - timedelta(days=1)
+            end = date.today() + timedelta(days=LOOKAHEAD_DAYS)
+            if (end - start).days <= MAX_WINDOW_DAYS:
+                window = (start, end)
 
-        for t in teams:
-            team_core = t.get('team', {})
-            team_id = team_core.get('id')
-            team_name = team_core.get('displayName', 'Unknown Team')
-            
-            if not team_id: continue # 팀 ID 없으면 패스
+        if window:
+            fetched_events = fetch_window(sport, league_slug, *window, events_by_id)
+            print(f"  - scoreboard {window[0]} ~ {window[1]} 구간만 수집 (high-water mark 이후)")
+        else:
+            fetched_events = fetch_team_schedules(base_url, league_data.get('teams', []), events_by_id)
 
-            # 팀별 스케줄 API 호출
-            schedule_url = f"{base_url}/{team_id}/schedule"
+        games = []
+        for event in events_by_id.values():
+            # [수정됨] 개별 게임 에러 처리 (하나가 망가져도 나머지는 저장)
             try:
-                s_res = requests.get(schedule_url)
-                if s_res.status_code != 200: continue
-                s_data = s_res.json()
-            except:
+                game = parse_event(event)
+                if game: games.append(game)
+            except Exception as inner_e:
+                # print(f"    ⚠️ Game Skipped (ID: {event.get('id')}): {inner_e}")
                 continue
-            
-            events = s_data.get('events', [])
-            
-            for event in events:
-                # [수정됨] 개별 게임 에러 처리 (하나가 망가져도 나머지는 저장)
-                try:
-                    game_id = int(event['id'])
-                    game_date_str = event.get('date') # "2024-03-20T19:00Z"
-                    
-                    if not game_date_str: continue 
-
-                    # 날짜 파싱
-                    game_date = datetime.strptime(game_date_str, "%Y-%m-%dT%H:%MZ")
-                    
-                    # [핵심 수정] 경기 상태 파싱 (KeyError: 'status' 방지)
-                    status_obj = event.get('status', {})
-                    status_type = status_obj.get('type', {})
-                    status = status_type.get('name', 'STATUS_UNKNOWN') # 값이 없으면 UNKNOWN
-                    status_detail = status_type.get('detail', 'Unknown')
-                    
-                    # [핵심 수정] competitions 파싱 (IndexError 방지)
-                    competitions_list = event.get('competitions', [])
-                    if not competitions_list: continue # 상세 정보 없으면 패스
-                    competitions = competitions_list[0]
-                    
-                    # 홈/어웨이 팀 찾기
-                    comp_list = competitions.get('competitors', [])
-                    home_team = next((c for c in comp_list if c['homeAway'] == 'home'), {})
-                    away_team = next((c for c in comp_list if c['homeAway'] == 'away'), {})
-                    
-                    home_id = int(home_team.get('id', 0))
-                    away_id = int(away_team.get('id', 0))
-                    
-                    # 점수 파싱 (None 처리 안전하게)
-                    h_score_val = home_team.get('score', {}).get('value')
-                    a_score_val = away_team.get('score', {}).get('value')
-                    
-                    home_score = int(h_score_val) if h_score_val is not None else None
-                    away_score = int(a_score_val) if a_score_val is not None else None
-                    
-                    # 상세 스코어(이닝/쿼터) JSONB
-                    venue_obj = competitions.get('venue', {})
-                    score_detail = {
-                        "status_detail": status_detail,
-                        "venue": venue_obj.get('fullName', 'Unknown Venue')
-                    }
-
-                    # [INSERT] 게임 저장
-                    sql_game = """
-                        INSERT INTO sl_games 
-                        (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (id) DO UPDATE 
-                        SET status = EXCLUDED.status,
-                            home_score = EXCLUDED.home_score,
-                            away_score = EXCLUDED.away_score,
-                            score_detail = EXCLUDED.score_detail;
-                    """
-                    cur.execute(sql_game, (
-                        game_id, season_db_id, league_id, 
-                        home_id, away_id, game_date, 
-                        status, home_score, away_score, 
-                        json.dumps(score_detail)
-                    ))
-                    total_games_processed += 1
-
-                except Exception as inner_e:
-                    # 특정 게임 데이터가 이상하면 로그만 찍고 넘어감 (스크립트 중단 방지)
-                    # print(f"    ⚠️ Game Skipped (ID: {event.get('id')}): {inner_e}")
-                    continue
-            
-            conn.commit() # 한 팀 처리할 때마다 커밋
-            # print(f"    - {team_name}: 스케줄 처리 완료")
-
-        print(f"✅ [{league_slug}] 총 {total_games_processed}건의 경기 정보 처리 완료.")
+
+        # 3. 변경된 경기만 골라 저장
+        stored = {} if full else load_stored_games(cur, league_id)
+        to_write = [g for g in games if needs_write(g, stored, high_water)]
+
+        batch = db_batch.UpsertBatch(cur, SQL_GAMES, "sl_games", template=GAMES_TEMPLATE, key=lambda r: r[0], lock=lambda r: r[0])
+        for g in to_write:
+            batch.add((
+                g["id"], season_db_id, league_id,
+                g["home_id"], g["away_id"], g["game_date"],
+                g["status"], g["home_score"], g["away_score"],
+                json.dumps(g["score_detail"])
+            ))
+        batch.flush()
+        conn.commit()
+
+        if games:
+            state[league_slug] = next_high_water(games)
+
+        print(f"✅ [{league_slug}] 이벤트 {fetched_events}건 → 중복 제거 {len(games)}경기, "
+              f"저장 {batch.rows_changed}건 / 변경 없음 {len(games) - len(to_write) + batch.rows_unchanged}건.")
 
     except Exception as e:
         conn.rollback()
@@ -207,8 +336,24 @@ def sync_season_schedule(sport, league_slug):
         cur.close()
         conn.close()
 
+def sync_league(sport, league_slug, full=False, state=None):
+    """리그 하나 (espn_shards 워커에서 실행). 워커의 state는 복사본이므로 갱신된 high-water mark를 돌려줌"""
+    state = dict(state or {})
+    sync_season_schedule(sport, league_slug, full=full, state=state)
+    return state.get(league_slug)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ESPN 경기 일정 동기화")
+    parser.add_argument("--full", action="store_true", help="증분 판단 없이 모든 경기를 다시 저장 (전체 재구축)")
+    parser.add_argument("--workers", type=int, default=espn_shards.DEFAULT_WORKERS, help="리그를 나눠 실행할 프로세스 수")
+    args = parser.parse_args()
+
     print("🏟️ 경기 일정 전체 동기화 시작 (방어 로직 적용됨)...\n")
     
-    for sport, league in TARGET_LEAGUES:
-        sync_season_schedule(sport, league)
\ No newline at end of file
+    state = load_state()
+    results = espn_shards.run("espn_games", sync_league, TARGET_LEAGUES, workers=args.workers, full=args.full, state=state)
+    for r in results:
+        if r["result"]:
+            state[r["league"]] = r["result"]
+    save_state(state)
+    espn_client.print_stats()
@@ -0,0 +1,51 @@
+import io
+
+import ijson
+import orjson
+
+# --- ESPN 응답 JSON 파싱 ---
+# res.json()은 응답 전체를 text로 디코딩한 뒤 Python 객체 트리를 통째로 만듭니다.
+# gamelog, teams?limit=1000 같은 큰 응답에서 실제로 쓰는 건 events / athletes / teams 하위 트리뿐이라
+# 여기서는 필요한 경로의 항목만 꺼냅니다.
+#   - items(): ijson 스트리밍 파싱. espn_client.get(..., stream=True) 응답이면 소켓(res.raw)에서 읽으면서 파싱하므로
+#     본문 전체를 메모리에 올리지 않고, 경로 밖의 데이터는 객체로 만들지 않습니다.
+#     (캐시/벤치마크 응답처럼 이미 본문이 있는 응답은 그 bytes를 파싱)
+#   - parse(): 응답 전체가 필요한 경우 orjson으로 bytes에서 바로 파싱
+# dumps()는 JSONB 컬럼에 넣을 문자열을 만듭니다. orjson이 C 구현으로 UTF-8 bytes를 바로 만들고
+# (json.dumps의 \uXXXX 이스케이프 없이) psycopg2가 jsonb로 받을 수 있게 str로만 감쌉니다.
+
+
+def loads(data):
+    """bytes/str → Python 객체"""
+    return orjson.loads(data)
+
+
+def dumps(obj):
+    """Python 객체 → JSONB에 넣을 JSON 문자열"""
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def parse(res):
+    """res.json() 대체 (text 디코딩 단계 없이 bytes에서 바로 파싱)"""
+    return loads(res.content)
+
+
+def is_streaming(res):
+    """stream=True로 받아 본문을 아직 읽지 않은 응답인지"""
+    return res.raw is not None and not res._content_consumed
+
+
+def items(res, path):
+    """
+    응답에서 path 위치의 항목들을 하나씩 돌려줍니다. (ijson prefix 문법, 배열 원소는 'item')
+    예: items(res, "seasonTypes.item.categories.item.events.item")
+    스트리밍 응답은 끝까지 읽거나 중간에 멈추면 커넥션을 풀에 돌려줍니다.
+    """
+    if not is_streaming(res):
+        yield from ijson.items(io.BytesIO(res.content), path, use_float=True)
+        return
+    res.raw.decode_content = True  # gzip 등 Content-Encoding 해제
+    try:
+        yield from ijson.items(res.raw, path, use_float=True)
+    finally:
+        res.close()
@@ -1,9 +1,12 @@
 import os
 from pathlib import Path
-import requests
+import argparse
+import espn_client
+import espn_fanout
+import espn_json
+import espn_shards
+import db_batch
 import psycopg2
-import json
-import time
 
 # --- 환경 변수 로드 ---
 def load_env(path: Path) -> None:
@@ -43,28 +46,133 @@ TARGET_LEAGUES = [
 def get_db_connection():
     return psycopg2.connect(**DB_CONFIG)
 
-def ensure_game_exists(cur, game_id, game_date, league_id, season_id):
+# [FK 방지] 게임이 없으면 임시로 생성 (다건 INSERT)
+# sl_games는 game_date 파티션이라 (id, game_date) 충돌만 감지하므로, 날짜가 달라도 같은 id가 있으면 건너뜀
+SQL_STUB_GAMES = """
+    INSERT INTO sl_games (id, game_date, league_id, season_id, status)
+    SELECT v.id, v.game_date, v.league_id, v.season_id, v.status
+    FROM (VALUES %s) AS v (id, game_date, league_id, season_id, status)
+    WHERE NOT EXISTS (SELECT 1 FROM sl_games g WHERE g.id = v.id)
+    ON CONFLICT DO NOTHING;
+"""
+
+# game_date는 저장된 경기에서 가져옴 (FK (game_id, game_date) → sl_games, 경기와 같은 파티션에 저장)
+SQL_GAME_STATS = """
+    INSERT INTO sl_player_game_stats
+    (game_id, game_date, player_id, team_id, minutes_played, rating, stats)
+    SELECT v.game_id, g.game_date, v.player_id, v.team_id, v.minutes_played, v.rating, v.stats
+    FROM (VALUES %s) AS v (game_id, player_id, team_id, minutes_played, rating, stats), sl_games g
+    WHERE g.id = v.game_id
+    ON CONFLICT (game_id, player_id, game_date) DO UPDATE
+    SET stats = EXCLUDED.stats,
+        team_id = EXCLUDED.team_id
+    WHERE (sl_player_game_stats.stats, sl_player_game_stats.team_id)
+          IS DISTINCT FROM (EXCLUDED.stats, EXCLUDED.team_id)
+    RETURNING 1;
+"""
+
+class GameStatsWriter:
     """
-    FK 제약조건 해결을 위해 게임이 없으면 임시로 생성합니다.
+    gamelog 행을 모아 스텁 게임(sl_games) → 스탯(sl_player_game_stats) 순서로 한 번에 저장합니다.
+    같은 경기는 여러 선수에게 반복되므로 스텁 게임은 실행 중 한 번만 INSERT 합니다.
     """
-    if not game_id: return
 
-    # 날짜가 None이면 에러나므로 방어 로직 추가
-    if not game_date:
-        # 임시 날짜 생성 (시즌 ID가 있으면 좋겠지만 일단 고정값이라도 넣음)
-        game_date = "1970-01-01T00:00:00Z" 
+    def __init__(self, cur, league_db_id, season_db_id, batch_size=db_batch.DEFAULT_BATCH_SIZE):
+        self.league_db_id = league_db_id
+        self.season_db_id = season_db_id
+        self.seen_games = set()
+        self.games = db_batch.UpsertBatch(
+            cur, SQL_STUB_GAMES, "sl_games(stub)",
+            template="(%s::bigint, %s::timestamptz, %s::bigint, %s::int, 'STATUS_FINAL')", key=lambda r: r[0], batch_size=batch_size,
+            lock=lambda r: r[0],
+        )
+        self.stats = db_batch.UpsertBatch(
+            cur, SQL_GAME_STATS, "sl_player_game_stats",
+            template="(%s::bigint, %s::bigint, %s::bigint, %s::int, %s::numeric, %s::jsonb)",
+            key=lambda r: (r[0], r[1]), batch_size=batch_size, before=[self.games],
+        )
+
+    def add(self, rows, player_id, team_id):
+        """선수 한 명의 gamelog 행들을 배치에 추가하고 추가 건수를 반환합니다."""
+        for game_id, game_date, event in rows:
+            if game_id not in self.seen_games:
+                # 날짜가 None이면 에러나므로 방어 로직 추가
+                self.games.add((game_id, game_date or "1970-01-01T00:00:00Z", self.league_db_id, self.season_db_id))
+                self.seen_games.add(game_id)
+
+            # minutes_played / rating 은 아직 수집하지 않음
+            self.stats.add((game_id, player_id, team_id, None, None, espn_json.dumps(event)))
+        return len(rows)
+
+    def flush(self):
+        self.stats.flush()
+
+    def discard(self):
+        # 롤백으로 이미 flush 된 스텁 게임도 사라졌을 수 있으므로 다음부터 다시 INSERT (DO NOTHING이라 안전)
+        self.seen_games.clear()
+        self.stats.discard()
+
+    def report(self):
+        self.games.report()
+        self.stats.report()
+
+# gamelog 응답에서 writer가 쓰는 부분 (seasonTypes[].categories[].events[])
+GAMELOG_EVENTS = "seasonTypes.item.categories.item.events.item"
 
-    sql = """
-        INSERT INTO sl_games (id, game_date, league_id, season_id, status)
-        VALUES (%s, %s, %s, %s, 'STATUS_FINAL')
-        ON CONFLICT (id) DO NOTHING;
+def parse_gamelog_events(events, season_year):
     """
-    try:
-        cur.execute(sql, (game_id, game_date, league_id, season_id))
-    except Exception:
-        pass 
+    Gamelog 이벤트들(espn_json.items(res, GAMELOG_EVENTS))에서 (game_id, game_date, event) 목록을 뽑아냅니다.
+    """
+    rows = []
+    for event in events:
+        game_id_str = event.get('eventId')
+        if not game_id_str: continue
+        game_id = int(game_id_str)
+
+        # [핵심 수정] 날짜 파싱 로직 강화
+        # gameDate가 없으면 date를 찾고, 그것도 없으면 임시 날짜 사용
+        game_date = event.get('gameDate')
+        if not game_date:
+            game_date = event.get('date')
+        if not game_date:
+            # 날짜가 아예 없으면 시즌 시작일로 임시 설정 (DB 에러 방지용)
+            game_date = f"{season_year}-01-01T00:00:00Z"
+
+        rows.append((game_id, game_date, event))
+    return rows
+
+def gamelog_url(sport, league, player_id):
+    return f"https://site.web.api.espn.com/apis/common/v3/sports/{sport}/{league}/athletes/{player_id}/gamelog"
+
+def load_target(cur, league):
+    """DB에서 (league_db_id, season_db_id, season_year)를 조회합니다. 없으면 None."""
+    cur.execute("SELECT id FROM sl_leagues WHERE slug = %s", (league,))
+    row = cur.fetchone()
+    if not row:
+        print(f"⚠️ [{league}] 리그 정보 없음. (save_leagues.py 실행 필요)")
+        return None
+    league_db_id = row[0]
 
-def sync_player_game_stats(sport, league):
+    cur.execute("""
+        SELECT id, year FROM sl_seasons 
+        WHERE league_id = %s ORDER BY is_current DESC, year DESC LIMIT 1
+    """, (league_db_id,))
+    row = cur.fetchone()
+    
+    if not row:
+         print(f"⚠️ [{league}] 시즌 정보 없음.")
+         return None
+    
+    season_db_id, season_year = row
+    print(f"  ℹ️ Target Season: {season_year}")
+    return league_db_id, season_db_id, season_year
+
+def fetch_teams(sport, league):
+    teams_url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams"
+    res = espn_client.get(teams_url, params={'limit': 1000})
+    return teams_url, list(espn_json.items(res, "sports.item.leagues.item.teams.item"))
+
+def sync_player_game_stats(sport, league, batch_size=db_batch.DEFAULT_BATCH_SIZE):
     print(f"🚀 [{league}] 선수 경기별 스탯 동기화 시작 (v3 API + Date Fix)...")
     
     conn = get_db_connection()
@@ -72,43 +180,22 @@ def sync_player_game_stats(sport, league):
 
     # 1. DB에서 리그 및 시즌 ID 확보
     try:
-        cur.execute("SELECT id FROM sl_leagues WHERE slug = %s", (league,))
-        row = cur.fetchone()
-        if not row:
-            print(f"⚠️ [{league}] 리그 정보 없음. (save_leagues.py 실행 필요)")
-            return
-        league_db_id = row[0]
-
-        cur.execute("""
-            SELECT id, year FROM sl_seasons 
-            WHERE league_id = %s ORDER BY is_current DESC, year DESC LIMIT 1
-        """, (league_db_id,))
-        row = cur.fetchone()
-        
-        if not row:
-             print(f"⚠️ [{league}] 시즌 정보 없음.")
-             return
-        
-        season_db_id, season_year = row
-        print(f"  ℹ️ Target Season: {season_year}")
-
+        target = load_target(cur, league)
+        if not target: return
+        league_db_id, season_db_id, season_year = target
     except Exception as e:
         print(f"❌ 초기 설정 실패: {e}")
         return
 
     # 2. 팀 목록 API 호출
-    teams_url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams"
     try:
-        res = requests.get(teams_url, params={'limit': 1000})
-        teams = res.json().get('sports', [])[0].get('leagues', [])[0].get('teams', [])
+        teams_url, teams = fetch_teams(sport, league)
     except Exception:
-        print(f"❌ API 호출 실패 ({teams_url})")
+        print(f"❌ API 호출 실패 ({sport}/{league} teams)")
         return
 
     total_stats_saved = 0
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    writer = GameStatsWriter(cur, league_db_id, season_db_id, batch_size=batch_size)
 
     for t in teams:
         team_id = int(t['team']['id'])
@@ -118,82 +205,124 @@ def sync_player_game_stats(sport, league):
         # 3. 로스터 조회
         roster_url = f"{teams_url}/{team_id}"
         try:
-            r_res = requests.get(roster_url, params={'enable': 'roster'})
-            athletes = r_res.json().get('team', {}).get('athletes', [])
+            r_res = espn_client.get(roster_url, params={'enable': 'roster'})
+            athletes = list(espn_json.items(r_res, "team.athletes.item"))
         except:
             continue
 
-        for p in athletes:
-            player_id = int(p['id'])
-            
-            # 4. Gamelog API v3 호출
-            gamelog_url = f"https://site.web.api.espn.com/apis/common/v3/sports/{sport}/{league}/athletes/{player_id}/gamelog"
-            params = {'season': season_year}
-
-            try:
-                g_res = requests.get(gamelog_url, params=params, headers=headers)
-                if g_res.status_code != 200: continue
-                
-                g_data = g_res.json()
-                season_types = g_data.get('seasonTypes', [])
+        # 5. 팀 단위로 한 번에 저장
+        # (배치가 가득 차면 writer.add 안에서도 flush 되므로 저장 에러는 선수가 아니라 팀 단위로 롤백)
+        team_rows = 0
+        try:
+            for p in athletes:
+                player_id = int(p['id'])
                 
-                for s_type in season_types:
-                    categories = s_type.get('categories', [])
-                    for cat in categories:
-                        events = cat.get('events', [])
-                        
-                        for event in events:
-                            game_id_str = event.get('eventId')
-                            if not game_id_str: continue
-                            game_id = int(game_id_str)
-                            
-                            # [핵심 수정] 날짜 파싱 로직 강화
-                            # gameDate가 없으면 date를 찾고, 그것도 없으면 임시 날짜 사용
-                            game_date = event.get('gameDate')
-                            if not game_date:
-                                game_date = event.get('date')
-                            if not game_date:
-                                # 날짜가 아예 없으면 시즌 시작일로 임시 설정 (DB 에러 방지용)
-                                game_date = f"{season_year}-01-01T00:00:00Z"
-                            
-                            # 스탯 데이터 준비
-                            stats_json = json.dumps(event)
-                            minutes_played = None
-                            rating = None
-
-                            # [FK 방지] 게임 임시 생성
-                            ensure_game_exists(cur, game_id, game_date, league_db_id, season_db_id)
-
-                            # [INSERT]
-                            sql = """
-                                INSERT INTO sl_player_game_stats 
-                                (game_id, player_id, team_id, minutes_played, rating, stats)
-                                VALUES (%s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (game_id, player_id) DO UPDATE 
-                                SET stats = EXCLUDED.stats,
-                                    team_id = EXCLUDED.team_id; 
-                            """
-                            cur.execute(sql, (
-                                game_id, 
-                                player_id, 
-                                team_id, 
-                                minutes_played, 
-                                rating, 
-                                stats_json
-                            ))
-                            total_stats_saved += 1
-            
-            except Exception:
-                conn.rollback()
-                continue
-            
+                # 4. Gamelog API v3 호출 (요청/파싱 실패는 그 선수만 건너뜀)
+                try:
+                    g_res = espn_client.get(gamelog_url(sport, league, player_id), params={'season': season_year}, stream=True)
+                    if g_res.status_code != 200: continue
+                    
+                    rows = parse_gamelog_events(espn_json.items(g_res, GAMELOG_EVENTS), season_year)
+                except Exception:
+                    continue
+
+                team_rows += writer.add(rows, player_id, team_id)
+
+            writer.flush()
             conn.commit()
-            time.sleep(0.05) 
+            total_stats_saved += team_rows
+        except Exception as e:
+            conn.rollback()
+            writer.discard()
+            print(f"    ⚠️ {team_name} 저장 실패: {e}")
 
+    writer.report()
     cur.close()
     conn.close()
     print(f"✅ [{league}] 총 {total_stats_saved}건의 경기 스탯 저장 완료.")
 
+def sync_player_game_stats_async(sport, league, concurrency=espn_fanout.DEFAULT_CONCURRENCY, rate=None, batch_size=db_batch.DEFAULT_BATCH_SIZE):
+    """
+    Fan-out 모드: 모든 선수의 gamelog를 동시에 요청하고, writer 하나가 DB에 저장합니다.
+    """
+    print(f"🚀 [{league}] 선수 경기별 스탯 동기화 시작 (fan-out, 동시 {concurrency})...")
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        target = load_target(cur, league)
+        if not target: return
+        league_db_id, season_db_id, season_year = target
+
+        try:
+            teams_url, teams = fetch_teams(sport, league)
+        except Exception:
+            print(f"❌ API 호출 실패 ({sport}/{league} teams)")
+            return
+
+        # 로스터는 팀 수만큼만 요청하므로 먼저 모아 작업 목록을 만듭니다.
+        jobs = []
+        for t in teams:
+            team_id = int(t['team']['id'])
+            try:
+                r_res = espn_client.get(f"{teams_url}/{team_id}", params={'enable': 'roster'})
+                athletes = list(espn_json.items(r_res, "team.athletes.item"))
+            except Exception:
+                continue
+            jobs.extend((int(p['id']), team_id) for p in athletes)
+        print(f"  👥 대상 선수: {len(jobs)}명")
+
+        def fetch(job):
+            player_id, team_id = job
+            g_res = espn_client.get(gamelog_url(sport, league, player_id), params={'season': season_year}, stream=True)
+            if g_res.status_code != 200: return None
+            rows = parse_gamelog_events(espn_json.items(g_res, GAMELOG_EVENTS), season_year)
+            return (player_id, team_id, rows) if rows else None
+
+        writer = GameStatsWriter(cur, league_db_id, season_db_id, batch_size=batch_size)
+
+        def write(item):
+            player_id, team_id, rows = item
+            try:
+                saved = writer.add(rows, player_id, team_id)
+                conn.commit()  # 배치가 가득 차 flush 된 경우에만 실제 커밋이 발생
+                return saved
+            except Exception:
+                conn.rollback()
+                writer.discard()
+                raise
+
+        summary = espn_fanout.run(jobs, fetch, write, concurrency=concurrency, rate=rate)
+        try:
+            writer.flush()
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"    ⚠️ 마지막 배치 저장 실패: {e}")
+        writer.report()
+        print(f"✅ [{league}] 총 {summary['saved']}건의 경기 스탯 저장 완료. "
+              f"({summary['elapsed']:.1f}s, 요청 실패 {summary['fetch_errors']}, 저장 실패 {summary['write_errors']})")
+    finally:
+        cur.close()
+        conn.close()
+
+def sync_league(sport, league, fanout=False, concurrency=espn_fanout.DEFAULT_CONCURRENCY, rate=None, batch_size=db_batch.DEFAULT_BATCH_SIZE):
+    """리그 하나 (espn_shards 워커에서 실행)"""
+    if fanout:
+        sync_player_game_stats_async(sport, league, concurrency=concurrency, rate=rate, batch_size=batch_size)
+    else:
+        sync_player_game_stats(sport, league, batch_size=batch_size)
+
 if __name__ == "__main__":
-    for sport, league in TARGET_LEAGUES:
-        sync_player_game_stats(sport, league)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ESPN 선수 경기별 스탯 동기화")
+    parser.add_argument("--fanout", action="store_true", help="gamelog 요청을 동시에 보내는 fan-out 모드")
+    parser.add_argument("--concurrency", type=int, default=espn_fanout.DEFAULT_CONCURRENCY, help="동시 요청 수 (fan-out 모드)")
+    parser.add_argument("--rate", type=float, default=None, help="호스트별 초당 요청 수 제한 (fan-out 모드)")
+    parser.add_argument("--batch-size", type=int, default=db_batch.DEFAULT_BATCH_SIZE, help="다건 INSERT 1회당 행 수")
+    parser.add_argument("--workers", type=int, default=espn_shards.DEFAULT_WORKERS, help="리그를 나눠 실행할 프로세스 수")
+    args = parser.parse_args()
+
+    espn_shards.run("espn_player_game_stats", sync_league, TARGET_LEAGUES, workers=args.workers,
+                    fanout=args.fanout, concurrency=args.concurrency, rate=args.rate, batch_size=args.batch_size)
+    espn_client.print_stats()
@@ -1,9 +1,15 @@
 import os
 from pathlib import Path
-import requests
+import argparse
+import espn_client
+import espn_fanout
+import espn_json
+import espn_shards
+import db_batch
+import hot_stats
+import sync_journal
+from id_resolver import IdResolver
 import psycopg2
-import json
-import time
 
 # --- 환경 변수 로드 ---
 def load_env(path: Path) -> None:
@@ -45,30 +51,80 @@ TARGET_YEARS = [2025, 2024, 2023, 2022, 2021, 2020]
 def get_db_connection():
     return psycopg2.connect(**DB_CONFIG)
 
-def ensure_season_exists(cur, league_id, year):
-    if not year: return None
-    
-    cur.execute("SELECT id FROM sl_seasons WHERE league_id = %s AND year = %s", (league_id, year))
-    row = cur.fetchone()
-    if row: return row[0]
-    
+def ensure_season_exists(resolver, league_id, year):
+    # 시즌 ID는 실행 시작 시 읽어 둔 캐시에서 찾고, 없을 때만 INSERT
     try:
-        cur.execute("""
-            INSERT INTO sl_seasons (league_id, year, is_current)
-            VALUES (%s, %s, false)
-            ON CONFLICT (league_id, year) DO NOTHING
-            RETURNING id;
-        """, (league_id, year))
-        new_row = cur.fetchone()
-        if new_row: return new_row[0]
-        
-        cur.execute("SELECT id FROM sl_seasons WHERE league_id = %s AND year = %s", (league_id, year))
-        row = cur.fetchone()
-        return row[0] if row else None
+        return resolver.season_id(league_id, year)
     except Exception:
         return None
 
-def sync_player_season_stats(sport, league):
+def parse_splits(data):
+    """
+    Splits 응답에서 시즌 전체('Total') 스탯을 저장용 dict로 변환합니다. 데이터가 없으면 None.
+    """
+    # [수정됨] 1. Labels는 최상위에 위치
+    labels = data.get('names', []) or data.get('labels', [])
+    
+    # [수정됨] 2. splitCategories 안에서 'split' 카테고리 찾기
+    split_categories = data.get('splitCategories', [])
+    general_split_category = next((cat for cat in split_categories if cat.get('name') == 'split'), None)
+    
+    if not general_split_category: 
+        # 카테고리가 없으면 데이터가 없는 것
+        return None
+
+    splits_list = general_split_category.get('splits', [])
+    
+    # [수정됨] 3. 'Total' (All Splits) 항목만 찾기
+    # DB Unique Constraint (Player, Season, Team) 때문에 하나만 저장해야 함.
+    # 'All Splits'가 시즌 전체 합계/평균입니다.
+    total_split = next((s for s in splits_list if s.get('abbreviation') == 'Total'), None)
+    
+    if not total_split: return None
+    
+    # 데이터 확보 완료
+    stats_values = total_split.get('stats', [])
+    if not stats_values: return None
+    
+    return {
+        "labels": labels,
+        "values": stats_values,
+        "type": "Regular Season", # Total은 보통 정규시즌 성적
+        "raw": total_split
+    }
+
+SQL_SEASON_STATS = """
+    INSERT INTO sl_player_season_stats 
+    (player_id, season_id, team_id, stats)
+    VALUES %s
+    ON CONFLICT (player_id, season_id, team_id) 
+    DO UPDATE SET 
+        stats = EXCLUDED.stats,
+        updated_at = NOW()
+    WHERE sl_player_season_stats.stats IS DISTINCT FROM EXCLUDED.stats
+    RETURNING 1;
+"""
+
+def make_season_stats_batch(cur, batch_size=db_batch.DEFAULT_BATCH_SIZE):
+    """(player_id, season_id, team_id, stats_json) 행을 모아 한 번에 upsert 하는 배치"""
+    return db_batch.UpsertBatch(cur, SQL_SEASON_STATS, "sl_player_season_stats", key=lambda r: r[:3], batch_size=batch_size)
+
+def splits_url(sport, league, player_id):
+    return f"https://site.web.api.espn.com/apis/common/v3/sports/{sport}/{league}/athletes/{player_id}/splits"
+
+def get_league_db_id(resolver, league):
+    league_db_id = resolver.league_id(league)
+    if not league_db_id:
+        print(f"⚠️ [{league}] 리그 정보 없음.")
+    return league_db_id
+
+def fetch_teams(sport, league):
+    teams_url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams"
+    print(f"📡 [API CALL] Teams: {teams_url}")
+    res = espn_client.get(teams_url, params={'limit': 1000})
+    return teams_url, list(espn_json.items(res, "sports.item.leagues.item.teams.item"))
+
+def sync_player_season_stats(sport, league, batch_size=db_batch.DEFAULT_BATCH_SIZE, journal=None):
     print(f"🚀 [{league}] 선수 시즌 스탯 동기화 시작 (구조 수정됨)...")
     
     conn = get_db_connection()
@@ -76,31 +132,23 @@ def sync_player_season_stats(sport, league):
 
     # 1. 리그 ID 조회
     try:
-        cur.execute("SELECT id FROM sl_leagues WHERE slug = %s", (league,))
-        row = cur.fetchone()
-        if not row:
-            print(f"⚠️ [{league}] 리그 정보 없음.")
-            return
-        league_db_id = row[0]
+        resolver = IdResolver(cur)
+        league_db_id = get_league_db_id(resolver, league)
+        if not league_db_id: return
     except Exception as e:
         print(f"❌ DB 에러: {e}")
         return
 
     # 2. 팀 목록 가져오기
-    teams_url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/teams"
-    print(f"📡 [API CALL] Teams: {teams_url}")
-    
     try:
-        res = requests.get(teams_url, params={'limit': 1000})
-        teams = res.json().get('sports', [])[0].get('leagues', [])[0].get('teams', [])
+        teams_url, teams = fetch_teams(sport, league)
     except Exception:
-        print(f"❌ API 호출 실패 ({teams_url})")
+        print(f"❌ API 호출 실패 ({sport}/{league} teams)")
         return
 
     total_updated = 0
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    batch = make_season_stats_batch(cur, batch_size)
+    hot = hot_stats.make_batch(cur, batch_size)
 
     for t in teams:
         team_id = int(t['team']['id'])
@@ -110,99 +158,184 @@ def sync_player_season_stats(sport, league):
         roster_url = f"{teams_url}/{team_id}"
         
         try:
-            r_res = requests.get(roster_url, params={'enable': 'roster'})
-            athletes = r_res.json().get('team', {}).get('athletes', [])
+            r_res = espn_client.get(roster_url, params={'enable': 'roster'})
+            athletes = list(espn_json.items(r_res, "team.athletes.item"))
         except:
             continue
 
         player_count_in_team = 0
-        for p in athletes:
-            player_id = int(p['id'])
-            player_name = p.get('fullName', 'Unknown')
-            
-            splits_base_url = f"https://site.web.api.espn.com/apis/common/v3/sports/{sport}/{league}/athletes/{player_id}/splits"
-            
-            saved_seasons_count = 0
-            
-            for year in TARGET_YEARS:
-                full_url = f"{splits_base_url}?season={year}"
-                # print(f"    📡 [GET] {full_url}")
-
-                try:
-                    s_res = requests.get(splits_base_url, params={'season': year}, headers=headers)
-                    if s_res.status_code != 200: continue
-                    
-                    data = s_res.json()
-                    
-                    # [수정됨] 1. Labels는 최상위에 위치
-                    labels = data.get('names', []) or data.get('labels', [])
-                    
-                    # [수정됨] 2. splitCategories 안에서 'split' 카테고리 찾기
-                    split_categories = data.get('splitCategories', [])
-                    general_split_category = next((cat for cat in split_categories if cat.get('name') == 'split'), None)
-                    
-                    if not general_split_category: 
-                        # 카테고리가 없으면 데이터가 없는 것
+        team_updated = 0
+        # 팀 단위로 한 번에 저장
+        # (배치가 가득 차면 batch.add 안에서도 flush 되므로 저장 에러는 선수가 아니라 팀 단위로 롤백)
+        try:
+            for p in athletes:
+                player_id = int(p['id'])
+                player_name = p.get('fullName', 'Unknown')
+                
+                splits_base_url = splits_url(sport, league, player_id)
+                
+                saved_seasons_count = 0
+                
+                for year in TARGET_YEARS:
+                    # 최근 실행에서 이미 끝난 (리그, 팀, 선수, 시즌)은 건너뜀
+                    if journal and journal.is_fresh(league, team_id, player_id, year): continue
+                    full_url = f"{splits_base_url}?season={year}"
+
+                    # 요청/파싱 실패는 그 선수의 그 시즌만 건너뜀
+                    try:
+                        s_res = espn_client.get(splits_base_url, params={'season': year})
+                        if s_res.status_code != 200: continue
+                        
+                        save_data = parse_splits(espn_json.parse(s_res))
+                    except Exception as e:
+                        print(f"      ❌ {player_name} ({year}) 실패: {e}")
                         continue
 
-                    splits_list = general_split_category.get('splits', [])
-                    
-                    # [수정됨] 3. 'Total' (All Splits) 항목만 찾기
-                    # DB Unique Constraint (Player, Season, Team) 때문에 하나만 저장해야 함.
-                    # 'All Splits'가 시즌 전체 합계/평균입니다.
-                    total_split = next((s for s in splits_list if s.get('abbreviation') == 'Total'), None)
-                    
-                    if not total_split: continue
-                    
-                    # 데이터 확보 완료
-                    stats_values = total_split.get('stats', [])
-                    if not stats_values: continue
+                    if journal: journal.pending(league, team_id, player_id, year)
+                    if not save_data: continue
                     
                     # 시즌 ID 확보
-                    season_db_id = ensure_season_exists(cur, league_db_id, year)
+                    season_db_id = ensure_season_exists(resolver, league_db_id, year)
                     if not season_db_id: continue
                     
-                    save_data = {
-                        "labels": labels,
-                        "values": stats_values,
-                        "type": "Regular Season", # Total은 보통 정규시즌 성적
-                        "raw": total_split
-                    }
-                    
-                    stat_team_id = team_id 
-
-                    sql = """
-                        INSERT INTO sl_player_season_stats 
-                        (player_id, season_id, team_id, stats)
-                        VALUES (%s, %s, %s, %s)
-                        ON CONFLICT (player_id, season_id, team_id) 
-                        DO UPDATE SET 
-                            stats = EXCLUDED.stats,
-                            updated_at = NOW();
-                    """
-                    cur.execute(sql, (player_id, season_db_id, stat_team_id, json.dumps(save_data)))
-                    total_updated += 1
+                    batch.add((player_id, season_db_id, team_id, espn_json.dumps(save_data)))
+                    hot_stats.add(hot, sport, player_id, season_db_id, team_id, save_data)
+                    team_updated += 1
                     saved_seasons_count += 1
                     print(f"      ✅ OK ({year}): {full_url}")
 
-                except Exception as e:
-                    # print(f"      ❌ Err ({year}): {e}")
-                    continue
+                if saved_seasons_count > 0:
+                    player_count_in_team += 1
 
-            if saved_seasons_count > 0:
-                # print(f"    ✨ {player_name}: {saved_seasons_count}개 시즌 저장됨")
-                player_count_in_team += 1
-            
+            batch.flush()
+            hot.flush()
             conn.commit()
-            time.sleep(0.05) 
+            if journal: journal.commit_pending()
+            total_updated += team_updated
+        except Exception as e:
+            conn.rollback()
+            batch.discard()
+            hot.discard()
+            if journal: journal.discard_pending()
+            resolver.reload()
+            print(f"    ⚠️ {team_name} 저장 실패: {e}")
         
         if player_count_in_team == 0:
              print(f"    ⚠️ {team_name}: 저장된 데이터 없음")
 
+    batch.report()
+    hot.report()
     cur.close()
     conn.close()
     print(f"✅ [{league}] 총 {total_updated}건의 시즌 스탯 저장 완료.")
 
+def sync_player_season_stats_async(sport, league, concurrency=espn_fanout.DEFAULT_CONCURRENCY, rate=None, batch_size=db_batch.DEFAULT_BATCH_SIZE, journal=None):
+    """
+    Fan-out 모드: (선수 × TARGET_YEARS) splits 요청을 동시에 보내고, writer 하나가 DB에 저장합니다.
+    """
+    print(f"🚀 [{league}] 선수 시즌 스탯 동기화 시작 (fan-out, 동시 {concurrency})...")
+
+    conn = get_db_connection()
+    cur = conn.cursor()
+
+    try:
+        resolver = IdResolver(cur)
+        league_db_id = get_league_db_id(resolver, league)
+        if not league_db_id: return
+
+        try:
+            teams_url, teams = fetch_teams(sport, league)
+        except Exception:
+            print(f"❌ API 호출 실패 ({sport}/{league} teams)")
+            return
+
+        jobs = []
+        for t in teams:
+            team_id = int(t['team']['id'])
+            try:
+                r_res = espn_client.get(f"{teams_url}/{team_id}", params={'enable': 'roster'})
+                athletes = list(espn_json.items(r_res, "team.athletes.item"))
+            except Exception:
+                continue
+            jobs.extend((int(p['id']), team_id, year) for p in athletes for year in TARGET_YEARS)
+        if journal:
+            jobs = [j for j in jobs if not journal.is_fresh(league, j[1], j[0], j[2])]
+        print(f"  📋 대상 요청: {len(jobs)}건 (선수 × {len(TARGET_YEARS)}시즌)")
+
+        def fetch(job):
+            player_id, team_id, year = job
+            s_res = espn_client.get(splits_url(sport, league, player_id), params={'season': year})
+            if s_res.status_code != 200: return None
+            save_data = parse_splits(espn_json.parse(s_res))
+            if journal and not save_data:
+                # 저장할 기록이 없는 단위도 다음 커밋과 함께 완료로 기록
+                journal.pending(league, team_id, player_id, year)
+            return (player_id, team_id, year, save_data) if save_data else None
+
+        batch = make_season_stats_batch(cur, batch_size)
+        hot = hot_stats.make_batch(cur, batch_size)
+
+        def write(item):
+            player_id, team_id, year, save_data = item
+            try:
+                season_db_id = ensure_season_exists(resolver, league_db_id, year)
+                if not season_db_id: return 0
+                batch.add((player_id, season_db_id, team_id, espn_json.dumps(save_data)))
+                hot_stats.add(hot, sport, player_id, season_db_id, team_id, save_data)
+                if not len(batch): hot.flush()  # 시즌 기록이 flush 됐으면 주요 스탯도 같은 커밋에 포함
+                conn.commit()  # 배치가 가득 차 flush 된 경우 함께 커밋
+                if journal:
+                    journal.pending(league, team_id, player_id, year)
+                    # 배치가 비었다면 방금 flush + 커밋된 것
+                    if not len(batch): journal.commit_pending()
+                return 1
+            except Exception:
+                conn.rollback()
+                batch.discard()
+                hot.discard()
+                if journal: journal.discard_pending()
+                resolver.reload()
+                raise
+
+        summary = espn_fanout.run(jobs, fetch, write, concurrency=concurrency, rate=rate)
+        try:
+            batch.flush()
+            hot.flush()
+            conn.commit()
+            if journal: journal.commit_pending()
+        except Exception as e:
+            conn.rollback()
+            if journal: journal.discard_pending()
+            print(f"    ⚠️ 마지막 배치 저장 실패: {e}")
+        batch.report()
+        hot.report()
+        print(f"✅ [{league}] 총 {summary['saved']}건의 시즌 스탯 저장 완료. "
+              f"({summary['elapsed']:.1f}s, 요청 실패 {summary['fetch_errors']}, 저장 실패 {summary['write_errors']})")
+    finally:
+        cur.close()
+        conn.close()
+
+def sync_league(sport, league, fanout=False, concurrency=espn_fanout.DEFAULT_CONCURRENCY, rate=None, batch_size=db_batch.DEFAULT_BATCH_SIZE,
+                fresh_hours=sync_journal.FRESH_HOURS, restart=False):
+    """리그 하나 (espn_shards 워커에서 실행, 진행 기록은 리그마다 따로 엶)"""
+    with sync_journal.SyncJournal("espn_player_season_stats", fresh_hours=fresh_hours, restart=restart) as journal:
+        if fanout:
+            sync_player_season_stats_async(sport, league, concurrency=concurrency, rate=rate, batch_size=batch_size, journal=journal)
+        else:
+            sync_player_season_stats(sport, league, batch_size=batch_size, journal=journal)
+
 if __name__ == "__main__":
-    for sport, league in TARGET_LEAGUES:
-        sync_player_season_stats(sport, league)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="ESPN 선수 시즌 스탯 동기화")
+    parser.add_argument("--fanout", action="store_true", help="splits 요청을 동시에 보내는 fan-out 모드")
+    parser.add_argument("--concurrency", type=int, default=espn_fanout.DEFAULT_CONCURRENCY, help="동시 요청 수 (fan-out 모드)")
+    parser.add_argument("--rate", type=float, default=None, help="호스트별 초당 요청 수 제한 (fan-out 모드)")
+    parser.add_argument("--batch-size", type=int, default=db_batch.DEFAULT_BATCH_SIZE, help="다건 INSERT 1회당 행 수")
+    parser.add_argument("--restart", action="store_true", help="진행 기록(sync_journal)을 무시하고 처음부터 수집")
+    parser.add_argument("--fresh-hours", type=float, default=sync_journal.FRESH_HOURS, help="이 시간 안에 끝난 (팀, 선수, 시즌)은 건너뜀")
+    parser.add_argument("--workers", type=int, default=espn_shards.DEFAULT_WORKERS, help="리그를 나눠 실행할 프로세스 수")
+    args = parser.parse_args()
+
+    espn_shards.run("espn_player_season_stats", sync_league, TARGET_LEAGUES, workers=args.workers,
+                    fanout=args.fanout, concurrency=args.concurrency, rate=args.rate, batch_size=args.batch_size,
+                    fresh_hours=args.fresh_hours, restart=args.restart)
+    espn_client.print_stats()
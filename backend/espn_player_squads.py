@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-import requests
+import espn_client
 import psycopg2
 
 # --- 환경 변수 로드 ---
@@ -52,7 +52,7 @@ def sync_player_squads(sport, league_slug):
     base_url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league_slug}/teams"
     
     try:
-        res = requests.get(base_url, params={'limit': 1000})
+        res = espn_client.get(base_url, params={'limit': 1000})
         if res.status_code != 200:
             print(f"⚠️ API 호출 실패: {res.status_code}")
             return
@@ -93,7 +93,7 @@ def sync_player_squads(sport, league_slug):
             
             # 로스터 API 호출 (enable=roster)
             roster_url = f"{base_url}/{team_id}"
-            r_res = requests.get(roster_url, params={'enable': 'roster'})
+            r_res = espn_client.get(roster_url, params={'enable': 'roster'})
             
             if r_res.status_code != 200: continue
             
@@ -162,4 +162,5 @@ def sync_player_squads(sport, league_slug):
 if __name__ == "__main__":
     print("🏟️ 선수단(Squad) 테이블 채우기 시작...\n")
     for sport, league in TARGET_LEAGUES:
-        sync_player_squads(sport, league)
\ No newline at end of file
+        sync_player_squads(sport, league)
+    espn_client.print_stats()
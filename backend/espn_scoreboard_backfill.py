@@ -0,0 +1,229 @@
+import os
+import json
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, date, timedelta
+
+import psycopg2
+
+import espn_client
+import db_batch
+from id_resolver import IdResolver
+from espn_games import DB_CONFIG, GAMES_TEMPLATE, SQL_GAMES, STATE_PATH, parse_event
+
+# --- ESPN scoreboard 날짜 구간 백필 ---
+# espn_games.py는 팀마다 /teams/{id}/schedule 을 호출해서 (팀 수만큼 요청, 같은 경기 2번 수신)
+# 시즌 일정을 모읍니다. 여기서는 scoreboard?dates=YYYYMMDD-YYYYMMDD 로 기간을 잘라서 가져오므로
+# 한 시즌이 수십 번의 요청으로 끝나고, 각 경기는 정확히 한 번만 받습니다.
+#   - 기간을 CHUNK_DAYS 단위 구간으로 나눠 동시에 요청 (ThreadPoolExecutor)
+#   - 저장은 메인 스레드의 DB 커넥션 하나에서 구간 단위로 commit
+#   - 끝난(이미 지난) 구간은 체크포인트에 기록 → 중단 후 다시 실행하면 남은 구간만 수집
+#
+# 사용 예:
+#   python espn_scoreboard_backfill.py --league mlb --start 2024-03-20 --end 2024-10-31
+#   python espn_scoreboard_backfill.py --league eng.1          (기간 생략 시 ESPN 시즌 캘린더 사용)
+#   python espn_scoreboard_backfill.py                          (TARGET_LEAGUES 전체)
+
+CHUNK_DAYS = int(os.getenv("ESPN_BACKFILL_CHUNK_DAYS", "7"))
+CONCURRENCY = int(os.getenv("ESPN_BACKFILL_CONCURRENCY", "4"))
+# 구간 하나에 들어올 수 있는 최대 이벤트 수 (MLB 한 주 ≈ 100경기)
+EVENT_LIMIT = 1000
+
+CHECKPOINT_PATH = STATE_PATH.with_name("scoreboard_backfill.json")
+
+TARGET_LEAGUES = [
+    ("baseball", "mlb"),
+    ("soccer", "eng.1"),
+    ("basketball", "nba"),
+    ("football", "nfl"),
+    ("hockey", "nhl"),
+    ("soccer", "esp.1"),
+    ("soccer", "ger.1"),
+    ("soccer", "ita.1"),
+    ("soccer", "fra.1"),
+    ("soccer", "uefa.champions"),
+    ("soccer", "uefa.europa"),
+    ("soccer", "jpn.1"),
+]
+
+
+# --- 체크포인트 ---
+def load_checkpoint():
+    try:
+        return json.loads(CHECKPOINT_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def save_checkpoint(checkpoint):
+    CHECKPOINT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = CHECKPOINT_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(checkpoint, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, CHECKPOINT_PATH)
+
+
+# --- 기간 계산 ---
+def parse_day(value):
+    """'2024-03-20' / '20240320' / ESPN 캘린더의 '2024-03-20T07:00Z' 모두 허용"""
+    value = value.strip()[:10].replace("-", "")
+    return datetime.strptime(value, "%Y%m%d").date()
+
+def split_range(start, end, chunk_days=CHUNK_DAYS):
+    """[start, end] 기간을 chunk_days 일 단위 (시작, 끝) 구간 목록으로 나눕니다."""
+    chunks = []
+    cur = start
+    while cur <= end:
+        chunk_end = min(end, cur + timedelta(days=chunk_days - 1))
+        chunks.append((cur, chunk_end))
+        cur = chunk_end + timedelta(days=1)
+    return chunks
+
+def chunk_label(chunk):
+    return f"{chunk[0]:%Y%m%d}-{chunk[1]:%Y%m%d}"
+
+def scoreboard_url(sport, league):
+    return f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league}/scoreboard"
+
+def season_calendar(sport, league):
+    """
+    기간을 지정하지 않았을 때 scoreboard 응답의 시즌 캘린더(calendarStartDate/EndDate)를 사용합니다.
+    """
+    res = espn_client.get(scoreboard_url(sport, league))
+    res.raise_for_status()
+    l_data = res.json()['leagues'][0]
+    return parse_day(l_data['calendarStartDate']), parse_day(l_data['calendarEndDate'])
+
+
+# --- 수집 / 저장 ---
+def fetch_chunk(sport, league, chunk):
+    """워커 스레드: 구간 하나의 scoreboard 응답 (리그 정보, 이벤트 목록)"""
+    res = espn_client.get(scoreboard_url(sport, league), params={"dates": chunk_label(chunk), "limit": EVENT_LIMIT})
+    res.raise_for_status()
+    data = res.json()
+    leagues = data.get('leagues') or [{}]
+    return leagues[0], data.get('events', [])
+
+def ensure_league(cur, resolver, l_data, league, sport):
+    league_id = int(l_data['id'])
+    if resolver.league_id(league) != league_id:
+        cur.execute("""
+            INSERT INTO sl_leagues (id, name, slug, sport_id)
+            VALUES (%s, %s, %s, (SELECT id FROM sl_sports WHERE name=%s LIMIT 1))
+            ON CONFLICT (id) DO UPDATE
+            SET name = EXCLUDED.name, slug = EXCLUDED.slug;
+        """, (league_id, l_data.get('name', league), league, sport))
+        resolver.remember_league(league, league_id)
+    return league_id
+
+def write_chunk(cur, resolver, batch, league_id, events):
+    """구간 하나의 이벤트를 배치에 담습니다. (팀/시즌 FK는 resolver가 먼저 보장)"""
+    count = 0
+    for event in events:
+        try:
+            game = parse_event(event)
+            if not game: continue
+
+            comp = event['competitions'][0]
+            for c in comp.get('competitors', []):
+                team = c.get('team', {})
+                if int(team.get('id', 0)) > 0:
+                    resolver.ensure_team(int(team['id']), team.get('displayName', 'Unknown'), team.get('logo'))
+
+            year = event.get('season', {}).get('year') or game["game_date"].year
+            season_id = resolver.season_id(league_id, year)
+
+            batch.add((
+                game["id"], season_id, league_id,
+                game["home_id"] or None, game["away_id"] or None, game["game_date"],
+                game["status"], game["home_score"], game["away_score"],
+                json.dumps(game["score_detail"])
+            ))
+            count += 1
+        except Exception:
+            continue
+    return count
+
+def backfill_league(sport, league, start=None, end=None, concurrency=CONCURRENCY, chunk_days=CHUNK_DAYS, restart=False, checkpoint=None):
+    if start is None or end is None:
+        cal_start, cal_end = season_calendar(sport, league)
+        start, end = start or cal_start, end or cal_end
+
+    checkpoint = checkpoint if checkpoint is not None else {}
+    if restart:
+        checkpoint[league] = []
+    done = set(checkpoint.get(league, []))
+    chunks = [c for c in split_range(start, end, chunk_days) if chunk_label(c) not in done]
+    print(f"🚀 [{league}] {start} ~ {end}: 구간 {len(chunks)}개 수집 (완료 건너뜀 {len(split_range(start, end, chunk_days)) - len(chunks)}개)")
+    if not chunks: return 0
+
+    # 어제 이전에 끝난 구간만 체크포인트 (진행 중/예정 경기가 있는 구간은 다음 실행 때 다시 받음)
+    settled_until = date.today() - timedelta(days=1)
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    resolver = IdResolver(cur)
+    batch = db_batch.UpsertBatch(cur, SQL_GAMES, "sl_games", template=GAMES_TEMPLATE, key=lambda r: r[0], lock=lambda r: r[0])
+    total = 0
+    failed = 0
+    start_time = time.monotonic()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            futures = {pool.submit(fetch_chunk, sport, league, c): c for c in chunks}
+            for fut in as_completed(futures):
+                chunk = futures[fut]
+                label = chunk_label(chunk)
+                try:
+                    l_data, events = fut.result()
+                    league_id = ensure_league(cur, resolver, l_data, league, sport)
+                    count = write_chunk(cur, resolver, batch, league_id, events)
+                    batch.flush()
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    batch.discard()
+                    resolver.reload()
+                    failed += 1
+                    print(f"  ❌ [{league}] {label} 실패: {e}")
+                    continue
+
+                total += count
+                print(f"  ✅ [{league}] {label}: {count}경기")
+                if chunk[1] <= settled_until:
+                    checkpoint.setdefault(league, []).append(label)
+                    save_checkpoint(checkpoint)
+    finally:
+        cur.close()
+        conn.close()
+
+    elapsed = time.monotonic() - start_time
+    print(f"🏁 [{league}] {total}경기 중 변경 {batch.rows_changed}경기 저장 (변경 없음 {batch.rows_unchanged}), 실패 구간 {failed}개 ({elapsed:.1f}s)")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ESPN scoreboard 날짜 구간 백필")
+    parser.add_argument("--league", help="ESPN 리그 키 (예: mlb, eng.1). 생략 시 TARGET_LEAGUES 전체")
+    parser.add_argument("--sport", help="--league가 TARGET_LEAGUES에 없을 때의 종목 (예: soccer)")
+    parser.add_argument("--start", type=parse_day, help="시작일 YYYY-MM-DD (생략 시 시즌 캘린더)")
+    parser.add_argument("--end", type=parse_day, help="종료일 YYYY-MM-DD (생략 시 시즌 캘린더)")
+    parser.add_argument("--chunk-days", type=int, default=CHUNK_DAYS, help=f"구간 길이(일) (기본 {CHUNK_DAYS})")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help=f"동시 요청 구간 수 (기본 {CONCURRENCY})")
+    parser.add_argument("--restart", action="store_true", help="체크포인트를 무시하고 전체 기간을 다시 수집")
+    args = parser.parse_args()
+
+    if args.league:
+        sport = args.sport or dict((l, s) for s, l in TARGET_LEAGUES).get(args.league)
+        if not sport:
+            parser.error(f"알 수 없는 리그입니다: {args.league} (--sport 지정 필요)")
+        targets = [(sport, args.league)]
+    else:
+        targets = TARGET_LEAGUES
+
+    checkpoint = load_checkpoint()
+    for sport, league in targets:
+        try:
+            backfill_league(sport, league, args.start, args.end, args.concurrency, max(1, args.chunk_days), args.restart, checkpoint)
+        except Exception as e:
+            print(f"❌ [{league}] 백필 실패: {e}")
+    espn_client.print_stats()
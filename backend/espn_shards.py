@@ -0,0 +1,137 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import espn_client
+
+# --- 리그 단위 프로세스 샤딩 ---
+# ESPN 스크립트의 `for sport, league in TARGET_LEAGUES: sync_x(sport, league)` 루프를 프로세스 풀로 나눠 실행합니다.
+# 리그끼리는 독립적이고 JSON 파싱/행 생성은 CPU를 쓰므로 큰 리그가 여러 코어에서 동시에 돌 수 있습니다.
+#   - 워커마다 자기 DB 커넥션(각 sync 함수가 직접 연결)과 HTTP Session(espn_client)을 사용
+#   - 예상 작업량(지난 실행 소요 시간, 없으면 LEAGUE_WEIGHTS)이 큰 리그부터 배정 → 워커 간 부하 균형
+#   - 리그별 결과/소요 시간/요청 수를 부모 프로세스에서 모아 출력하고 다음 실행의 가중치로 저장
+#   - 워커의 ESPN 호출 통계(espn_client.stats)는 리그마다 부모로 돌려보내 합치므로 부모의 print_stats()가 전체를 출력
+# 호스트별 초당 요청 수(ESPN_RATE_PER_SEC, sync 함수의 rate 인자)는 워커 수로 나눠 전체 속도 제한을 유지합니다.
+
+TIMINGS_PATH = Path(__file__).with_name(".sync_state") / "shard_timings.json"
+DEFAULT_WORKERS = int(os.getenv("ESPN_SHARD_WORKERS", "1"))
+
+# 지난 실행 기록이 없을 때의 리그별 상대 작업량 (팀 수 x 로스터 크기 대략치)
+LEAGUE_WEIGHTS = {
+    "nfl": 1700, "mlb": 1200, "nhl": 750, "nba": 500,
+    "uefa.champions": 900, "uefa.europa": 900,
+    "usa.1": 750, "eng.1": 550, "esp.1": 550, "ita.1": 550, "fra.1": 500, "ger.1": 500,
+}
+DEFAULT_WEIGHT = 500
+
+
+def load_timings():
+    try:
+        return json.loads(TIMINGS_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_timings(timings):
+    TIMINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = TIMINGS_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(timings, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, TIMINGS_PATH)
+
+
+def order_by_cost(job, leagues, timings=None):
+    """예상 작업량이 큰 리그부터 (LPT 배정: 긴 작업을 먼저 시작해야 마지막에 한 워커만 남는 시간이 줄어듦)"""
+    known = (timings or {}).get(job, {})
+    if all(league in known for _, league in leagues):
+        cost = lambda l: known[l[1]]
+    else:
+        cost = lambda l: LEAGUE_WEIGHTS.get(l[1], DEFAULT_WEIGHT)
+    return sorted(leagues, key=cost, reverse=True)
+
+
+def _init_worker(workers):
+    # 부모의 Session/속도 제한기를 물려받지 않고 워커에서 새로 만듦
+    espn_client._session = None
+    espn_client.set_rate_limit(espn_client.RATE_PER_SEC / max(1, workers), max(1, espn_client.RATE_BURST // max(1, workers)))
+
+
+def _stats_delta(before, after):
+    """espn_client.stats.snapshot() 두 개의 차이 (max는 구간 값을 알 수 없어 이후 값 사용)"""
+    delta = {}
+    for endpoint, s in after.items():
+        prev = before.get(endpoint, {})
+        d = {k: (v if k == "max" else v - prev.get(k, 0)) for k, v in s.items()}
+        if d["count"]:
+            delta[endpoint] = d
+    return delta
+
+
+def _run_league(func, sport, league, kwargs):
+    start = time.monotonic()
+    before = espn_client.stats.snapshot()
+    result, error = None, None
+    try:
+        result = func(sport, league, **kwargs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    http = _stats_delta(before, espn_client.stats.snapshot())
+    return {
+        "sport": sport, "league": league, "result": result, "error": error,
+        "elapsed": time.monotonic() - start, "requests": sum(s["count"] for s in http.values()),
+        "http": http, "pid": os.getpid(),
+    }
+
+
+def run(job, func, leagues, workers=DEFAULT_WORKERS, **kwargs):
+    """
+    leagues의 각 (sport, league)에 대해 func(sport, league, **kwargs)를 실행하고 리그별 결과 목록을 돌려줍니다.
+    workers <= 1 이면 지금 프로세스에서 차례로 실행합니다. (기존 루프와 동일)
+    func는 모듈 최상위 함수여야 합니다. (워커로 pickle 되어 전달)
+    """
+    timings = load_timings()
+    ordered = order_by_cost(job, leagues, timings)
+    workers = max(1, min(workers, len(ordered)))
+    start = time.monotonic()
+    results = []
+
+    if workers == 1:
+        for sport, league in ordered:
+            results.append(_run_league(func, sport, league, kwargs))
+    else:
+        print(f"🧩 [{job}] {len(ordered)}개 리그를 프로세스 {workers}개로 나눠 실행")
+        # rate(--rate)는 워커마다 espn_fanout.run이 속도 제한기에 그대로 설정하므로 워커 수로 나눠서 전달
+        if kwargs.get("rate") is not None:
+            kwargs = dict(kwargs, rate=kwargs["rate"] / workers)
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(workers,)) as pool:
+            futures = {pool.submit(_run_league, func, sport, league, kwargs): league for sport, league in ordered}
+            for fut in as_completed(futures):
+                try:
+                    r = fut.result()
+                    # 요청은 워커에서 일어났으므로 호출 통계를 부모로 합침 (workers == 1이면 이미 이 프로세스에 기록됨)
+                    espn_client.stats.merge(r["http"])
+                    results.append(r)
+                except Exception as e:
+                    # 워커 프로세스 자체가 죽은 경우
+                    results.append({"sport": None, "league": futures[fut], "result": None, "error": str(e),
+                                    "elapsed": 0.0, "requests": 0, "http": {}, "pid": None})
+
+    wall = time.monotonic() - start
+    job_timings = timings.setdefault(job, {})
+    for r in results:
+        if not r["error"]:
+            job_timings[r["league"]] = round(r["elapsed"], 1)
+    save_timings(timings)
+    print_summary(job, results, wall, workers)
+    return results
+
+
+def print_summary(job, results, wall, workers):
+    total = sum(r["elapsed"] for r in results)
+    print(f"\n🧩 [{job}] 리그별 결과 (전체 {wall:.1f}s, 리그 합계 {total:.1f}s, 워커 {workers}개)")
+    for r in sorted(results, key=lambda r: -r["elapsed"]):
+        status = f"❌ {r['error']}" if r["error"] else "✅"
+        print(f"  - {r['league']}: {r['elapsed']:.1f}s, 요청 {r['requests']}회 (pid {r['pid']}) {status}")
@@ -4,6 +4,8 @@ import requests
 import psycopg2
 import json
 import time
+import hot_stats
+import db_batch
 
 # --- 설정 (환경에 맞게 수정하세요) ---
 def load_env(path: Path) -> None:
@@ -51,13 +53,17 @@ def ensure_game_exists(cur, game_id, game_date, home_id, away_id, league_id, sea
     """
     FK 제약조건 해결을 위해 게임이 없으면 임시로 생성합니다.
     """
+    # sl_games는 game_date 파티션이라 (id, game_date) 충돌만 감지하므로 id로 먼저 확인
     sql = """
         INSERT INTO sl_games (id, game_date, home_team_id, away_team_id, league_id, season_id)
-        VALUES (%s, %s, %s, %s, %s, %s)
-        ON CONFLICT (id) DO NOTHING;
+        SELECT %s::bigint, %s::timestamptz, %s::bigint, %s::bigint, %s::bigint, %s::int
+        WHERE NOT EXISTS (SELECT 1 FROM sl_games WHERE id = %s)
+        ON CONFLICT DO NOTHING;
     """
     try:
-        cur.execute(sql, (game_id, game_date, home_id, away_id, league_id, season_id))
+        # 다른 수집 스크립트와 같은 id를 다른 날짜로 저장하지 않도록 (db_batch.lock_ids 참고)
+        db_batch.lock_ids(cur, [game_id])
+        cur.execute(sql, (game_id, game_date, home_id, away_id, league_id, season_id, game_id))
     except Exception:
         pass # 날짜 포맷 에러 등은 무시
 
@@ -66,6 +72,7 @@ def sync_player_stats(sport, league):
     
     conn = get_db_connection()
     cur = conn.cursor()
+    hot = hot_stats.make_batch(cur)
 
     # [중요] 0. DB에서 League ID와 Season ID 먼저 찾기 (FK용)
     # 이게 없으면 ensure_game_exists나 stats 저장시 에러남
@@ -153,12 +160,13 @@ def sync_player_stats(sport, league):
 
                                 # Game Stats 저장 (Upsert)
                                 sql_game_stats = """
-                                    INSERT INTO sl_player_game_stats (game_id, player_id, team_id, stats)
-                                    VALUES (%s, %s, %s, %s)
-                                    ON CONFLICT (game_id, player_id) DO UPDATE 
-                                    SET stats = EXCLUDED.stats;
+                                    INSERT INTO sl_player_game_stats (game_id, game_date, player_id, team_id, stats)
+                                    SELECT g.id, g.game_date, %s, %s, %s::jsonb FROM sl_games g WHERE g.id = %s
+                                    ON CONFLICT (game_id, player_id, game_date) DO UPDATE
+                                    SET stats = EXCLUDED.stats
+                                    WHERE sl_player_game_stats.stats IS DISTINCT FROM EXCLUDED.stats;
                                 """
-                                cur.execute(sql_game_stats, (game_id, player_id, team_id, stats_json))
+                                cur.execute(sql_game_stats, (player_id, team_id, stats_json, game_id))
                             except Exception:
                                 continue
 
@@ -182,13 +190,16 @@ def sync_player_stats(sport, league):
                         INSERT INTO sl_player_season_stats (player_id, season_id, team_id, stats)
                         VALUES (%s, %s, %s, %s)
                         ON CONFLICT (player_id, season_id, team_id) DO UPDATE 
-                        SET stats = EXCLUDED.stats;
+                        SET stats = EXCLUDED.stats
+                        WHERE sl_player_season_stats.stats IS DISTINCT FROM EXCLUDED.stats;
                     """
                      # season_stats_raw 자체를 JSON으로 변환하여 저장
                      cur.execute(sql_season_stats, (player_id, season_db_id, team_id, json.dumps(season_stats_raw)))
+                     hot_stats.add(hot, sport, player_id, season_db_id, team_id, season_stats_raw)
+                     hot.flush()
 
             except Exception:
-                pass
+                hot.discard()
 
             conn.commit()
             total_players += 1
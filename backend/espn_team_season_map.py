@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-import requests
+import espn_client
 import psycopg2
 
 # --- 환경 변수 로드 ---
@@ -54,7 +54,7 @@ def sync_team_season_map(sport, league_slug):
     url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{league_slug}/teams"
     
     try:
-        res = requests.get(url, params={'limit': 1000})
+        res = espn_client.get(url, params={'limit': 1000})
         res.raise_for_status()
         data = res.json()
 
@@ -125,4 +125,5 @@ def sync_team_season_map(sport, league_slug):
 if __name__ == "__main__":
     print("🔄 팀-시즌 매핑(sl_team_season_map) 작업을 시작합니다...\n")
     for sport, league in TARGET_LEAGUES:
-        sync_team_season_map(sport, league)
\ No newline at end of file
+        sync_team_season_map(sport, league)
+    espn_client.print_stats()
@@ -1,10 +1,8 @@
 import os
 from pathlib import Path
 
-import requests
+import espn_client
 import psycopg2
-import re
-import json
 
 # --- 설정 (환경에 맞게 수정하세요) ---
 def load_env(path: Path) -> None:
@@ -59,7 +57,7 @@ def sync_teams_only(sport, league):
     params = {'limit': 1000} # 모든 팀 다 가져오기
     
     try:
-        res = requests.get(url, params=params)
+        res = espn_client.get(url, params=params)
         res.raise_for_status()
         data = res.json()
         
@@ -110,5 +108,6 @@ if __name__ == "__main__":
     
     for sport, league in TARGET_LEAGUES:
         sync_teams_only(sport, league)
+    espn_client.print_stats()
         
     print("\n✨ 모든 작업이 완료되었습니다.")
\ No newline at end of file
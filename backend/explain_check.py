@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import psycopg2
+
+# --- 화면 쿼리 실행 계획 점검 (EXPLAIN 회귀 검사) ---
+# 경기결과/경기일정/홈/선수 상세/순위표 화면이 보내는 쿼리(Prisma where/orderBy와 같은 조건)를 EXPLAIN 해서
+#   - 기대한 인덱스(idx_games_results 등)를 쓰는지
+#   - 큰 테이블(sl_games, sl_player_game_stats ...)을 Seq Scan 하지 않는지
+# 확인합니다. 파티션 테이블은 계획에 파티션별 인덱스/테이블 이름이 나오므로 부모 이름으로 바꿔서 비교합니다. 인덱스가 지워지거나 쿼리 조건이 인덱스와 어긋나면 실패(종료 코드 1)합니다.
+#
+# 기본은 enable_seqscan = off 로 계획을 만듭니다. 데이터가 적은 DB에서는 플래너가 Seq Scan을 고르는 게 정상이라
+# "쓸 수 있는 인덱스가 있는가"를 데이터 양과 상관없이 확인하기 위함입니다. (--real-plan: 실제 플래너 선택 확인)
+#
+#   python explain_check.py                 # 점검
+#   python explain_check.py --analyze       # 실제 실행 시간까지 (EXPLAIN ANALYZE)
+#   python explain_check.py --league 200    # 특정 리그로 점검
+
+# --- 환경 변수 로드 ---
+def load_env(path: Path) -> None:
+    if not path.exists(): return
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line: continue
+        key, value = line.split("=", 1)
+        os.environ.setdefault(key.strip(), value.strip())
+
+load_env(Path(__file__).with_name(".env"))
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "database": os.getenv("DB_NAME", "sportslab"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "rootpassword"),
+    "port": os.getenv("DB_PORT", "5432"),
+}
+
+# Seq Scan이 나오면 안 되는 테이블 (sl_teams/sl_leagues 같은 작은 기준 테이블은 제외)
+LARGE_TABLES = {"sl_games", "sl_player_game_stats", "sl_player_stat_values", "sl_leaderboards"}
+
+# 화면별 쿼리 (frontend/src/app/(site)/... 의 Prisma 조건과 같게 유지할 것)
+CHECKS = [
+    {
+        "name": "results",  # results/[league]/page.tsx
+        "expect": "idx_games_results",
+        "sql": """
+            SELECT g.id, g.game_date, g.status, g.home_score, g.away_score, g.score_detail,
+                   h.name, h.logo_url, a.name, a.logo_url
+            FROM sl_games g
+            LEFT JOIN sl_teams h ON h.id = g.home_team_id
+            LEFT JOIN sl_teams a ON a.id = g.away_team_id
+            WHERE g.league_id = %(league_id)s
+              AND g.status IN ('STATUS_FINAL', 'STATUS_FULL_TIME', 'STATUS_POSTPONED')
+              AND g.game_date <= NOW()
+              AND g.home_team_id IS NOT NULL AND g.away_team_id IS NOT NULL
+            ORDER BY g.game_date DESC
+            LIMIT 20
+        """,
+    },
+    {
+        "name": "home_last_game",  # (site)/page.tsx
+        "expect": "idx_games_results",
+        "sql": """
+            SELECT g.game_date, g.home_score, g.away_score
+            FROM sl_games g
+            WHERE g.league_id = %(league_id)s
+              AND g.status IN ('STATUS_FINAL', 'STATUS_FULL_TIME')
+              AND g.game_date <= NOW()
+              AND g.home_team_id IS NOT NULL AND g.away_team_id IS NOT NULL
+            ORDER BY g.game_date DESC
+            LIMIT 1
+        """,
+    },
+    {
+        "name": "schedule",  # schedule/[league]/page.tsx
+        "expect": "idx_games_upcoming",
+        "sql": """
+            SELECT g.id, g.game_date, g.status, g.home_score, g.away_score, g.score_detail,
+                   h.name, h.logo_url, a.name, a.logo_url
+            FROM sl_games g
+            LEFT JOIN sl_teams h ON h.id = g.home_team_id
+            LEFT JOIN sl_teams a ON a.id = g.away_team_id
+            WHERE g.league_id = %(league_id)s
+              AND g.status IN ('STATUS_SCHEDULED', 'STATUS_FIRST_HALF', 'STATUS_SECOND_HALF', 'STATUS_IN_PROGRESS')
+              AND g.game_date >= NOW()
+            ORDER BY g.game_date ASC
+            LIMIT 20
+        """,
+    },
+    {
+        "name": "season_months",  # backend/naver_schedule.pending_months
+        "expect": "idx_games_season",
+        "sql": """
+            SELECT EXTRACT(MONTH FROM game_date AT TIME ZONE 'Asia/Seoul')::int AS m, COUNT(*)
+            FROM sl_games
+            WHERE season_id = %(season_id)s
+            GROUP BY m
+        """,
+    },
+    {
+        "name": "player_recent_games",  # players/[league]/[playerId]/page.tsx
+        "expect": "idx_player_game_stats_player",
+        "sql": """
+            SELECT s.stats, g.game_date, g.home_score, g.away_score
+            FROM sl_player_game_stats s
+            JOIN sl_games g ON g.id = s.game_id AND g.game_date = s.game_date
+            WHERE s.player_id = %(player_id)s
+            ORDER BY s.game_date DESC
+            LIMIT 10
+        """,
+    },
+    {
+        "name": "leaderboard",  # api/leaderboards/route.ts
+        "expect": "sl_leaderboards_pkey",
+        "sql": """
+            SELECT b.rank, b.player_name, b.team_name, b.value
+            FROM sl_leaderboards b
+            WHERE b.season_id = %(season_id)s AND b.stat_key = 'avg'
+            ORDER BY b.rank
+            LIMIT 10
+        """,
+    },
+]
+
+
+def sample_params(cur, league_id=None):
+    """점검에 쓸 리그/시즌/선수 ID (지정하지 않으면 경기가 가장 많은 리그)"""
+    if league_id is None:
+        cur.execute("SELECT league_id FROM sl_games WHERE league_id IS NOT NULL GROUP BY league_id ORDER BY COUNT(*) DESC LIMIT 1")
+        row = cur.fetchone()
+        league_id = row[0] if row else 0
+    cur.execute("SELECT id FROM sl_seasons WHERE league_id = %s ORDER BY year DESC LIMIT 1", (league_id,))
+    row = cur.fetchone()
+    season_id = row[0] if row else 0
+    cur.execute("SELECT player_id FROM sl_player_game_stats LIMIT 1")
+    row = cur.fetchone()
+    player_id = row[0] if row else 0
+    return {"league_id": league_id, "season_id": season_id, "player_id": player_id}
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def parent_names(cur, names):
+    """파티션의 테이블/인덱스 이름 → 부모(파티션 테이블)의 이름 (파티션이 아니면 그대로)"""
+    if not names: return {}
+    cur.execute("""
+        SELECT c.relname, COALESCE(p.relname, c.relname)
+        FROM pg_class c
+        LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+        LEFT JOIN pg_class p ON p.oid = i.inhparent
+        WHERE c.relname = ANY(%s)
+    """, (list(names),))
+    mapping = dict(cur.fetchall())
+    cur.connection.rollback()
+    return {n: mapping.get(n, n) for n in names}
+
+
+def explain(cur, sql, params, analyze=False, real_plan=False):
+    """EXPLAIN (FORMAT JSON) 결과의 최상위 dict (계획만 보고 롤백)"""
+    try:
+        if not real_plan:
+            cur.execute("SET LOCAL enable_seqscan = off")
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        cur.execute(f"EXPLAIN ({options}) {sql}", params)
+        result = cur.fetchone()[0]
+    finally:
+        cur.connection.rollback()
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]
+
+
+def check(cur, item, params, analyze=False, real_plan=False, max_ms=None):
+    """반환: 문제 목록 (비어 있으면 통과)"""
+    plan = explain(cur, item["sql"], params, analyze, real_plan)
+    nodes = list(plan_nodes(plan["Plan"]))
+    indexes = {n["Index Name"] for n in nodes if "Index Name" in n}
+    seq_scans = {n.get("Relation Name") for n in nodes if n["Node Type"] == "Seq Scan"}
+    parents = parent_names(cur, indexes | seq_scans)
+    indexes = {parents[n] for n in indexes}
+    seq_scans = {parents[n] for n in seq_scans}
+
+    problems = []
+    if item["expect"] not in indexes:
+        problems.append(f"{item['expect']} 미사용 (사용한 인덱스: {', '.join(sorted(indexes)) or '없음'})")
+    for table in sorted(seq_scans & LARGE_TABLES):
+        problems.append(f"{table} Seq Scan")
+    elapsed = plan.get("Execution Time")
+    if max_ms is not None and elapsed is not None and elapsed > max_ms:
+        problems.append(f"실행 {elapsed:.1f}ms > {max_ms:.0f}ms")
+
+    cost = plan["Plan"]["Total Cost"]
+    timing = f", 실행 {elapsed:.1f}ms" if elapsed is not None else ""
+    icon = "❌" if problems else "✅"
+    print(f"  {icon} {item['name']:<20} cost {cost:>10.1f}{timing}  [{', '.join(sorted(indexes)) or '-'}]")
+    for p in problems:
+        print(f"      - {p}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="화면 쿼리 실행 계획(EXPLAIN) 회귀 검사")
+    parser.add_argument("--league", type=int, default=None, help="점검할 리그 ID (기본: 경기가 가장 많은 리그)")
+    parser.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE로 실제 실행 시간 측정")
+    parser.add_argument("--max-ms", type=float, default=None, help="--analyze 시 쿼리당 허용 실행 시간(ms)")
+    parser.add_argument("--real-plan", action="store_true", help="enable_seqscan을 끄지 않고 실제 플래너 선택을 점검")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    cur = conn.cursor()
+    try:
+        params = sample_params(cur, args.league)
+        conn.rollback()
+        print(f"🔎 실행 계획 점검 (리그 {params['league_id']}, 시즌 {params['season_id']}, 선수 {params['player_id']})")
+        failures = 0
+        for item in CHECKS:
+            try:
+                if check(cur, item, params, args.analyze, args.real_plan, args.max_ms):
+                    failures += 1
+            except psycopg2.Error as e:
+                conn.rollback()
+                failures += 1
+                print(f"  ❌ {item['name']:<20} 에러: {e}")
+    finally:
+        cur.close()
+        conn.close()
+
+    if failures:
+        print(f"⚠️ {failures}개 쿼리가 기대한 인덱스를 쓰지 않습니다. (DB/init.sql 인덱스 확인)")
+        sys.exit(1)
+    print("🎉 모든 화면 쿼리가 인덱스를 사용합니다.")
+
+
+if __name__ == "__main__":
+    main()
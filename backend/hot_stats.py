@@ -0,0 +1,236 @@
+import argparse
+import json
+import os
+from pathlib import Path
+
+import psycopg2
+
+import db_batch
+
+# --- 주요 스탯 정규화 (sl_player_stat_values) ---
+# sl_player_season_stats.stats는 출처마다 모양이 다른 JSONB라서
+#   - ESPN splits: {"labels": [...], "values": [...], "raw": ...}
+#   - KBO: {"AVG": "0.312", "HR": 12, "IP": "14.3", ...}
+#   - K리그: {"K1": {...}, "K2": {...}, "Total": {"apps": .., "goals": .., "assists": ..}}
+# "KBO 2024 타율 1위" 같은 순위를 구하려면 모든 행의 JSONB를 읽고 파싱해야 했습니다.
+# 수집 스크립트가 시즌 기록을 저장할 때 종목별 주요 스탯만 숫자로 뽑아
+# (player_id, season_id, team_id, stat_key, value) 행으로 함께 저장합니다.
+# idx_stat_values_rank (season_id, stat_key, value) 인덱스로 순위 조회가 인덱스 범위 스캔이 됩니다.
+#
+#   python hot_stats.py --backfill              # 기존 sl_player_season_stats 전체에서 채우기
+#   python hot_stats.py --backfill --league 200 # 리그 하나만
+
+# --- 환경 변수 로드 ---
+def load_env(path: Path) -> None:
+    if not path.exists(): return
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line: continue
+        key, value = line.split("=", 1)
+        os.environ.setdefault(key.strip(), value.strip())
+
+load_env(Path(__file__).with_name(".env"))
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "database": os.getenv("DB_NAME", "sportslab"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "rootpassword"),
+    "port": os.getenv("DB_PORT", "5432"),
+}
+
+# 종목(sl_sports.slug) → {stat_key: 원본 키 후보}
+# 같은 약어라도 종목마다 뜻이 달라서(야구 G = 경기 수, 축구 G = 골) 종목별로 따로 찾습니다.
+HOT_STATS = {
+    "baseball": {
+        "avg": ("AVG", "avg", "battingAverage"),
+        "hr": ("HR", "homeRuns"),
+        "ab": ("AB", "atBats"),
+        "era": ("ERA", "earnedRunAverage"),
+        "ip": ("IP", "innings", "inningsPitched"),
+    },
+    "soccer": {
+        "goals": ("goals", "G", "totalGoals"),
+        "assists": ("assists", "A", "goalAssists"),
+    },
+    "basketball": {
+        "pts": ("PTS", "avgPoints", "points"),
+    },
+    "hockey": {
+        "goals": ("G", "goals"),
+        "assists": ("A", "assists"),
+        "pts": ("PTS", "points"),
+    },
+}
+
+# 야구 투수 기록의 HR은 '피홈런'이므로 투수 기록(ERA/IP가 있는 dict)에서는 투수 스탯만 뽑음
+PITCHING_KEYS = ("era", "ip")
+BATTING_KEYS = ("avg", "hr", "ab")
+
+SQL_STAT_VALUES = """
+    INSERT INTO sl_player_stat_values
+    (player_id, season_id, team_id, stat_key, value, updated_at)
+    VALUES %s
+    ON CONFLICT (player_id, season_id, team_id, stat_key)
+    DO UPDATE SET value = EXCLUDED.value, updated_at = NOW()
+    WHERE sl_player_stat_values.value IS DISTINCT FROM EXCLUDED.value
+    RETURNING 1;
+"""
+
+
+def parse_ip(ip_str):
+    """
+    이닝 문자열 파싱 (예: "14 1/3" -> 14.333, "5" -> 5.0)
+    """
+    try:
+        ip_str = ip_str.strip()
+        if ' ' in ip_str:
+            # "14 2/3" 형태
+            whole, frac = ip_str.split(' ')
+            if '/' in frac:
+                num, den = map(int, frac.split('/'))
+                return float(whole) + (num / den)
+        elif '/' in ip_str:
+            # "2/3" 형태 (정수부 없음)
+            num, den = map(int, ip_str.split('/'))
+            return num / den
+        
+        # 정수 형태 ("14")
+        return float(ip_str) if ip_str else 0.0
+    except:
+        return 0.0
+
+
+def flatten(stats):
+    """출처별 stats 모양을 {원본 키: 값} 하나로 맞춥니다."""
+    if isinstance(stats, str):
+        try:
+            stats = json.loads(stats)
+        except ValueError:
+            return {}
+    if not isinstance(stats, dict):
+        return {}
+    # ESPN splits: labels와 values가 같은 순서
+    if isinstance(stats.get("labels"), list) and isinstance(stats.get("values"), list):
+        return dict(zip(stats["labels"], stats["values"]))
+    # K리그: 대회별(K1/K2) 기록 중 합계
+    if isinstance(stats.get("Total"), dict):
+        return stats["Total"]
+    return stats
+
+
+def to_number(stat_key, value):
+    if value is None or isinstance(value, bool): return None
+    if stat_key == "ip":
+        # "14 1/3", "14.3", 14.333 모두 처리
+        return round(parse_ip(str(value)), 3) if str(value).strip() else None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(",", "")
+    if text in ("", "-", "--"): return None
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def extract(sport, stats):
+    """stats(dict 또는 JSON 문자열)에서 종목별 주요 스탯을 {stat_key: float}로 뽑습니다."""
+    wanted = HOT_STATS.get(sport)
+    if not wanted: return {}
+    flat = flatten(stats)
+    if not flat: return {}
+
+    out = {}
+    for stat_key, candidates in wanted.items():
+        for name in candidates:
+            if name in flat:
+                value = to_number(stat_key, flat[name])
+                if value is not None:
+                    out[stat_key] = value
+                break
+
+    if sport == "baseball" and any(k in out for k in PITCHING_KEYS):
+        for k in BATTING_KEYS:
+            out.pop(k, None)
+    return out
+
+
+def make_batch(cur, batch_size=db_batch.DEFAULT_BATCH_SIZE):
+    """(player_id, season_id, team_id, stat_key, value) 행을 모아 저장하는 배치"""
+    return db_batch.UpsertBatch(
+        cur, SQL_STAT_VALUES, "sl_player_stat_values",
+        template="(%s, %s, %s, %s, %s, NOW())", key=lambda r: r[:4], batch_size=batch_size,
+    )
+
+
+def add(batch, sport, player_id, season_id, team_id, stats):
+    """시즌 기록 한 건의 주요 스탯을 배치에 추가합니다. 반환: 추가한 스탯 수"""
+    # 팀을 못 찾은 기록은 건너뜀 (KLEAGUE_player와 동일)
+    # unique (player_id, season_id, team_id, stat_key)에서 NULL은 서로 다른 값이라 ON CONFLICT가 걸리지 않고 중복 행이 쌓임
+    if team_id is None: return 0
+    values = extract(sport, stats)
+    for stat_key, value in values.items():
+        batch.add((player_id, season_id, team_id, stat_key, value))
+    return len(values)
+
+
+def backfill(conn, league_id=None, batch_size=db_batch.DEFAULT_BATCH_SIZE):
+    """이미 저장된 sl_player_season_stats에서 sl_player_stat_values를 채웁니다. (리그 단위 commit)"""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT DISTINCT l.id, sp.slug
+        FROM sl_leagues l
+        JOIN sl_sports sp ON sp.id = l.sport_id
+        JOIN sl_seasons se ON se.league_id = l.id
+        WHERE (%s::bigint IS NULL OR l.id = %s::bigint)
+        ORDER BY l.id
+    """, (league_id, league_id))
+    leagues = [(lid, slug) for lid, slug in cur.fetchall() if slug in HOT_STATS]
+
+    batch = make_batch(cur, batch_size)
+    total = 0
+    for lid, sport in leagues:
+        # 서버 측 커서로 나눠 읽어 큰 리그도 메모리에 한 번에 올리지 않음
+        read = conn.cursor(name=f"hot_stats_{lid}")
+        read.itersize = 2000
+        read.execute("""
+            SELECT s.player_id, s.season_id, s.team_id, s.stats
+            FROM sl_player_season_stats s
+            JOIN sl_seasons se ON se.id = s.season_id
+            WHERE se.league_id = %s
+        """, (lid,))
+        count = 0
+        try:
+            for player_id, season_id, team_id, stats in read:
+                count += add(batch, sport, player_id, season_id, team_id, stats)
+            read.close()
+            batch.flush()
+            conn.commit()
+            total += count
+            print(f"  ✅ 리그 {lid} ({sport}): 스탯 {count}개")
+        except Exception as e:
+            conn.rollback()
+            batch.discard()
+            print(f"  ❌ 리그 {lid} 처리 에러: {e}")
+
+    batch.report()
+    cur.close()
+    print(f"🎉 주요 스탯 {total}개 정리 완료.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시즌 기록 JSONB → 주요 스탯(sl_player_stat_values) 정리")
+    parser.add_argument("--backfill", action="store_true", help="기존 sl_player_season_stats 전체에서 채우기")
+    parser.add_argument("--league", type=int, default=None, help="이 리그(sl_leagues.id)만 처리")
+    parser.add_argument("--batch-size", type=int, default=db_batch.DEFAULT_BATCH_SIZE, help="다건 INSERT 1회당 행 수")
+    args = parser.parse_args()
+
+    if not args.backfill:
+        parser.error("--backfill 을 지정하세요. (수집 스크립트는 저장할 때 자동으로 채웁니다)")
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        backfill(conn, league_id=args.league, batch_size=args.batch_size)
+    finally:
+        conn.close()
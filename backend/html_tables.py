@@ -0,0 +1,51 @@
+from bs4 import BeautifulSoup
+
+# --- 페이지 표 일괄 파싱 ---
+# row.find_elements(By.TAG_NAME, "td") / cell.text 는 셀마다 WebDriver 왕복이 한 번씩 일어나
+# 30행 x 15열 표 하나에 수백 번의 호출이 생깁니다.
+# 여기서는 driver.page_source를 한 번만 받아 BeautifulSoup으로 (KLEAGUE_player.py와 같은 방식) 프로세스 안에서 파싱합니다.
+# 반환되는 셀은 bs4 Tag라서 기존 코드의 cols[i].text.strip() 은 그대로 동작합니다.
+
+# lxml이 설치되어 있으면 더 빠른 파서를 사용
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def snapshot(driver):
+    """현재 페이지 전체를 한 번의 호출로 가져와 파싱합니다."""
+    return BeautifulSoup(driver.page_source, PARSER)
+
+
+def table_rows(root, css, min_cols=0):
+    """css 선택자에 맞는 tr들의 td 목록 [[td, td, ...], ...] (min_cols 미만인 행은 제외)"""
+    rows = []
+    for tr in root.select(css):
+        cols = tr.find_all("td")
+        if len(cols) < min_cols: continue
+        rows.append(cols)
+    return rows
+
+
+def find_table(root, css="table", summary=None, keywords=()):
+    """
+    summary 속성에 summary가 포함되거나, 표 텍스트에 keywords가 모두 들어 있는 첫 표.
+    """
+    for tbl in root.select(css):
+        if summary and summary in (tbl.get("summary") or ""):
+            return tbl
+        if keywords:
+            text = tbl.get_text()
+            if all(k in text for k in keywords):
+                return tbl
+    return None
+
+
+def link_param(cell, name="playerId"):
+    """셀 안 첫 링크의 쿼리 파라미터 값 (예: ...?playerId=67001 -> 67001). 없으면 None"""
+    a = cell.find("a")
+    href = a.get("href", "") if a else ""
+    if f"{name}=" not in href: return None
+    return href.split(f"{name}=")[1].split("&")[0]
@@ -0,0 +1,93 @@
+# --- ID 조회 캐시 (sl_teams / sl_seasons / sl_leagues) ---
+# 스탯 행마다 SELECT id FROM sl_teams WHERE name LIKE ... 를 날리던 코드를 대신합니다.
+# 실행 시작 시 세 테이블을 한 번에 메모리로 읽고, 이후에는 캐시에서 찾습니다.
+# DB에는 캐시에 없는 값(INSERT)이나 실제로 바뀐 값(UPDATE)만 씁니다.
+
+
+class IdResolver:
+    def __init__(self, cur):
+        self.cur = cur
+        self.teams = {}         # id -> {"name", "logo_url"}
+        self.team_names = {}    # 검색어 -> id (LIKE 결과 메모)
+        self.seasons = {}       # (league_id, year) -> season id
+        self.leagues = {}       # slug -> league id
+        self.writes = 0
+        self.reload()
+
+    def reload(self):
+        self.cur.execute("SELECT id, name, logo_url FROM sl_teams ORDER BY id")
+        self.teams = {r[0]: {"name": r[1], "logo_url": r[2]} for r in self.cur.fetchall()}
+        self.cur.execute("SELECT id, league_id, year FROM sl_seasons")
+        self.seasons = {(r[1], r[2]): r[0] for r in self.cur.fetchall()}
+        self.cur.execute("SELECT id, slug FROM sl_leagues WHERE slug IS NOT NULL")
+        self.leagues = {r[1]: r[0] for r in self.cur.fetchall()}
+        self.team_names = {}
+
+    # ------------------------------------------------------------------
+    # 리그
+    # ------------------------------------------------------------------
+    def league_id(self, slug):
+        return self.leagues.get(slug)
+
+    def remember_league(self, slug, league_id):
+        self.leagues[slug] = league_id
+
+    # ------------------------------------------------------------------
+    # 시즌
+    # ------------------------------------------------------------------
+    def season_id(self, league_id, year, create=True, is_current=False):
+        """(league_id, year)의 시즌 ID. 없으면 create=True일 때 생성합니다."""
+        if not year: return None
+        key = (league_id, int(year))
+        if key in self.seasons:
+            return self.seasons[key]
+        if not create:
+            return None
+
+        self.cur.execute("""
+            INSERT INTO sl_seasons (league_id, year, is_current)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (league_id, year) DO UPDATE SET year = EXCLUDED.year
+            RETURNING id
+        """, (league_id, int(year), is_current))
+        self.writes += 1
+        self.seasons[key] = self.cur.fetchone()[0]
+        return self.seasons[key]
+
+    # ------------------------------------------------------------------
+    # 팀
+    # ------------------------------------------------------------------
+    def team_id_by_name(self, search_name):
+        """
+        sl_teams.name에 search_name이 포함된 첫 팀 (SQL의 name LIKE '%...%' LIMIT 1과 동일)
+        """
+        if not search_name: return None
+        if search_name not in self.team_names:
+            self.team_names[search_name] = next(
+                (tid for tid, t in self.teams.items() if search_name in t["name"]), None
+            )
+        return self.team_names[search_name]
+
+    def ensure_team(self, team_id, name, logo_url=None):
+        """
+        팀이 없으면 INSERT, 있으면 이름/로고가 바뀐 경우에만 UPDATE 합니다.
+        """
+        known = self.teams.get(team_id)
+        if known is None:
+            self.cur.execute("""
+                INSERT INTO sl_teams (id, name, logo_url, created_at, updated_at)
+                VALUES (%s, %s, %s, NOW(), NOW())
+                ON CONFLICT (id) DO NOTHING
+            """, (team_id, name, logo_url))
+            self.writes += 1
+            self.teams[team_id] = {"name": name, "logo_url": logo_url}
+            self.team_names = {}
+        elif logo_url and (known["logo_url"] != logo_url or known["name"] != name):
+            self.cur.execute(
+                "UPDATE sl_teams SET logo_url = %s, name = %s, updated_at = NOW() WHERE id = %s",
+                (logo_url, name, team_id),
+            )
+            self.writes += 1
+            known.update(name=name, logo_url=logo_url)
+            self.team_names = {}
+        return team_id
@@ -0,0 +1,162 @@
+import os
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+
+from html_tables import PARSER
+
+# --- koreabaseball.com 브라우저 없는 수집 ---
+# KBO 기록실 페이지는 ASP.NET WebForms라서 Selenium은 ddlSeason/ddlTeam 드롭다운과 페이징 링크만 조작합니다.
+# 이 모듈은 같은 동작을 HTTP로 재현합니다.
+#   - 페이지의 hidden 필드(__VIEWSTATE / __EVENTVALIDATION 등)와 드롭다운 값을 그대로 들고 있다가
+#   - __EVENTTARGET = 드롭다운 name (또는 __doPostBack 링크의 target) 으로 POST
+#   - 응답 HTML을 html_tables / 기존 parse_* 함수로 바로 파싱
+# 워커당 메모리가 Chrome 수백 MB → 수 MB 수준이라 훨씬 많은 동시 수집이 가능합니다.
+#
+# 모드 선택: KBO_FETCH_MODE=selenium(기본) | http, 또는 각 스크립트의 --mode 옵션
+
+FETCH_MODE = os.getenv("KBO_FETCH_MODE", "selenium")
+POOL_SIZE = int(os.getenv("KBO_HTTP_POOL_SIZE", "8"))
+TIMEOUT = float(os.getenv("KBO_HTTP_TIMEOUT", "20"))
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# javascript:__doPostBack('ctl00$...$btnNo2','')
+_POSTBACK_RE = re.compile(r"__doPostBack\('([^']*)','([^']*)'\)")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스 공용 Session (keep-alive 커넥션 풀, 5xx 재시도)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504), allowed_methods=None)
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE, max_retries=retry)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update({"User-Agent": USER_AGENT})
+                _session = s
+    return _session
+
+
+def get_soup(url, params=None):
+    """일반 GET 페이지 (예: 선수 상세 Total.aspx?playerId=...)"""
+    res = get_session().get(url, params=params, timeout=TIMEOUT)
+    res.raise_for_status()
+    return BeautifulSoup(res.text, PARSER)
+
+
+class AspNetForm:
+    """
+    ASP.NET WebForms 페이지 하나의 상태 (hidden 필드 + 입력/드롭다운 값).
+    load() 후 select()/click()으로 Selenium의 드롭다운 선택·링크 클릭과 같은 postback을 보냅니다.
+    """
+
+    def __init__(self, url, session=None):
+        self.url = url
+        self.session = session or get_session()
+        self.soup = None
+        self.fields = {}
+        self.postbacks = 0
+
+    def load(self):
+        res = self.session.get(self.url, timeout=TIMEOUT)
+        res.raise_for_status()
+        self._update(res)
+        return self.soup
+
+    def _update(self, res):
+        self.url = res.url
+        self.soup = BeautifulSoup(res.text, PARSER)
+        form = self.soup.find("form") or self.soup
+        fields = {}
+        for inp in form.find_all("input"):
+            name = inp.get("name")
+            kind = (inp.get("type") or "text").lower()
+            if not name or kind in ("submit", "button", "image", "file", "reset"): continue
+            if kind in ("checkbox", "radio") and not inp.has_attr("checked"): continue
+            fields[name] = inp.get("value", "")
+        for sel in form.find_all("select"):
+            name = sel.get("name")
+            if not name: continue
+            opt = sel.find("option", selected=True) or sel.find("option")
+            fields[name] = opt.get("value", opt.get_text(strip=True)) if opt else ""
+        self.fields = fields
+
+    def postback(self, target, argument=""):
+        data = dict(self.fields)
+        data["__EVENTTARGET"] = target
+        data["__EVENTARGUMENT"] = argument
+        res = self.session.post(self.url, data=data, timeout=TIMEOUT)
+        res.raise_for_status()
+        self.postbacks += 1
+        self._update(res)
+        return self.soup
+
+    def select(self, select_id, value):
+        """
+        id로 찾은 AutoPostBack 드롭다운의 값을 바꿉니다. (Select(...).select_by_value 와 동일)
+        이미 선택된 값이면 요청하지 않습니다.
+        """
+        sel = self.soup.find("select", id=select_id)
+        if sel is None:
+            raise LookupError(f"드롭다운 없음: {select_id}")
+        name = sel["name"]
+        if self.fields.get(name) == str(value):
+            return self.soup
+        self.fields[name] = str(value)
+        return self.postback(name)
+
+    def click(self, link):
+        """__doPostBack 링크(페이징 번호 등) 클릭"""
+        m = _POSTBACK_RE.search(link.get("href", ""))
+        if not m:
+            raise LookupError(f"postback 링크가 아닙니다: {link.get('href')}")
+        return self.postback(m.group(1), m.group(2))
+
+
+class HttpPool:
+    """
+    browser_pool.BrowserPool과 같은 사용법 (with ... as pool / pool.map(func, items)).
+    func에는 WebDriver 대신 이 모듈(kbo_http)이 전달됩니다.
+    """
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = max(1, size)
+
+    def __enter__(self):
+        get_session()
+        print(f"🌐 HTTP 모드 (브라우저 없음, 동시 {self.size}개)")
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def map(self, func, items):
+        client = sys.modules[__name__]
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            futures = {ex.submit(func, client, item): item for item in items}
+            for fut in as_completed(futures):
+                try:
+                    yield futures[fut], fut.result(), None
+                except Exception as e:
+                    yield futures[fut], None, e
+
+
+def make_pool(mode=None, **browser_kwargs):
+    """mode에 따라 BrowserPool(selenium) 또는 HttpPool(http)을 돌려줍니다."""
+    if (mode or FETCH_MODE) == "http":
+        return HttpPool()
+    from browser_pool import BrowserPool
+    return BrowserPool(**browser_kwargs)
@@ -0,0 +1,225 @@
+import json
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+
+import db_batch
+import hot_stats
+from hot_stats import parse_ip
+import html_tables
+import page_waits
+
+# --- KBO 기록실 리그 순위표 (연도 x 팀) 일괄 수집 ---
+# HitterBasic / PitcherBasic 순위표는 연도·팀을 고르면 그 팀 전 선수의 시즌 기록을 한 번에 보여줍니다.
+# 선수마다 Total.aspx / Basic1.aspx를 여는 대신 (선수 ~1000명 x 페이지 여러 개)
+# 연도 x 팀 x 페이지 수 만큼만 요청해서 sl_player_season_stats를 채웁니다.
+# Selenium(harvest_team)과 HTTP(harvest_team_http) 두 방식 모두 같은 parse 함수를 사용합니다.
+
+# KBO 팀 코드 매핑 (기록실 드롭다운 기준)
+# 두산, 롯데, 삼성, 키움, 한화, KIA, KT, LG, NC, SSG
+KBO_TEAMS = ['OB', 'LT', 'SS', 'WO', 'HH', 'HT', 'KT', 'LG', 'NC', 'SK']
+
+SEASON_SELECT_ID = "cphContents_cphContents_cphContents_ddlSeason_ddlSeason"
+TEAM_SELECT_ID = "cphContents_cphContents_cphContents_ddlTeam_ddlTeam"
+TABLE_BODY = ".tData01 tbody"
+
+# KBO 기록실 - 타자 / 투수 순위 페이지
+TABLE_URLS = {
+    "hitter": "https://www.koreabaseball.com/Record/Player/HitterBasic/Basic1.aspx",
+    "pitcher": "https://www.koreabaseball.com/Record/Player/PitcherBasic/Basic1.aspx",
+}
+
+
+def parse_by_header(soup, columns):
+    """
+    순위표 파싱: [(player_id, 팀 이름, {헤더: 값}), ...]
+    열 순서는 페이지마다 다르므로(타자 순위표에는 HR과 RBI 사이에 TB가 있음) 위치가 아니라 thead 헤더 이름으로 찾습니다.
+    """
+    headers = [th.get_text(strip=True) for th in soup.select(".tData01 thead th")]
+    index = {h: i for i, h in enumerate(headers)}
+
+    parsed = []
+    for cols in html_tables.table_rows(soup, ".tData01 tbody tr", min_cols=10):
+        # 선수명 & ID 추출
+        # <a href="/Record/Player/HitterDetail/Basic.aspx?playerId=67001">XX</a>
+        kbo_id = html_tables.link_param(cols[1])
+        if not kbo_id or not kbo_id.isdigit():
+            continue # ID 없으면 저장 불가 (합계/안내 행 등)
+
+        stats = {}
+        for key in columns:
+            i = index.get(key)
+            if i is None or i >= len(cols): continue
+            stats[key] = cols[i].text.strip()
+        parsed.append((int(kbo_id), cols[2].text.strip(), stats))
+    return parsed
+
+
+# 타자 순위표 헤더 -> stats 키 (선수별 통산 페이지와 같은 키, 페이지에 있는 것만 저장)
+# 헤더: 순위, 선수명, 팀명, AVG, G, PA, AB, R, H, 2B, 3B, HR, TB, RBI, SAC, SF
+HITTER_COLUMNS = ["AVG", "G", "PA", "AB", "R", "H", "2B", "3B", "HR", "TB", "RBI", "SAC", "SF",
+                  "SB", "CS", "BB", "IBB", "HBP", "SO", "GDP", "SLG", "OBP", "OPS"]
+
+def parse_hitter_table(soup):
+    """
+    타자 기록 표 파싱: [(player_id, 팀 이름, stats), ...]
+    """
+    return parse_by_header(soup, HITTER_COLUMNS)
+
+
+# 투수 순위표 헤더 -> stats 키 (열 순서가 바뀌어도 헤더 이름으로 찾음)
+PITCHER_COLUMNS = ["ERA", "G", "W", "L", "SV", "HLD", "WPCT", "IP", "H", "HR", "BB", "HBP", "SO", "R", "ER", "WHIP"]
+
+def parse_pitcher_table(soup):
+    """
+    투수 기록 표 파싱: [(player_id, 팀 이름, stats), ...]
+    헤더: 순위, 선수명, 팀명, ERA, G, W, L, SV, HLD, WPCT, IP, H, HR, BB, HBP, SO, R, ER, WHIP
+    """
+    parsed = parse_by_header(soup, PITCHER_COLUMNS)
+    for _, _, stats in parsed:
+        if "IP" in stats:
+            stats["IP"] = f"{parse_ip(stats['IP']):.1f}"
+    return parsed
+
+
+PARSERS = {"hitter": parse_hitter_table, "pitcher": parse_pitcher_table}
+
+
+def _has_page(soup, page):
+    return any(a.get_text(strip=True) == str(page) for a in soup.select(".paging a"))
+
+
+def harvest_team(driver, job):
+    """
+    브라우저 풀의 워커 스레드에서 실행: (종류, 연도, 팀) 순위표의 모든 페이지를 파싱합니다.
+    반환: [(player_id, 팀 이름, stats), ...]
+    """
+    kind, year, team_code = job
+    driver.get(TABLE_URLS[kind])
+    page_waits.wait_css(driver, f"#{SEASON_SELECT_ID}", f"{kind} 순위표 로딩")
+
+    # 연도 선택 (이미 선택된 값이면 postback이 일어나지 않으므로 건너뜀)
+    select_year = Select(driver.find_element(By.ID, SEASON_SELECT_ID))
+    if select_year.first_selected_option.get_attribute("value") != str(year):
+        page_waits.postback(driver, lambda: select_year.select_by_value(str(year)), TABLE_BODY, f"{kind} 연도 선택")
+
+    # 팀 선택 (기존 표가 새로 그려질 때까지 대기)
+    select_team = Select(driver.find_element(By.ID, TEAM_SELECT_ID))
+    if select_team.first_selected_option.get_attribute("value") != team_code:
+        page_waits.postback(driver, lambda: select_team.select_by_value(team_code), TABLE_BODY, f"{kind} 팀 선택")
+
+    # 테이블 데이터 파싱 (page_source 한 번으로 표 전체를 가져옴), 페이징이 있으면 다음 페이지로
+    rows = []
+    page = 1
+    while True:
+        soup = html_tables.snapshot(driver)
+        rows.extend(PARSERS[kind](soup))
+        if not _has_page(soup, page + 1): break
+        next_btn = driver.find_element(By.CLASS_NAME, "paging").find_element(By.LINK_TEXT, str(page + 1))
+        page_waits.postback(driver, lambda: driver.execute_script("arguments[0].click();", next_btn), TABLE_BODY, f"{kind} 페이지 이동")
+        page += 1
+    return rows
+
+
+def harvest_team_http(client, job):
+    """harvest_team의 브라우저 없는 버전: 같은 드롭다운/페이징 postback을 HTTP로 보냅니다."""
+    kind, year, team_code = job
+    form = client.AspNetForm(TABLE_URLS[kind])
+    form.load()
+    form.select(SEASON_SELECT_ID, year)
+    soup = form.select(TEAM_SELECT_ID, team_code)
+
+    rows = []
+    page = 1
+    while True:
+        rows.extend(PARSERS[kind](soup))
+        next_link = next((a for a in soup.select(".paging a") if a.get_text(strip=True) == str(page + 1)), None)
+        if next_link is None: break
+        soup = form.click(next_link)
+        page += 1
+    return rows
+
+
+def harvest(pool, kind, years, mode, teams=KBO_TEAMS, skip=()):
+    """
+    pool로 (연도 x 팀) 순위표를 동시에 수집합니다. 완료 순서대로 (연도, 팀 코드, rows, 에러)를 돌려줍니다.
+    skip: 건너뛸 (연도, 팀 코드) 목록
+    """
+    scrape = harvest_team_http if mode == "http" else harvest_team
+    jobs = [(kind, year, team_code) for year in years for team_code in teams if (year, team_code) not in skip]
+    for (_, year, team_code), rows, err in pool.map(scrape, jobs):
+        yield year, team_code, rows, err
+
+
+# ---------------------------------------------------------------------------
+# 저장 (KBO_batter_stats / KBO_pitcher_stats의 순위표 모드)
+# ---------------------------------------------------------------------------
+# 선수별 페이지에서 채운 세부 항목(IBB, NP 등)을 지우지 않도록 기존 stats에 병합
+SQL_SEASON_STATS_MERGE = """
+    INSERT INTO sl_player_season_stats 
+    (player_id, season_id, team_id, stats, updated_at)
+    VALUES %s
+    ON CONFLICT (player_id, season_id, team_id) 
+    DO UPDATE SET stats = sl_player_season_stats.stats || EXCLUDED.stats, updated_at = NOW()
+    WHERE sl_player_season_stats.stats IS DISTINCT FROM sl_player_season_stats.stats || EXCLUDED.stats
+    RETURNING 1;
+"""
+
+
+def history_players(cur, league_id, before_year):
+    """before_year 이전 시즌 기록이 이미 있는 선수 ID (통산 페이지를 다시 볼 필요 없는 선수)"""
+    cur.execute("""
+        SELECT DISTINCT s.player_id
+        FROM sl_player_season_stats s
+        JOIN sl_seasons se ON se.id = s.season_id
+        WHERE se.league_id = %s AND se.year < %s
+    """, (league_id, before_year))
+    return {r[0] for r in cur.fetchall()}
+
+
+def sync_from_tables(conn, cur, resolver, pool, kind, years, mode, players, normalize=None, league_id=200, journal=None):
+    """
+    순위표(연도 x 팀)를 수집해 players에 있는 선수의 시즌 기록을 저장합니다. (팀 단위 commit)
+    반환: 기록이 저장된 선수 ID 집합
+    """
+    batch = db_batch.UpsertBatch(
+        cur, SQL_SEASON_STATS_MERGE, "sl_player_season_stats",
+        template="(%s, %s, %s, %s, NOW())", key=lambda r: (r[0], r[1], r[2]),
+    )
+    hot = hot_stats.make_batch(cur)
+    harvested = set()
+    # 최근 실행에서 이미 저장한 (연도, 팀) 순위표는 건너뜀
+    skip = {(y, t) for y in years for t in KBO_TEAMS if journal and journal.is_fresh("kbo", t, None, y)}
+
+    for year, team_code, rows, err in harvest(pool, kind, years, mode, skip=skip):
+        if err:
+            print(f"  ❌ {year} {team_code} 순위표 수집 에러: {err}")
+            continue
+        saved = set()
+        try:
+            season_id = resolver.season_id(league_id, year)
+            for player_id, team_name, stats in rows:
+                # sl_players에 없는 선수는 FK 때문에 저장할 수 없음 (KBO_player.py가 먼저 채움)
+                if player_id not in players: continue
+                team_id = resolver.team_id_by_name(team_name)
+                if normalize:
+                    stats = normalize(stats)
+                batch.add((player_id, season_id, team_id, json.dumps(stats)))
+                hot_stats.add(hot, "baseball", player_id, season_id, team_id, stats)
+                saved.add(player_id)
+            batch.flush()
+            hot.flush()
+            conn.commit()
+            if journal: journal.done("kbo", team_code, None, year)
+            harvested |= saved
+            print(f"  ✅ {year} {team_code}: {len(saved)}명 시즌 기록 저장 ({len(rows)}행)")
+        except Exception as e:
+            conn.rollback()
+            batch.discard()
+            hot.discard()
+            resolver.reload()  # 롤백된 시즌 INSERT가 캐시에 남지 않도록
+            print(f"  ❌ {year} {team_code} 저장 에러: {e}")
+
+    batch.report()
+    hot.report()
+    return harvested
@@ -0,0 +1,241 @@
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import psycopg2
+
+# --- 리그 순위표 (sl_leaderboards) ---
+# 시즌 x 스탯마다 상위 TOP_N명을 미리 계산해 둡니다. 웹은 (시즌, 스탯) 기본 키로 한 번만 조회합니다.
+# 원본은 sl_player_stat_values(hot_stats.py)이고 idx_stat_values_rank 인덱스로 상위 N명만 읽습니다.
+#
+# 증분 갱신: 지난 갱신 이후 updated_at이 바뀐 (선수, 시즌, 스탯)만 읽어서
+#   - 이미 순위표에 있는 선수이거나
+#   - 새 값이 순위표 마지막 값(컷)보다 좋거나, 순위표가 아직 TOP_N명이 안 되는 경우
+# 에만 그 (시즌, 스탯) 순위표를 다시 계산합니다. 다시 계산해도 순위/값이 같은 행은 UPDATE 되지 않습니다.
+#
+#   python leaderboards.py          # 지난 갱신 이후 바뀐 것만
+#   python leaderboards.py --full   # 전체 다시 계산 (TOP_N을 바꾼 경우 등)
+
+# --- 환경 변수 로드 ---
+def load_env(path: Path) -> None:
+    if not path.exists(): return
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line: continue
+        key, value = line.split("=", 1)
+        os.environ.setdefault(key.strip(), value.strip())
+
+load_env(Path(__file__).with_name(".env"))
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "database": os.getenv("DB_NAME", "sportslab"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "rootpassword"),
+    "port": os.getenv("DB_PORT", "5432"),
+}
+
+STATE_PATH = Path(__file__).with_name(".sync_state") / "leaderboards.json"
+TOP_N = int(os.getenv("LEADERBOARD_TOP_N", "50"))
+# 지난 갱신 시각보다 조금 앞부터 다시 확인 (갱신 도중 커밋된 긴 트랜잭션의 행을 놓치지 않도록)
+LOOKBACK = timedelta(minutes=10)
+
+# 순위표를 만드는 스탯: order(값이 클수록/작을수록 위), qualify(규정 기준: 이 스탯이 최소값 이상인 선수만)
+BOARDS = {
+    "avg": {"order": "DESC", "qualify": ("ab", float(os.getenv("LEADERBOARD_MIN_AB", "100")))},
+    "hr": {"order": "DESC"},
+    "era": {"order": "ASC", "qualify": ("ip", float(os.getenv("LEADERBOARD_MIN_IP", "30")))},
+    "ip": {"order": "DESC"},
+    "goals": {"order": "DESC"},
+    "assists": {"order": "DESC"},
+    "pts": {"order": "DESC"},
+}
+
+SQL_REBUILD = """
+    WITH ranked AS (
+        SELECT v.season_id, v.stat_key,
+               row_number() OVER (ORDER BY v.value {order}, v.player_id) AS rank,
+               v.player_id, v.team_id, p.name AS player_name, t.name AS team_name, v.value
+        FROM (
+            SELECT v.player_id, v.season_id, v.team_id, v.stat_key, v.value
+            FROM sl_player_stat_values v
+            WHERE v.season_id = %(season_id)s AND v.stat_key = %(stat_key)s
+              AND (%(qualify_key)s::text IS NULL OR EXISTS (
+                  SELECT 1 FROM sl_player_stat_values q
+                  WHERE q.player_id = v.player_id AND q.season_id = v.season_id
+                    AND q.team_id IS NOT DISTINCT FROM v.team_id
+                    AND q.stat_key = %(qualify_key)s AND q.value >= %(qualify_min)s
+              ))
+            ORDER BY v.value {order}, v.player_id
+            LIMIT %(top_n)s
+        ) v
+        JOIN sl_players p ON p.id = v.player_id
+        LEFT JOIN sl_teams t ON t.id = v.team_id
+    ),
+    upserted AS (
+        INSERT INTO sl_leaderboards
+        (season_id, stat_key, rank, player_id, team_id, player_name, team_name, value, updated_at)
+        SELECT season_id, stat_key, rank, player_id, team_id, player_name, team_name, value, NOW()
+        FROM ranked
+        ON CONFLICT (season_id, stat_key, rank)
+        DO UPDATE SET player_id = EXCLUDED.player_id, team_id = EXCLUDED.team_id,
+                      player_name = EXCLUDED.player_name, team_name = EXCLUDED.team_name,
+                      value = EXCLUDED.value, updated_at = NOW()
+        WHERE (sl_leaderboards.player_id, sl_leaderboards.team_id, sl_leaderboards.player_name,
+               sl_leaderboards.team_name, sl_leaderboards.value)
+              IS DISTINCT FROM
+              (EXCLUDED.player_id, EXCLUDED.team_id, EXCLUDED.player_name, EXCLUDED.team_name, EXCLUDED.value)
+        RETURNING 1
+    ),
+    removed AS (
+        DELETE FROM sl_leaderboards b
+        WHERE b.season_id = %(season_id)s AND b.stat_key = %(stat_key)s
+          AND b.rank > (SELECT count(*) FROM ranked)
+        RETURNING 1
+    )
+    SELECT (SELECT count(*) FROM upserted), (SELECT count(*) FROM removed);
+"""
+
+# 바뀐 (선수, 시즌) → 영향받는 순위표와 그 순위표 스탯의 현재 값
+# (규정 스탯 ab/ip가 바뀌어도 avg/era 순위표에 들어가거나 빠질 수 있음)
+SQL_CHANGED = """
+    SELECT DISTINCT c.season_id, m.board, c.player_id, c.team_id, v.value
+    FROM sl_player_stat_values c
+    JOIN unnest(%s::text[], %s::text[]) AS m(stat_key, board) ON m.stat_key = c.stat_key
+    LEFT JOIN sl_player_stat_values v
+           ON v.player_id = c.player_id AND v.season_id = c.season_id
+          AND v.team_id IS NOT DISTINCT FROM c.team_id AND v.stat_key = m.board
+    WHERE c.updated_at >= %s
+"""
+
+
+def load_state():
+    try:
+        return json.loads(STATE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = STATE_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2), encoding="utf-8")
+    os.replace(tmp, STATE_PATH)
+
+
+def better(stat_key, value, cutoff):
+    """value가 순위표 컷 이상인지 (동률도 다시 계산)"""
+    if BOARDS[stat_key]["order"] == "ASC":
+        return value <= cutoff
+    return value >= cutoff
+
+
+def rebuild(cur, season_id, stat_key, top_n=TOP_N):
+    """(시즌, 스탯) 순위표 하나를 다시 계산합니다. 반환: (바뀐 순위 수, 지운 순위 수)"""
+    board = BOARDS[stat_key]
+    qualify_key, qualify_min = board.get("qualify", (None, None))
+    cur.execute(SQL_REBUILD.format(order=board["order"]), {
+        "season_id": season_id, "stat_key": stat_key, "top_n": top_n,
+        "qualify_key": qualify_key, "qualify_min": qualify_min,
+    })
+    return cur.fetchone()
+
+
+def all_boards(cur):
+    cur.execute("""
+        SELECT DISTINCT season_id, stat_key FROM sl_player_stat_values
+        WHERE stat_key = ANY(%s)
+    """, (list(BOARDS),))
+    return set(cur.fetchall())
+
+
+def changed_boards(cur, since, top_n=TOP_N):
+    """since 이후 바뀐 선수가 순위에 영향을 줄 수 있는 (시즌, 스탯) 목록"""
+    pairs = [(board, board) for board in BOARDS]
+    pairs += [(b["qualify"][0], board) for board, b in BOARDS.items() if "qualify" in b]
+    cur.execute(SQL_CHANGED, ([p[0] for p in pairs], [p[1] for p in pairs], since))
+    changed = {}
+    for season_id, board, player_id, team_id, value in cur.fetchall():
+        changed.setdefault((season_id, board), []).append((player_id, team_id, value))
+    if not changed: return set(), 0
+
+    # 영향받는 시즌의 현재 순위표 (시즌당 스탯 수 x TOP_N 행)
+    cur.execute("""
+        SELECT season_id, stat_key, rank, player_id, team_id, value FROM sl_leaderboards
+        WHERE season_id = ANY(%s)
+    """, (list({season_id for season_id, _ in changed}),))
+    current = {}
+    for season_id, stat_key, rank, player_id, team_id, value in cur.fetchall():
+        board = current.setdefault((season_id, stat_key), {"members": set(), "cutoff": None, "last": 0})
+        board["members"].add((player_id, team_id))
+        if rank > board["last"]:
+            board["last"], board["cutoff"] = rank, value
+
+    targets = set()
+    players = 0
+    for key, rows in changed.items():
+        players += len(rows)
+        board = current.get(key)
+        for player_id, team_id, value in rows:
+            if board is None or board["last"] < top_n or (player_id, team_id) in board["members"]:
+                targets.add(key)
+                break
+            if value is not None and better(key[1], value, board["cutoff"]):
+                targets.add(key)
+                break
+    return targets, players
+
+
+def refresh(conn, full=False, top_n=TOP_N):
+    """
+    순위표를 갱신합니다. (수집 스크립트 뒤에 실행, sync_master의 leaderboards 작업)
+    full이 아니면 지난 갱신 이후 바뀐 선수가 영향을 줄 수 있는 순위표만 다시 계산합니다.
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT NOW()")
+    started = cur.fetchone()[0]
+
+    state = load_state()
+    since = state.get("refreshed_at")
+    if full or not since:
+        targets, players = all_boards(cur), None
+        print(f"🏆 순위표 전체 계산: {len(targets)}개 (시즌 x 스탯)")
+    else:
+        since = datetime.fromisoformat(since) - LOOKBACK
+        targets, players = changed_boards(cur, since, top_n)
+        print(f"🏆 {since:%Y-%m-%d %H:%M} 이후 바뀐 선수 {players}명 → 다시 계산할 순위표 {len(targets)}개")
+
+    changed = removed = 0
+    failed = 0
+    for season_id, stat_key in sorted(targets):
+        try:
+            c, r = rebuild(cur, season_id, stat_key, top_n)
+            conn.commit()
+            changed += c
+            removed += r
+        except Exception as e:
+            conn.rollback()
+            failed += 1
+            print(f"  ❌ 시즌 {season_id} {stat_key} 순위표 에러: {e}")
+
+    # 실패한 순위표가 있으면 다음 실행에서 같은 구간을 다시 확인
+    if not failed:
+        state["refreshed_at"] = started.isoformat()
+        save_state(state)
+    cur.close()
+    print(f"✅ 순위표 갱신 완료: 바뀐 순위 {changed}행, 지운 순위 {removed}행, 에러 {failed}개")
+    return targets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="시즌 x 스탯 순위표(sl_leaderboards) 갱신")
+    parser.add_argument("--full", action="store_true", help="바뀐 것만이 아니라 전체 순위표를 다시 계산")
+    args = parser.parse_args()
+
+    conn = psycopg2.connect(**DB_CONFIG)
+    try:
+        refresh(conn, full=args.full)
+    finally:
+        conn.close()
@@ -0,0 +1,149 @@
+import os
+import json
+import time
+import threading
+from calendar import monthrange
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import db_batch
+
+# --- 네이버 스포츠 일정 API 시즌 단위 수집 ---
+# KBO_game.py / KLEAGUE_game.py 공용.
+# 월별 호출(sync_*_games(year, month))마다 DB 커넥션을 새로 열던 것을 대신해
+#   - 시즌의 모든 달을 하나의 HTTP Session으로 동시에 요청
+#   - gameId 기준으로 합쳐 중복 제거 (월 경계에 걸친 경기 등)
+#   - 시즌 전체를 한 트랜잭션에서 배치 upsert
+# since_last_run 모드에서는 DB에 아직 끝나지 않은 경기가 있는 달(또는 아직 한 번도 받지 않은 달)만 요청합니다.
+
+NAVER_URL = "https://api-gw.sports.naver.com/schedule/games"
+CONCURRENCY = int(os.getenv("NAVER_CONCURRENCY", "6"))
+TIMEOUT = float(os.getenv("NAVER_TIMEOUT", "20"))
+
+STATUS_MAP = { "종료": "STATUS_FINAL", "취소": "STATUS_CANCELLED", "예정": "STATUS_SCHEDULED", "경기중": "STATUS_IN_PROGRESS" }
+# 더 이상 바뀌지 않는 상태
+DONE_STATUSES = ("STATUS_FINAL", "STATUS_CANCELLED")
+
+# sl_games는 game_date 연도별 파티션이라 충돌 키가 (id, game_date)입니다.
+# 이미 저장된 경기는 저장된 game_date를 그대로 써서(일정 변경으로 날짜가 바뀌어도) 같은 행을 갱신합니다.
+# 다른 스크립트와 동시에 같은 경기를 저장하지 않도록 배치가 flush 전에 경기 id를 잠급니다. (db_batch.lock_ids)
+SQL_GAMES = """
+    INSERT INTO sl_games
+    (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
+    SELECT v.id, v.season_id, v.league_id, v.home_team_id, v.away_team_id,
+           COALESCE((SELECT g.game_date FROM sl_games g WHERE g.id = v.id LIMIT 1), v.game_date),
+           v.status, v.home_score, v.away_score, v.score_detail
+    FROM (VALUES %s) AS v (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
+    ON CONFLICT (id, game_date) DO UPDATE
+    SET status = EXCLUDED.status,
+        home_score = EXCLUDED.home_score,
+        away_score = EXCLUDED.away_score,
+        score_detail = EXCLUDED.score_detail
+    WHERE (sl_games.status, sl_games.home_score, sl_games.away_score, sl_games.score_detail)
+          IS DISTINCT FROM (EXCLUDED.status, EXCLUDED.home_score, EXCLUDED.away_score, EXCLUDED.score_detail)
+    RETURNING 1;
+"""
+
+# VALUES 목록이 SELECT를 거치므로 타입을 명시
+GAMES_TEMPLATE = "(%s::bigint, %s::int, %s::bigint, %s::bigint, %s::bigint, %s::timestamptz, %s::varchar, %s::int, %s::int, %s::jsonb)"
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """프로세스 공용 Session (keep-alive)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=2, pool_maxsize=max(CONCURRENCY, 2), max_retries=2)
+                s.mount("https://", adapter)
+                _session = s
+    return _session
+
+
+def fetch_month(upper_category, category, year, month):
+    """한 달치 경기 목록"""
+    params = {
+        "fields": "basic,status,team,score",
+        "upperCategoryId": upper_category,
+        "categoryId": category,
+        "fromDate": f"{year}-{month:02d}-01",
+        "toDate": f"{year}-{month:02d}-{monthrange(year, month)[1]:02d}",
+        "size": 300
+    }
+    res = get_session().get(NAVER_URL, params=params, timeout=TIMEOUT)
+    res.raise_for_status()
+    return res.json().get('result', {}).get('games', [])
+
+
+def fetch_season(upper_category, category, year, months, concurrency=CONCURRENCY):
+    """
+    여러 달을 동시에 요청해서 gameId 기준으로 합칩니다.
+    반환: (gameId -> 경기 dict, 실패한 달 목록)
+    """
+    games = {}
+    failed = []
+    fetched = 0
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(months) or 1))) as ex:
+        futures = {ex.submit(fetch_month, upper_category, category, year, m): m for m in months}
+        for fut in as_completed(futures):
+            month = futures[fut]
+            try:
+                month_games = fut.result()
+            except Exception as e:
+                print(f"  ❌ {year}년 {month}월 요청 실패: {e}")
+                failed.append(month)
+                continue
+            fetched += len(month_games)
+            for g in month_games:
+                if g.get('gameId'):
+                    games[g['gameId']] = g
+    print(f"  📡 {len(months)}개월 요청 ({time.monotonic() - start:.1f}s): {fetched}건 → 중복 제거 {len(games)}경기")
+    return games, sorted(failed)
+
+
+def parse_game(g):
+    """네이버 경기 dict → 저장에 필요한 값 (팀 ID 변환은 호출하는 쪽에서)"""
+    status_info = g.get('statusInfo', {})
+    status_origin = status_info.get('name', '') if isinstance(status_info, dict) else str(status_info)
+
+    home_score = g.get('homeTeamScore') or 0
+    away_score = g.get('awayTeamScore') or 0
+    if home_score == '': home_score = 0
+    if away_score == '': away_score = 0
+
+    return {
+        "game_id": g.get('gameId'),
+        "game_date": g.get('gameDateTime'),
+        "status": STATUS_MAP.get(status_origin, "STATUS_SCHEDULED"),
+        "home": (g.get('homeTeamCode'), g.get('homeTeamName'), g.get('homeTeamEmblemUrl')),
+        "away": (g.get('awayTeamCode'), g.get('awayTeamName'), g.get('awayTeamEmblemUrl')),
+        "home_score": home_score,
+        "away_score": away_score,
+        "score_detail": json.dumps(g.get('score', {})),
+    }
+
+
+def pending_months(cur, season_id, months):
+    """
+    since_last_run 모드: 끝나지 않은 경기가 남아 있거나, 아직 경기가 하나도 저장되지 않은 달만 돌려줍니다.
+    """
+    cur.execute("""
+        SELECT EXTRACT(MONTH FROM game_date AT TIME ZONE 'Asia/Seoul')::int AS m,
+               COUNT(*) FILTER (WHERE status IS NULL OR status NOT IN %s) AS pending
+        FROM sl_games
+        WHERE season_id = %s
+        GROUP BY m
+    """, (DONE_STATUSES, season_id))
+    stored = {r[0]: r[1] for r in cur.fetchall()}
+    return [m for m in months if m not in stored or stored[m] > 0]
+
+
+def make_batch(cur):
+    return db_batch.UpsertBatch(cur, SQL_GAMES, "sl_games", template=GAMES_TEMPLATE, key=lambda r: r[0], lock=lambda r: r[0])
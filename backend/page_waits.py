@@ -0,0 +1,112 @@
+import os
+import threading
+import time
+from collections import defaultdict
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, NoSuchElementException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# --- Selenium 대기 유틸 ---
+# time.sleep(1.5) 같은 고정 대기 대신, 기다리는 대상(표/행/페이징)이 실제로 준비되거나 바뀌는 순간 바로 진행합니다.
+#   - wait_css: 요소가 나타날 때까지
+#   - wait_ready: document.readyState == complete 까지
+#   - postback: 드롭다운 선택/페이지 클릭 후 기존 표가 stale 되거나 행 내용이 바뀔 때까지
+# 모든 대기 시간은 이름(label)별로 기록되고 print_stats()로 느린 페이지를 확인할 수 있습니다.
+# 최대 대기 시간은 SELENIUM_MAX_WAIT (초, 기본 15)로 조정합니다.
+
+MAX_WAIT = float(os.getenv("SELENIUM_MAX_WAIT", "15"))
+POLL = float(os.getenv("SELENIUM_WAIT_POLL", "0.1"))
+
+# tbody(또는 table)의 행 수 + 첫 행 텍스트를 한 번의 스크립트 호출로 읽음
+_SIGNATURE_JS = """
+var t = document.querySelector(arguments[0]);
+if (!t) return null;
+var rows = t.rows || t.querySelectorAll('tr');
+return rows.length + '|' + (rows.length ? rows[0].innerText : '');
+"""
+
+
+class WaitStats:
+    """대기 이름별 횟수 / 총·최대 대기 시간 / 타임아웃 수"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0, "timeouts": 0})
+
+    def record(self, label, elapsed, timed_out=False):
+        with self.lock:
+            s = self.data[label]
+            s["count"] += 1
+            s["total"] += elapsed
+            s["max"] = max(s["max"], elapsed)
+            if timed_out: s["timeouts"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {k: dict(v) for k, v in self.data.items()}
+
+
+stats = WaitStats()
+
+
+def _until(driver, condition, label, timeout=None):
+    start = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout or MAX_WAIT, poll_frequency=POLL).until(condition)
+    except TimeoutException:
+        stats.record(label, time.monotonic() - start, timed_out=True)
+        raise
+    stats.record(label, time.monotonic() - start)
+    return result
+
+
+def wait_css(driver, css, label, timeout=None):
+    """css 선택자 요소가 나타날 때까지 기다린 뒤 그 요소를 반환합니다."""
+    return _until(driver, EC.presence_of_element_located((By.CSS_SELECTOR, css)), label, timeout)
+
+
+def wait_ready(driver, label, timeout=None):
+    """페이지 로딩(document.readyState == complete)이 끝날 때까지 기다립니다."""
+    return _until(driver, lambda d: d.execute_script("return document.readyState") == "complete", label, timeout)
+
+
+def table_signature(driver, css):
+    return driver.execute_script(_SIGNATURE_JS, css)
+
+
+def postback(driver, action, css, label, timeout=None):
+    """
+    action()(드롭다운 선택, 페이지 링크 클릭 등)을 실행하고 css 표가 새로 그려질 때까지 기다립니다.
+    기존 표 요소가 stale 되거나(전체 postback / UpdatePanel 교체) 행 수·첫 행 내용이 바뀌면 완료입니다.
+    """
+    try:
+        old = driver.find_element(By.CSS_SELECTOR, css)
+        old_sig = table_signature(driver, css)
+    except NoSuchElementException:
+        old, old_sig = None, None
+
+    action()
+
+    def changed(d):
+        if old is not None:
+            try:
+                old.is_enabled()
+            except StaleElementReferenceException:
+                return d.find_elements(By.CSS_SELECTOR, css) or False
+        sig = table_signature(d, css)
+        return sig is not None and sig != old_sig
+
+    return _until(driver, changed, label, timeout)
+
+
+def print_stats():
+    """대기 이름별 요약 출력 (느린 순)"""
+    snap = stats.snapshot()
+    if not snap: return
+    print("\n⏱️ 페이지 대기 시간 통계")
+    for label, s in sorted(snap.items(), key=lambda kv: -kv[1]["total"]):
+        avg = s["total"] / s["count"] if s["count"] else 0
+        timeouts = f", 타임아웃 {s['timeouts']}" if s["timeouts"] else ""
+        print(f"  - {label}: {s['count']}회, 평균 {avg*1000:.0f}ms, 최대 {s['max']*1000:.0f}ms{timeouts}")
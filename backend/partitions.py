@@ -0,0 +1,268 @@
+import argparse
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import psycopg2
+from psycopg2 import sql
+
+# --- 경기 테이블 연도별 파티션 관리 ---
+# sl_games / sl_player_game_stats 는 game_date 기준 연도별 RANGE 파티션입니다. (DB/init.sql)
+#   - 파티션 이름: sl_games_p2025, sl_player_game_stats_p2025 (한국 시간 1월 1일 0시 ~ 다음 해 1월 1일 0시)
+#   - 연도 파티션이 없는 날짜의 행은 기본 파티션(*_default)에 저장됩니다.
+# 연도마다 테이블이 따로라서 VACUUM/인덱스 재작성은 그 연도 크기만큼만 걸리고,
+# 현재 시즌 화면 쿼리(game_date 조건)는 해당 연도 파티션만 읽습니다.
+#
+#   python partitions.py                                # 올해/내년 파티션 준비 + 기본 파티션에 쌓인 연도 분리 (sync_master 작업)
+#   python partitions.py --from 2015                    # 2015년부터 파티션 준비 (기존 DB 전환 시)
+#   python partitions.py --list                         # 파티션별 행 수/크기
+#   python partitions.py --archive-before 2020          # 2019년까지 분리해서 sl_archive 스키마로 이동
+#   python partitions.py --archive-before 2020 --drop   # 분리 후 삭제 (pg_dump로 백업한 뒤에)
+#   python partitions.py --restore 2019                 # 보관한 연도를 다시 붙임
+
+# --- 환경 변수 로드 ---
+def load_env(path: Path) -> None:
+    if not path.exists(): return
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line: continue
+        key, value = line.split("=", 1)
+        os.environ.setdefault(key.strip(), value.strip())
+
+load_env(Path(__file__).with_name(".env"))
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "database": os.getenv("DB_NAME", "sportslab"),
+    "user": os.getenv("DB_USER", "postgres"),
+    "password": os.getenv("DB_PASSWORD", "rootpassword"),
+    "port": os.getenv("DB_PORT", "5432"),
+}
+
+# 만들고 붙일 때의 순서 (FK 대상인 sl_games 먼저). 분리할 때는 역순.
+TABLES = ["sl_games", "sl_player_game_stats"]
+ARCHIVE_SCHEMA = os.getenv("PARTITION_ARCHIVE_SCHEMA", "sl_archive")
+# 이보다 이전 날짜(스텁 경기의 1970-01-01 등)는 연도 파티션을 만들지 않고 기본 파티션에 둠
+MIN_YEAR = int(os.getenv("PARTITION_MIN_YEAR", "2000"))
+
+
+def get_db_connection():
+    return psycopg2.connect(**DB_CONFIG)
+
+
+def partition_name(table, year):
+    return f"{table}_p{year}"
+
+
+def year_bounds(year):
+    """연도 파티션 범위 [시작, 끝) - 한국 시간 기준 (naver_schedule.pending_months와 같은 기준)"""
+    return f"{year}-01-01 00:00:00+09", f"{year + 1}-01-01 00:00:00+09"
+
+
+def is_partitioned(cur, table):
+    cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (f"public.{table}",))
+    row = cur.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def partition_years(cur, table):
+    """붙어 있는 연도 파티션 {연도: 파티션 이름}"""
+    cur.execute("""
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+    """, (f"public.{table}",))
+    years = {}
+    for (name,) in cur.fetchall():
+        m = re.fullmatch(rf"{table}_p(\d{{4}})", name)
+        if m:
+            years[int(m.group(1))] = name
+    return years
+
+
+def default_years(cur):
+    """기본 파티션에 행이 남아 있는 연도 (연도 파티션을 만들기 전에 들어온 경기)"""
+    cur.execute("""
+        SELECT DISTINCT EXTRACT(YEAR FROM game_date AT TIME ZONE 'Asia/Seoul')::int
+        FROM sl_games_default
+    """)
+    return {r[0] for r in cur.fetchall()}
+
+
+def create_year(cur, year):
+    """
+    연도 파티션을 만들고 기본 파티션에 있던 그 연도 행을 옮깁니다. (한 트랜잭션, commit은 호출하는 쪽에서)
+    기본 파티션에 같은 범위의 행이 있으면 CREATE TABLE ... PARTITION OF 가 실패하므로
+    빈 테이블을 만들어 행을 옮긴 뒤 ATTACH 합니다. (인덱스/FK는 ATTACH 시 부모에서 자동 생성)
+    옮기는 동안 수집 스크립트가 기본 파티션에 쓰지 못하도록 잠급니다. (commit까지 대기시킴)
+    """
+    start, end = year_bounds(year)
+    cur.execute(sql.SQL("LOCK TABLE {} IN SHARE ROW EXCLUSIVE MODE").format(
+        sql.SQL(", ").join(sql.Identifier(f"{table}_default") for table in TABLES)))
+    for table in TABLES:
+        cur.execute(sql.SQL("CREATE TABLE {} (LIKE {} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)").format(
+            sql.Identifier(partition_name(table, year)), sql.Identifier(table)))
+    # 지운 행을 그대로 옮김 (DELETE ... RETURNING). 기록을 먼저 옮겨야
+    # sl_games 삭제의 ON DELETE CASCADE가 기본 파티션의 기록을 지우지 않음
+    moved = {}
+    for table in reversed(TABLES):
+        cur.execute(sql.SQL("""
+            WITH moved AS (
+                DELETE FROM {} WHERE game_date >= %s AND game_date < %s RETURNING *
+            )
+            INSERT INTO {} SELECT * FROM moved
+        """).format(sql.Identifier(f"{table}_default"), sql.Identifier(partition_name(table, year))), (start, end))
+        moved[table] = cur.rowcount
+    for table in TABLES:
+        cur.execute(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(
+            sql.Identifier(table), sql.Identifier(partition_name(table, year))), (start, end))
+    return moved
+
+
+def drop_foreign_keys(cur, schema, name):
+    """분리한 테이블의 FK 제거 (보관 테이블이 sl_games/sl_teams 삭제나 다음 분리를 막지 않도록, 다시 붙이면 부모에서 복제됨)"""
+    cur.execute("""
+        SELECT conname FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f'
+    """, (f"{schema}.{name}",))
+    for (conname,) in cur.fetchall():
+        cur.execute(sql.SQL("ALTER TABLE {}.{} DROP CONSTRAINT {}").format(
+            sql.Identifier(schema), sql.Identifier(name), sql.Identifier(conname)))
+
+
+def archive_year(cur, year, drop=False):
+    """
+    연도 파티션을 분리해서 보관 스키마로 옮기거나(drop=False) 삭제합니다.
+    기본 파티션이 있으면 DETACH ... CONCURRENTLY를 쓸 수 없어 부모 테이블을 잠깐 잠급니다.
+    """
+    for table in reversed(TABLES):
+        name = partition_name(table, year)
+        cur.execute(sql.SQL("ALTER TABLE {} DETACH PARTITION {}").format(sql.Identifier(table), sql.Identifier(name)))
+        drop_foreign_keys(cur, "public", name)
+    for table in TABLES:
+        name = partition_name(table, year)
+        if drop:
+            cur.execute(sql.SQL("DROP TABLE {}").format(sql.Identifier(name)))
+        else:
+            cur.execute(sql.SQL("ALTER TABLE {} SET SCHEMA {}").format(sql.Identifier(name), sql.Identifier(ARCHIVE_SCHEMA)))
+
+
+def restore_year(cur, year):
+    """보관 스키마의 연도 파티션을 다시 붙입니다. (FK/파티션 범위는 ATTACH 시 다시 검사)"""
+    start, end = year_bounds(year)
+    for table in TABLES:
+        name = partition_name(table, year)
+        cur.execute(sql.SQL("ALTER TABLE {}.{} SET SCHEMA public").format(sql.Identifier(ARCHIVE_SCHEMA), sql.Identifier(name)))
+        cur.execute(sql.SQL("ALTER TABLE {} ATTACH PARTITION {} FOR VALUES FROM (%s) TO (%s)").format(
+            sql.Identifier(table), sql.Identifier(name)), (start, end))
+
+
+def ensure(conn, from_year=None):
+    """올해/내년(+ from_year부터, + 기본 파티션에 쌓인 연도) 파티션을 준비합니다. 연도마다 commit."""
+    cur = conn.cursor()
+    this_year = datetime.now().year
+    years = {this_year, this_year + 1} | {y for y in default_years(cur) if y >= MIN_YEAR}
+    if from_year:
+        years |= set(range(from_year, this_year + 1))
+    missing = sorted(years - set(partition_years(cur, "sl_games")))
+    conn.rollback()
+
+    for year in missing:
+        moved = create_year(cur, year)
+        conn.commit()
+        print(f"  ✅ {year}년 파티션 생성 (기본 파티션에서 옮긴 행: 경기 {moved['sl_games']}, 기록 {moved['sl_player_game_stats']})")
+    if not missing:
+        print("✨ 연도 파티션이 모두 준비되어 있습니다.")
+    cur.close()
+    return len(missing)
+
+
+def archive(conn, before_year, drop=False):
+    """before_year 이전 연도 파티션을 분리합니다. 연도마다 commit."""
+    cur = conn.cursor()
+    years = sorted(y for y in partition_years(cur, "sl_games") if y < before_year)
+    if not drop:
+        cur.execute(sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(ARCHIVE_SCHEMA)))
+    conn.commit()
+
+    for year in years:
+        archive_year(cur, year, drop)
+        conn.commit()
+        if drop:
+            print(f"  🗑️ {year}년 파티션 삭제")
+        else:
+            print(f"  📦 {year}년 파티션 → {ARCHIVE_SCHEMA} "
+                  f"(백업: pg_dump -t {ARCHIVE_SCHEMA}.sl_games_p{year} -t {ARCHIVE_SCHEMA}.sl_player_game_stats_p{year})")
+    if not years:
+        print(f"✨ {before_year}년 이전 파티션이 없습니다.")
+    cur.close()
+    return len(years)
+
+
+def list_partitions(conn):
+    cur = conn.cursor()
+    for table in TABLES:
+        cur.execute("""
+            SELECT n.nspname, c.relname, GREATEST(c.reltuples, 0)::bigint, pg_total_relation_size(c.oid)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relkind = 'r'
+              AND ((n.nspname = 'public' AND c.oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass))
+                   OR (n.nspname = %s AND c.relname LIKE %s))
+            ORDER BY n.nspname DESC, c.relname
+        """, (f"public.{table}", ARCHIVE_SCHEMA, f"{table}\\_p%"))
+        print(f"📊 {table}")
+        for schema, name, rows, size in cur.fetchall():
+            label = name if schema == "public" else f"{schema}.{name} (보관)"
+            print(f"    {label:<48}{rows:>14,}행 {size / 1024 / 1024:>10.1f} MB")
+    conn.rollback()
+    cur.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="sl_games / sl_player_game_stats 연도별 파티션 관리")
+    parser.add_argument("--from", dest="from_year", type=int, default=None, help="이 연도부터 파티션 준비 (기본: 올해/내년)")
+    parser.add_argument("--list", action="store_true", help="파티션별 행 수/크기 출력")
+    parser.add_argument("--archive-before", type=int, default=None, metavar="YEAR", help="이 연도 이전 파티션을 분리해서 보관")
+    parser.add_argument("--drop", action="store_true", help="--archive-before 시 보관하지 않고 삭제")
+    parser.add_argument("--restore", type=int, default=None, metavar="YEAR", help="보관한 연도 파티션을 다시 붙임")
+    args = parser.parse_args()
+
+    if args.archive_before is not None and args.archive_before > datetime.now().year:
+        print("❌ 올해 이후 파티션은 분리할 수 없습니다. (현재 시즌 화면이 비게 됨)")
+        sys.exit(1)
+
+    conn = get_db_connection()
+    try:
+        cur = conn.cursor()
+        partitioned = is_partitioned(cur, "sl_games")
+        cur.close()
+        conn.rollback()
+        if not partitioned:
+            print("❌ sl_games가 파티션 테이블이 아닙니다. DB/readme_sql.md의 '기존 DB를 연도별 파티션으로 전환'을 먼저 적용하세요.")
+            sys.exit(1)
+
+        if args.list:
+            list_partitions(conn)
+        elif args.restore is not None:
+            restore_year(conn.cursor(), args.restore)
+            conn.commit()
+            print(f"✅ {args.restore}년 파티션을 다시 붙였습니다.")
+        elif args.archive_before is not None:
+            archive(conn, args.archive_before, args.drop)
+        else:
+            print("🗂️ 연도별 파티션 준비...")
+            ensure(conn, args.from_year)
+    except psycopg2.Error as e:
+        conn.rollback()
+        print(f"❌ 에러: {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
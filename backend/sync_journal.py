@@ -0,0 +1,127 @@
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# --- 동기화 진행 기록 (체크포인트 저널) ---
+# 오래 걸리는 수집(espn_player_season_stats, KBO_batter_stats 등)이 중간에 죽으면 다음 실행은 처음부터 다시 시작했습니다.
+# 이 모듈은 (league, team, player, year) 단위로 "어느 실행에서 언제 끝났는지"를 로컬 SQLite 파일에 남깁니다.
+#   - 다음 실행은 FRESH_HOURS(기본 24시간) 안에 끝난 단위를 건너뛰고 남은 곳부터 이어서 수집
+#   - DB 커밋이 끝난 단위만 기록 (pending → commit_pending) 하므로 롤백된 작업은 다시 수집됨
+#   - --restart 로 저널을 무시하고 전체를 다시 수집
+# 파일: backend/.sync_state/sync_journal.db (SYNC_JOURNAL_PATH로 변경)
+
+JOURNAL_PATH = Path(os.getenv("SYNC_JOURNAL_PATH", Path(__file__).with_name(".sync_state") / "sync_journal.db"))
+FRESH_HOURS = float(os.getenv("SYNC_FRESH_HOURS", "24"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job         TEXT NOT NULL,
+    started_at  REAL NOT NULL,
+    finished_at REAL,
+    status      TEXT NOT NULL DEFAULT 'running',
+    units_done  INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS units (
+    job         TEXT NOT NULL,
+    unit        TEXT NOT NULL,
+    run_id      INTEGER NOT NULL,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (job, unit)
+);
+"""
+
+
+def unit_key(league=None, team=None, player=None, year=None):
+    """(league, team, player, year) → 'eng.1/359/*/2024' (해당 없는 자리는 *)"""
+    return "/".join("*" if v is None else str(v) for v in (league, team, player, year))
+
+
+class SyncJournal:
+    """
+    with SyncJournal("espn_player_season_stats") as journal:
+        if journal.is_fresh(league, team, player, year): continue
+        ...
+        journal.pending(league, team, player, year)
+        conn.commit(); journal.commit_pending()
+    """
+
+    def __init__(self, job, fresh_hours=FRESH_HOURS, restart=False, path=JOURNAL_PATH):
+        self.job = job
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        # 여러 프로세스(espn_shards 워커)가 같은 파일에 쓰므로 잠금 대기 시간을 둠
+        self.db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.db.executescript(_SCHEMA)
+        self.run_id = self.db.execute(
+            "INSERT INTO runs (job, started_at) VALUES (?, ?)", (job, time.time())
+        ).lastrowid
+        self.db.commit()
+
+        # 신선한 단위는 시작할 때 한 번에 읽어 둠
+        self.fresh = set()
+        if not restart and fresh_hours > 0:
+            since = time.time() - fresh_hours * 3600
+            self.fresh = {r[0] for r in self.db.execute(
+                "SELECT unit FROM units WHERE job = ? AND finished_at >= ?", (job, since)
+            )}
+        self._pending = set()
+        self.done_count = 0
+        self.skipped = 0
+        if self.fresh:
+            print(f"📒 [{job}] 최근 {fresh_hours:g}시간 안에 끝난 {len(self.fresh)}개 단위는 건너뜁니다. (--restart 로 무시)")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close("failed" if exc_type else "done")
+
+    def is_fresh(self, *parts):
+        if unit_key(*parts) in self.fresh:
+            self.skipped += 1
+            return True
+        return False
+
+    def pending(self, *parts):
+        """아직 커밋되지 않은 단위 (commit_pending 때 완료로 기록)"""
+        with self.lock:
+            self._pending.add(unit_key(*parts))
+
+    def discard_pending(self):
+        with self.lock:
+            self._pending.clear()
+
+    def commit_pending(self):
+        """DB 커밋이 끝난 뒤 호출: 대기 중인 단위를 모두 완료로 기록합니다."""
+        with self.lock:
+            units, self._pending = self._pending, set()
+            self._record(units)
+
+    def done(self, *parts):
+        """곧바로 완료로 기록 (이미 커밋된 단위)"""
+        with self.lock:
+            self._record({unit_key(*parts)})
+
+    def _record(self, units):
+        if not units: return
+        now = time.time()
+        self.db.executemany(
+            "INSERT OR REPLACE INTO units (job, unit, run_id, finished_at) VALUES (?, ?, ?, ?)",
+            [(self.job, u, self.run_id, now) for u in units],
+        )
+        self.db.commit()
+        self.done_count += len(units)
+
+    def close(self, status="done"):
+        with self.lock:
+            self.db.execute(
+                "UPDATE runs SET finished_at = ?, status = ?, units_done = ? WHERE id = ?",
+                (time.time(), status, self.done_count, self.run_id),
+            )
+            self.db.commit()
+            self.db.close()
+        print(f"📒 [{self.job}] 실행 #{self.run_id} {status}: 완료 {self.done_count}개 단위, 건너뜀 {self.skipped}개")
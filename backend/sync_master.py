@@ -1,66 +1,206 @@
+import argparse
 import subprocess
 import sys
 import time
 import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
-def run_script(script_name):
-    print(f"\n" + "="*60)
-    print(f"🚀 Running: {script_name}")
-    print("="*60)
-    
-    start_time = time.time()
+# --- 스케줄러 설정 ---
+# 동시에 실행할 스크립트 수 (DB/외부 API 부하를 고려해 너무 크게 잡지 말 것)
+MAX_WORKERS = int(os.getenv("SYNC_MAX_WORKERS", "4"))
+# 실패 시 재시도 횟수 (0이면 재시도 없음)
+MAX_RETRIES = int(os.getenv("SYNC_RETRIES", "1"))
+RETRY_DELAY = float(os.getenv("SYNC_RETRY_DELAY", "10"))
+# 수집이 끝나면 프론트엔드 API 캐시를 비우도록 알림 (예: http://localhost:3000/api/revalidate, 비우면 알리지 않음)
+REVALIDATE_URL = os.getenv("SYNC_REVALIDATE_URL", "")
+REVALIDATE_TOKEN = os.getenv("SYNC_REVALIDATE_TOKEN", "")
+
+# --- 작업(Job) 목록 ---
+# needs: 먼저 성공해야 하는 작업 이름들. 서로 의존하지 않는 작업은 동시에 실행됩니다.
+# group: core(기초/경기) / squad(선수단) / detail(상세, 느림 - --details 옵션으로만 실행)
+JOBS = {
+    # 1. 기초 정보 및 경기 결과 (빠름)
+    "partitions":       {"script": "partitions.py", "needs": [], "group": "core"},                  # 경기 테이블 올해/내년 연도 파티션 준비 (경기 수집보다 먼저)
+    "espn_league_list": {"script": "espn_league_list.py", "needs": [], "group": "core"},            # 리그 정보 (ID mapping 등)
+    "update_results":   {"script": "update_results.py", "needs": ["espn_league_list", "partitions"], "group": "core"},  # ESPN 주요 리그 결과
+    "KBO_game":         {"script": "KBO_game.py", "needs": ["partitions"], "group": "core"},      # KBO 경기 결과 (Naver)
+    "KLEAGUE_game":     {"script": "KLEAGUE_game.py", "needs": ["partitions"], "group": "core"},  # K-League 경기 결과 (Naver)
+
+    # 2. 선수 및 스쿼드 정보 (상대적으로 느림)
+    "espn_player_squads": {"script": "espn_player_squads.py", "needs": ["espn_league_list"], "group": "squad"},
+    "KBO_player":         {"script": "KBO_player.py", "needs": ["KBO_game"], "group": "squad"},     # 리그/시즌(KBO_game) 필요
+    "KLEAGUE_player":     {"script": "KLEAGUE_player.py", "needs": [], "group": "squad"},
+
+    # 3. 상세 정보 (매우 느림 - 필요시 활성화)
+    "espn_player_game_stats": {"script": "espn_player_game_stats.py", "needs": ["update_results", "espn_player_squads"], "group": "detail"},
+    "KBO_batter_stats":       {"script": "KBO_batter_stats.py", "needs": ["KBO_player"], "group": "detail"},
+    "KBO_pitcher_stats":      {"script": "KBO_pitcher_stats.py", "needs": ["KBO_player"], "group": "detail"},
+
+    # 4. 순위표 (시즌 기록 수집이 끝난 뒤 바뀐 순위표만 다시 계산, 빠름)
+    "leaderboards": {"script": "leaderboards.py", "needs": ["KLEAGUE_player", "KBO_batter_stats", "KBO_pitcher_stats"], "group": "squad"},
+}
+
+_print_lock = threading.Lock()
+
+def log(msg):
+    # 여러 작업이 동시에 출력하므로 줄 단위로 잠금
+    with _print_lock:
+        print(msg, flush=True)
+
+def run_script(name, script_name):
+    """
+    스크립트 하나를 실행하고 (성공 여부, 종료 코드)를 반환합니다.
+    출력은 [작업명] 접두어를 붙여 줄 단위로 그대로 흘려보냅니다.
+    """
     try:
         # 윈도우 환경을 고려하여 python 대신 sys.executable 사용
-        result = subprocess.run([sys.executable, script_name], capture_output=False, text=True)
-        
-        duration = time.time() - start_time
-        if result.returncode == 0:
-            print(f"✅ Finished: {script_name} ({duration:.1f}s)")
-        else:
-            print(f"❌ Failed: {script_name} with exit code {result.returncode}")
+        proc = subprocess.Popen(
+            [sys.executable, "-u", script_name],
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace",
+        )
+        for line in proc.stdout:
+            log(f"[{name}] {line.rstrip()}")
+        proc.wait()
+        return proc.returncode == 0, proc.returncode
+    except Exception as e:
+        log(f"💥 Exception while running {script_name}: {e}")
+        return False, None
+
+def run_job(name, job):
+    """재시도를 포함해 작업 하나를 실행하고 결과 dict를 반환합니다."""
+    start_time = time.time()
+    attempts = 0
+    ok, code = False, None
+
+    while attempts <= MAX_RETRIES:
+        attempts += 1
+        log(f"🚀 Running: {job['script']} (attempt {attempts})")
+        ok, code = run_script(name, job["script"])
+        if ok: break
+        if attempts <= MAX_RETRIES:
+            log(f"🔁 Retry: {job['script']} (exit code {code}) - {RETRY_DELAY:.0f}s 후 재시도")
+            time.sleep(RETRY_DELAY)
+
+    duration = time.time() - start_time
+    if ok:
+        log(f"✅ Finished: {job['script']} ({duration:.1f}s)")
+    else:
+        log(f"❌ Failed: {job['script']} with exit code {code}")
+
+    return {"status": "ok" if ok else "failed", "duration": duration, "attempts": attempts, "code": code}
+
+def select_jobs(groups, only=None):
+    """실행할 작업만 골라냅니다. 선택되지 않은 의존 작업은 이미 완료된 것으로 간주합니다."""
+    selected = {n: j for n, j in JOBS.items() if j["group"] in groups}
+    if only:
+        unknown = [n for n in only if n not in JOBS]
+        if unknown:
+            raise SystemExit(f"❌ 알 수 없는 작업: {', '.join(unknown)}")
+        selected = {n: JOBS[n] for n in only}
+    return selected
+
+def check_cycles(jobs):
+    """의존성 순환이 있으면 실행 전에 중단합니다."""
+    visiting, done = set(), set()
+
+    def visit(name, path):
+        if name in done or name not in jobs: return
+        if name in visiting:
+            raise SystemExit(f"❌ 의존성 순환 발견: {' -> '.join(path + [name])}")
+        visiting.add(name)
+        for dep in jobs[name]["needs"]:
+            visit(dep, path + [name])
+        visiting.discard(name)
+        done.add(name)
+
+    for name in jobs:
+        visit(name, [])
+
+def run_dag(jobs, max_workers=MAX_WORKERS):
+    """
+    의존성 그래프 순서대로 작업을 실행합니다.
+    needs가 모두 성공한 작업부터 워커 풀에 투입되고, 실패한 작업의 후속 작업은 건너뜁니다.
+    """
+    check_cycles(jobs)
+    results = {}
+    pending = dict(jobs)
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            for name, job in list(pending.items()):
+                deps = [d for d in job["needs"] if d in jobs]
+                if any(results.get(d, {}).get("status") in ("failed", "skipped") for d in deps):
+                    log(f"⏭️ Skipped: {job['script']} (선행 작업 실패)")
+                    results[name] = {"status": "skipped", "duration": 0.0, "attempts": 0, "code": None}
+                    del pending[name]
+                elif all(results.get(d, {}).get("status") == "ok" for d in deps):
+                    running[pool.submit(run_job, name, job)] = name
+                    del pending[name]
+
+            if not running:
+                # 남은 작업이 있는데 실행 가능한 것이 없으면 진행 불가
+                for name in pending:
+                    results[name] = {"status": "skipped", "duration": 0.0, "attempts": 0, "code": None}
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                results[running.pop(fut)] = fut.result()
+
+    return results
+
+def print_summary(results, wall_time):
+    print("\n" + "="*60)
+    print("📋 Sync Summary")
+    print("="*60)
+    serial_time = 0.0
+    for name, r in results.items():
+        icon = {"ok": "✅", "failed": "❌", "skipped": "⏭️"}[r["status"]]
+        serial_time += r["duration"]
+        print(f"  {icon} {name:<24} {r['status']:<8} {r['duration']:>8.1f}s  (attempts: {r['attempts']})")
+    print("-"*60)
+    print(f"  ⏱️ Wall time: {wall_time:.1f}s / 순차 실행 시 예상: {serial_time:.1f}s")
+
+def notify_frontend():
+    """프론트엔드(/api/revalidate)에 수집 완료를 알려 선수 목록 등 API 캐시를 비웁니다."""
+    if not REVALIDATE_URL: return
+    req = urllib.request.Request(REVALIDATE_URL, data=b"", method="POST", headers={"x-sync-token": REVALIDATE_TOKEN})
+    try:
+        with urllib.request.urlopen(req, timeout=10) as res:
+            print(f"🔄 프론트엔드 캐시 갱신 요청: {res.status}")
     except Exception as e:
-        print(f"💥 Exception while running {script_name}: {e}")
+        # 알림이 실패해도 캐시는 TTL이 지나면 만료되므로 수집 결과에는 영향 없음
+        print(f"⚠️ 프론트엔드 캐시 갱신 요청 실패: {e}")
 
 def main():
+    parser = argparse.ArgumentParser(description="SportsLab Data Sync Master")
+    parser.add_argument("--details", action="store_true", help="상세 스탯(매우 느림) 작업까지 실행")
+    parser.add_argument("--only", nargs="+", metavar="JOB", help="지정한 작업만 실행 (예: --only KBO_game KBO_player)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS, help="동시에 실행할 작업 수")
+    args = parser.parse_args()
+
     print("🏁 SportsLab Data Sync Master")
     print(f"Current Directory: {os.getcwd()}")
-    
-    # 순차적으로 실행할 스크립트 목록
-    # 1. 기초 정보 및 경기 결과 (빠름)
-    core_scripts = [
-        "espn_league_list.py",   # 리그 정보 (ID mapping 등)
-        "update_results.py",     # ESPN 주요 리그 결과 (MLB, NBA, EPL 등)
-        "KBO_game.py",           # KBO 경기 결과 (Naver)
-        "KLEAGUE_game.py"        # K-League 경기 결과 (Naver)
-    ]
-    
-    # 2. 선수 및 스쿼드 정보 (상대적으로 느림)
-    squad_scripts = [
-        "espn_player_squads.py", # ESPN 주요 리그 스쿼드
-        "KBO_player.py",         # KBO 선수 정보 및 스쿼드 (Selenium)
-        "KLEAGUE_player.py"      # K-League 선수 정보 (Lineup Harvesting)
-    ]
-    
-    # 3. 상세 정보 (매우 느림 - 필요시 활성화)
-    detail_scripts = [
-        # "KBO_batter_stats.py", # KBO 타자 상세
-        # "KBO_pitcher_stats.py" # KBO 투수 상세
-    ]
 
-    print("\n--- Phase 1: Core Data (Leagues & Games) ---")
-    for script in core_scripts:
-        run_script(script)
+    groups = {"core", "squad"} | ({"detail"} if args.details else set())
+    jobs = select_jobs(groups, args.only)
+    print(f"📦 {len(jobs)}개 작업 / 동시 실행 {args.workers}개 / 재시도 {MAX_RETRIES}회")
 
-    print("\n--- Phase 2: Squad Data (Players & Rosters) ---")
-    for script in squad_scripts:
-        run_script(script)
-
-    # print("\n--- Phase 3: Detailed Stats (Optional) ---")
-    # for script in detail_scripts:
-    #     run_script(script)
+    start_time = time.time()
+    results = run_dag(jobs, max_workers=args.workers)
+    print_summary(results, time.time() - start_time)
+    if any(r["status"] == "ok" for r in results.values()):
+        notify_frontend()
 
     print("\n" + "="*60)
-    print("🎉 All synchronization tasks completed!")
+    if all(r["status"] == "ok" for r in results.values()):
+        print("🎉 All synchronization tasks completed!")
+    else:
+        print("⚠️ Some synchronization tasks failed.")
     print("="*60)
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
 import os
-import requests
+import espn_client
+import db_batch
 import psycopg2
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 # --- 환경 설정 ---
@@ -38,56 +39,149 @@ TARGET_LEAGUES = [
     ("soccer", "kor.1", "k-league"),
 ]
 
+SQL_LEAGUE = """
+    INSERT INTO sl_leagues (id, name, slug, sport_id)
+    VALUES (%s, %s, %s, (SELECT id FROM sl_sports WHERE name=%s LIMIT 1))
+    ON CONFLICT (id) DO UPDATE 
+    SET name = EXCLUDED.name, slug = EXCLUDED.slug;
+"""
+
+SQL_TEAM = """
+    INSERT INTO sl_teams (id, name, code, logo_url)
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT (id) DO UPDATE
+    SET name = EXCLUDED.name, code = EXCLUDED.code, logo_url = EXCLUDED.logo_url;
+"""
+
+# sl_games는 game_date 연도별 파티션 (충돌 키 (id, game_date), 저장된 경기는 저장된 날짜 유지 - espn_games.SQL_GAMES 참고)
+SQL_GAME = """
+    INSERT INTO sl_games
+    (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
+    SELECT v.id, v.season_id, v.league_id, v.home_team_id, v.away_team_id,
+           COALESCE((SELECT g.game_date FROM sl_games g WHERE g.id = v.id LIMIT 1), v.game_date),
+           v.status, v.home_score, v.away_score, v.score_detail
+    FROM (VALUES (%s::bigint, %s::int, %s::bigint, %s::bigint, %s::bigint, %s::timestamptz, %s::varchar, %s::int, %s::int, %s::jsonb))
+         AS v (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
+    ON CONFLICT (id, game_date) DO UPDATE
+    SET status = EXCLUDED.status,
+        home_score = EXCLUDED.home_score,
+        away_score = EXCLUDED.away_score,
+        score_detail = EXCLUDED.score_detail
+    WHERE (sl_games.status, sl_games.home_score, sl_games.away_score, sl_games.score_detail)
+          IS DISTINCT FROM (EXCLUDED.status, EXCLUDED.home_score, EXCLUDED.away_score, EXCLUDED.score_detail);
+"""
+
 def get_db_connection():
     return psycopg2.connect(**DB_CONFIG)
 
+def fetch_scoreboard(sport, espn_key):
+    # Scoreboard API: 최근/현재 경기 정보 조회
+    url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{espn_key}/scoreboard"
+    # dates 파라미터 없이 호출하면 '현재' 윈도우(오늘/어제/내일 등)를 반환함
+    res = espn_client.get(url)
+    res.raise_for_status()
+    return res.json()
+
+def sync_league(cur, sport, frontend_slug, data):
+    """
+    scoreboard 응답의 리그/시즌 정보를 저장하고 (league_id, season_db_id)를 돌려줍니다.
+    리그 정보가 없으면 IndexError/KeyError
+    """
+    l_data = data['leagues'][0]
+    league_id = int(l_data['id'])
+    league_name = l_data['name']
+
+    # Frontend slug로 저장하여 매핑 유지
+    # sport 이름을 sl_sports 테이블의 name과 매칭 (대소문자 주의 필요시 수정)
+    # 여기서는 sport 변수("baseball") -> DB("Baseball") 매핑을 위해 title() 사용 등 고려
+    # 기존 DB sport name이 "Baseball", "Soccer" 등일 수 있음.
+    # safe matching: lowercase check
+    cur.execute(SQL_LEAGUE, (league_id, league_name, frontend_slug, sport.title() if sport != 'mma' else 'MMA'))
+
+    # 시즌 정보 파싱
+    season_year = l_data.get('season', {}).get('year')
+    season_db_id = None
+    if season_year:
+        cur.execute("SELECT id FROM sl_seasons WHERE league_id=%s AND year=%s", (league_id, season_year))
+        row = cur.fetchone()
+        if row:
+            season_db_id = row[0]
+        else:
+            cur.execute("""
+                INSERT INTO sl_seasons (league_id, year, is_current)
+                VALUES (%s, %s, true) RETURNING id
+            """, (league_id, season_year))
+            season_db_id = cur.fetchone()[0]
+    return league_id, season_db_id
+
+def parse_scoreboard_event(event):
+    """
+    scoreboard event -> 저장용 dict (파싱할 수 없는 경기는 None)
+      state: ESPN status.type.state ('pre' / 'in' / 'post')
+      teams: [(id, name, code, logo), ...]
+    """
+    game_id = int(event['id'])
+    date_str = event.get('date')
+    if not date_str: return None
+    game_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%MZ")
+
+    # Status
+    status_obj = event.get('status', {})
+    status_type = status_obj.get('type', {})
+    status_name = status_type.get('name', 'STATUS_UNKNOWN')
+    status_detail = status_type.get('detail', 'Unknown')
+
+    # Competition data
+    competitions = event.get('competitions', [])
+    if not competitions: return None
+    comp = competitions[0]
+    venue = comp.get('venue', {}).get('fullName', 'Unknown Venue')
+
+    competitors = comp.get('competitors', [])
+    home_comp = next((c for c in competitors if c['homeAway'] == 'home'), None)
+    away_comp = next((c for c in competitors if c['homeAway'] == 'away'), None)
+
+    if not home_comp or not away_comp: return None
+
+    teams = []
+    for c_data in [home_comp, away_comp]:
+        team = c_data.get('team', {})
+        t_id = int(team.get('id', 0))
+        if t_id > 0:
+            teams.append((t_id, team.get('displayName', 'Unknown'), team.get('abbreviation', ''), team.get('logo')))
+
+    return {
+        "id": game_id,
+        "game_date": game_date,
+        "status": status_name,
+        "state": status_type.get('state', ''),
+        "home_id": int(home_comp['id']),
+        "away_id": int(away_comp['id']),
+        "home_score": int(home_comp.get('score', 0) or 0),
+        "away_score": int(away_comp.get('score', 0) or 0),
+        "score_detail": {"status_detail": status_detail, "venue": venue},
+        "teams": teams,
+    }
+
+def save_game(cur, game, league_id, season_db_id):
+    """경기 upsert. 값이 바뀌지 않아 UPDATE가 생략되면 False"""
+    # 다른 수집 스크립트와 같은 id를 다른 날짜로 저장하지 않도록 (db_batch.lock_ids 참고)
+    db_batch.lock_ids(cur, [game["id"]])
+    cur.execute(SQL_GAME, (game["id"], season_db_id, league_id, game["home_id"], game["away_id"], game["game_date"],
+                           game["status"], game["home_score"], game["away_score"], json.dumps(game["score_detail"])))
+    return cur.rowcount > 0
+
 def update_monitor(sport, espn_key, frontend_slug):
     print(f"📡 Updating results for {frontend_slug} ({espn_key})...")
     conn = get_db_connection()
     cur = conn.cursor()
 
     try:
-        # Scoreboard API: 최근/현재 경기 정보 조회
-        url = f"http://site.api.espn.com/apis/site/v2/sports/{sport}/{espn_key}/scoreboard"
-        # dates 파라미터 없이 호출하면 '현재' 윈도우(오늘/어제/내일 등)를 반환함
-        res = requests.get(url)
-        res.raise_for_status()
-        data = res.json()
+        data = fetch_scoreboard(sport, espn_key)
 
         # 1. 리그 정보 동기화
         try:
-            l_data = data['leagues'][0]
-            league_id = int(l_data['id'])
-            league_name = l_data['name']
-            
-            # Frontend slug로 저장하여 매핑 유지
-            sql_league = """
-                INSERT INTO sl_leagues (id, name, slug, sport_id)
-                VALUES (%s, %s, %s, (SELECT id FROM sl_sports WHERE name=%s LIMIT 1))
-                ON CONFLICT (id) DO UPDATE 
-                SET name = EXCLUDED.name, slug = EXCLUDED.slug;
-            """
-            # sport 이름을 sl_sports 테이블의 name과 매칭 (대소문자 주의 필요시 수정)
-            # 여기서는 sport 변수("baseball") -> DB("Baseball") 매핑을 위해 title() 사용 등 고려
-            # 기존 DB sport name이 "Baseball", "Soccer" 등일 수 있음.
-            # safe matching: lowercase check
-            cur.execute(sql_league, (league_id, league_name, frontend_slug, sport.title() if sport != 'mma' else 'MMA'))
-            
-            # 시즌 정보 파싱
-            season_year = l_data.get('season', {}).get('year')
-            season_db_id = None
-            if season_year:
-                cur.execute("SELECT id FROM sl_seasons WHERE league_id=%s AND year=%s", (league_id, season_year))
-                row = cur.fetchone()
-                if row:
-                    season_db_id = row[0]
-                else:
-                    cur.execute("""
-                        INSERT INTO sl_seasons (league_id, year, is_current)
-                        VALUES (%s, %s, true) RETURNING id
-                    """, (league_id, season_year))
-                    season_db_id = cur.fetchone()[0]
-
+            league_id, season_db_id = sync_league(cur, sport, frontend_slug, data)
         except (IndexError, KeyError) as e:
             print(f"⚠️ League info mismatch for {espn_key}: {e}")
             return
@@ -95,76 +189,29 @@ def update_monitor(sport, espn_key, frontend_slug):
         # 2. 경기(Event) 루프
         events = data.get('events', [])
         updated_count = 0
+        unchanged_count = 0
 
         for event in events:
             try:
-                game_id = int(event['id'])
-                date_str = event.get('date')
-                if not date_str: continue
-                game_date = datetime.strptime(date_str, "%Y-%m-%dT%H:%MZ")
-
-                # Status
-                status_obj = event.get('status', {})
-                status_type = status_obj.get('type', {})
-                status_name = status_type.get('name', 'STATUS_UNKNOWN')
-                status_detail = status_type.get('detail', 'Unknown')
-
-                # Competition data
-                competitions = event.get('competitions', [])
-                if not competitions: continue
-                comp = competitions[0]
-                venue = comp.get('venue', {}).get('fullName', 'Unknown Venue')
-
-                competitors = comp.get('competitors', [])
-                home_comp = next((c for c in competitors if c['homeAway'] == 'home'), None)
-                away_comp = next((c for c in competitors if c['homeAway'] == 'away'), None)
-
-                if not home_comp or not away_comp: continue
+                game = parse_scoreboard_event(event)
+                if not game: continue
 
                 # --- [중요] 팀 정보 즉시 동기화 (Upsert) ---
-                for c_data in [home_comp, away_comp]:
-                    team = c_data.get('team', {})
-                    t_id = int(team.get('id', 0))
-                    t_name = team.get('displayName', 'Unknown')
-                    t_code = team.get('abbreviation', '')
-                    t_logo = team.get('logo')
-
-                    if t_id > 0:
-                        sql_team = """
-                            INSERT INTO sl_teams (id, name, code, logo_url)
-                            VALUES (%s, %s, %s, %s)
-                            ON CONFLICT (id) DO UPDATE
-                            SET name = EXCLUDED.name, code = EXCLUDED.code, logo_url = EXCLUDED.logo_url;
-                        """
-                        cur.execute(sql_team, (t_id, t_name, t_code, t_logo))
-
-                home_id = int(home_comp['id'])
-                away_id = int(away_comp['id'])
-                home_score = int(home_comp.get('score', 0) or 0)
-                away_score = int(away_comp.get('score', 0) or 0)
+                for team in game["teams"]:
+                    cur.execute(SQL_TEAM, team)
 
                 # 게임 저장
-                score_detail = {"status_detail": status_detail, "venue": venue}
-                
-                sql_game = """
-                    INSERT INTO sl_games 
-                    (id, season_id, league_id, home_team_id, away_team_id, game_date, status, home_score, away_score, score_detail)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (id) DO UPDATE 
-                    SET status = EXCLUDED.status,
-                        home_score = EXCLUDED.home_score,
-                        away_score = EXCLUDED.away_score,
-                        score_detail = EXCLUDED.score_detail;
-                """
-                cur.execute(sql_game, (game_id, season_db_id, league_id, home_id, away_id, game_date, status_name, home_score, away_score, json.dumps(score_detail)))
-                updated_count += 1
+                if save_game(cur, game, league_id, season_db_id):
+                    updated_count += 1
+                else:
+                    unchanged_count += 1
                 
             except Exception as e:
-                # print(f"Skipping event {event.get('id')}: {e}")
+                print(f"⚠️ Skipping event {event.get('id')}: {e}")
                 continue
 
         conn.commit()
-        print(f"✅ {frontend_slug}: Updated {updated_count} games.")
+        print(f"✅ {frontend_slug}: Updated {updated_count} games ({unchanged_count} unchanged).")
 
     except Exception as e:
         conn.rollback()
@@ -177,4 +224,5 @@ if __name__ == "__main__":
     print("🔄 Starting Live Scoreboard Update...\n")
     for sp, key, slug in TARGET_LEAGUES:
         update_monitor(sp, key, slug)
+    espn_client.print_stats()
     print("\n✨ Update Complete.")
@@ -30,12 +30,15 @@ export default async function HomePage() {
           league_id: leagueDb.id,
           status: { in: ["STATUS_FINAL", "STATUS_FULL_TIME"] },
           game_date: { lte: new Date() }, // 미래 데이터 제외
-          sl_teams_sl_games_home_team_idTosl_teams: { isNot: null }, // 팀 정보 필수
-          sl_teams_sl_games_away_team_idTosl_teams: { isNot: null }
+          home_team_id: { not: null }, // 팀 정보 필수 (FK라서 NULL이 아니면 팀이 있음)
+          away_team_id: { not: null }
         },
-        include: {
-          sl_teams_sl_games_home_team_idTosl_teams: true,
-          sl_teams_sl_games_away_team_idTosl_teams: true
+        select: {
+          game_date: true,
+          home_score: true,
+          away_score: true,
+          sl_teams_sl_games_home_team_idTosl_teams: { select: { name: true, code: true, logo_url: true } },
+          sl_teams_sl_games_away_team_idTosl_teams: { select: { name: true, code: true, logo_url: true } }
         },
         orderBy: { game_date: "desc" }
       }) : null;
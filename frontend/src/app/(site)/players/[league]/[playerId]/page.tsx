@@ -79,10 +79,9 @@ export default async function PlayerPage({ params }: PlayerPageProps) {
                 }
             }
         },
+        // 경기 날짜는 기록 행에도 복사되어 있어 (player_id, game_date) 인덱스로 최신 10건만 읽음
         orderBy: {
-            sl_games: {
-                game_date: 'desc'
-            }
+            game_date: 'desc'
         },
         take: 10
     });
@@ -1,7 +1,7 @@
 "use client";
 
 import Link from "next/link";
-import { useState, useMemo, useEffect } from "react";
+import { useState, useEffect } from "react";
 import { LEAGUES } from "../../config/leagues";
 import SafeImage from "@/components/SafeImage";
 import UnderConstructionCard from "@/components/UnderConstructionCard";
@@ -30,18 +30,45 @@ interface Squad {
     sl_teams: Team | null;
 }
 
+interface PlayersResponse {
+    items: Squad[];
+    nextCursor: string | null;
+    teams: Team[] | null;
+}
+
 interface LeagueInfo {
     name: string;
     sport: string;
     country?: string;
 }
 
+// 선수 목록 한 페이지 (q: 이름 앞부분 검색, team: 팀 id, cursor: 이전 페이지의 nextCursor)
+// 첫 페이지 응답에는 팀 선택 목록(teams)이 함께 옴
+function fetchPlayers(league: string, q: string, team: string, cursor: string | null): Promise<PlayersResponse> {
+    const search = new URLSearchParams({ league });
+    if (q) search.set("q", q);
+    if (team !== "all") search.set("team", team);
+    if (cursor) search.set("cursor", cursor);
+    return fetch(`/api/players?${search.toString()}`)
+        .then(res => res.json())
+        .then(data => ({
+            items: Array.isArray(data?.items) ? data.items : [],
+            nextCursor: data?.nextCursor ?? null,
+            teams: Array.isArray(data?.teams) ? data.teams : null
+        }));
+}
+
 export default function PlayersPage({ params }: { params: Promise<{ league: string }> }) {
     const [leagueSlug, setLeagueSlug] = useState<string>("");
     const [squads, setSquads] = useState<Squad[]>([]);
     const [leagueInfo, setLeagueInfo] = useState<LeagueInfo | null>(null);
     const [loading, setLoading] = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
     const [searchTerm, setSearchTerm] = useState("");
+    const [query, setQuery] = useState("");
+    const [selectedTeam, setSelectedTeam] = useState<string>("all");
+    const [teams, setTeams] = useState<Team[]>([]);
     const teamColorMap: Record<string, string> = {
         SSG: "#fc1c3d",
         WO: "#6b0012",
@@ -78,59 +105,51 @@ export default function PlayersPage({ params }: { params: Promise<{ league: stri
                     country: conf.country
                 });
             }
-
-            if (p.league === "k-league") {
-                setLoading(false);
-                setSquads([]);
-                return;
-            }
-
-            if (p.league) {
-                // Client-side fetch to avoid potential BigInt serialization issues in RSC params
-                fetch(`/api/players?league=${p.league}`)
-                    .then(res => res.json())
-                    .then(data => {
-                        setSquads(Array.isArray(data) ? data : []);
-                        setLoading(false);
-                    })
-                    .catch(err => {
-                        console.error("Failed to fetch players", err);
-                        setLoading(false);
-                    });
-            }
         });
     }, [params]);
 
-    const [selectedTeam, setSelectedTeam] = useState<string>("all");
-
-    const teams = useMemo(() => {
-        const teamMap = new Map();
-        squads.forEach(s => {
-            if (s.sl_teams) {
-                teamMap.set(s.sl_teams.id, s.sl_teams.name);
-            }
-        });
-        return Array.from(teamMap.entries()).map(([id, name]) => ({ id, name }))
-            .sort((a, b) => a.name.localeCompare(b.name));
-    }, [squads]);
-
-    const filteredSquads = useMemo(() => {
-        let result = squads;
+    // 검색어 입력이 멈춘 뒤 서버 검색 (이름 앞부분)
+    useEffect(() => {
+        const timer = setTimeout(() => setQuery(searchTerm.trim()), 300);
+        return () => clearTimeout(timer);
+    }, [searchTerm]);
 
-        if (selectedTeam !== "all") {
-            result = result.filter(s => s.team_id === selectedTeam);
+    // 리그, 검색어 또는 팀이 바뀌면 첫 페이지부터 다시 조회
+    useEffect(() => {
+        if (!leagueSlug) return;
+        if (leagueSlug === "k-league") {
+            setLoading(false);
+            setSquads([]);
+            return;
         }
 
-        if (searchTerm.trim()) {
-            const term = searchTerm.toLowerCase();
-            result = result.filter(s =>
-                s.sl_players?.name?.toLowerCase().includes(term) ||
-                s.sl_teams?.name?.toLowerCase().includes(term)
-            );
-        }
+        let cancelled = false;
+        setLoading(true);
+        fetchPlayers(leagueSlug, query, selectedTeam, null)
+            .then(page => {
+                if (cancelled) return;
+                setSquads(page.items);
+                setNextCursor(page.nextCursor);
+                if (page.teams) setTeams(page.teams);
+            })
+            .catch(err => console.error("Failed to fetch players", err))
+            .finally(() => {
+                if (!cancelled) setLoading(false);
+            });
+        return () => { cancelled = true; };
+    }, [leagueSlug, query, selectedTeam]);
 
-        return result;
-    }, [squads, searchTerm, selectedTeam]);
+    const loadMore = () => {
+        if (!nextCursor || loadingMore) return;
+        setLoadingMore(true);
+        fetchPlayers(leagueSlug, query, selectedTeam, nextCursor)
+            .then(page => {
+                setSquads(prev => [...prev, ...page.items]);
+                setNextCursor(page.nextCursor);
+            })
+            .catch(err => console.error("Failed to fetch players", err))
+            .finally(() => setLoadingMore(false));
+    };
 
     if (leagueSlug === "k-league") {
         return (
@@ -177,14 +196,14 @@ export default function PlayersPage({ params }: { params: Promise<{ league: stri
                         </select>
                         <input
                             type="text"
-                            placeholder="선수 또는 팀 이름으로 검색..."
+                            placeholder="선수 이름으로 검색..."
                             className="searchInput"
                             value={searchTerm}
                             onChange={(e) => setSearchTerm(e.target.value)}
                         />
                     </div>
                     <div className="gameCount">
-                        {loading ? "불러오는 중..." : `총 ${filteredSquads.length}명의 선수`}
+                        {loading ? "불러오는 중..." : `총 ${squads.length}명의 선수${nextCursor ? "+" : ""}`}
                     </div>
                 </div>
 
@@ -199,8 +218,8 @@ export default function PlayersPage({ params }: { params: Promise<{ league: stri
                                 </div>
                             </div>
                         ))
-                    ) : filteredSquads.length > 0 ? (
-                        filteredSquads.map((squad) => {
+                    ) : squads.length > 0 ? (
+                        squads.map((squad) => {
                             const primaryName = squad.sl_players?.name?.trim();
                             const fallbackName = [squad.sl_players?.lastname, squad.sl_players?.firstname]
                                 .filter(Boolean)
@@ -245,6 +264,12 @@ export default function PlayersPage({ params }: { params: Promise<{ league: stri
                         </div>
                     )}
                 </div>
+
+                {!loading && nextCursor && (
+                    <button className="loadMoreButton" onClick={loadMore} disabled={loadingMore}>
+                        {loadingMore ? "불러오는 중..." : "더 보기"}
+                    </button>
+                )}
             </div>
         </div>
     );
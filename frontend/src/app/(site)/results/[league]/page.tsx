@@ -48,13 +48,20 @@ export default async function ResultsPage({ params }: PageProps) {
             game_date: {
                 lte: now // 미래 데이터(테스트/더미) 제외
             },
-            // 실제 팀 정보가 존재하는 데이터만 조회 (Broken Link 방지)
-            sl_teams_sl_games_home_team_idTosl_teams: { isNot: null },
-            sl_teams_sl_games_away_team_idTosl_teams: { isNot: null }
+            // 실제 팀 정보가 존재하는 데이터만 조회 (Broken Link 방지, FK라서 NULL이 아니면 팀이 있음)
+            home_team_id: { not: null },
+            away_team_id: { not: null }
         },
-        include: {
-            sl_teams_sl_games_home_team_idTosl_teams: true,
-            sl_teams_sl_games_away_team_idTosl_teams: true
+        // 화면에 쓰는 컬럼만 조회 (idx_games_results 부분 인덱스 순서대로 20건)
+        select: {
+            id: true,
+            game_date: true,
+            status: true,
+            home_score: true,
+            away_score: true,
+            score_detail: true,
+            sl_teams_sl_games_home_team_idTosl_teams: { select: { name: true, logo_url: true } },
+            sl_teams_sl_games_away_team_idTosl_teams: { select: { name: true, logo_url: true } }
         },
         orderBy: {
             game_date: 'desc'
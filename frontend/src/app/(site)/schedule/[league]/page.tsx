@@ -48,9 +48,16 @@ export default async function SchedulePage({ params }: PageProps) {
                 gte: new Date()
             }
         },
-        include: {
-            sl_teams_sl_games_home_team_idTosl_teams: true,
-            sl_teams_sl_games_away_team_idTosl_teams: true
+        // 화면에 쓰는 컬럼만 조회 (idx_games_upcoming 부분 인덱스 순서대로 20건)
+        select: {
+            id: true,
+            game_date: true,
+            status: true,
+            home_score: true,
+            away_score: true,
+            score_detail: true,
+            sl_teams_sl_games_home_team_idTosl_teams: { select: { name: true, logo_url: true } },
+            sl_teams_sl_games_away_team_idTosl_teams: { select: { name: true, logo_url: true } }
         },
         orderBy: {
             game_date: 'asc'
@@ -0,0 +1,56 @@
+import { NextRequest, NextResponse } from "next/server";
+import { Prisma } from "@prisma/client";
+import { prisma } from "@/lib/prisma";
+
+// 순위표는 backend/leaderboards.py가 수집 후 미리 계산해 둔 sl_leaderboards를 읽기만 합니다.
+// (시즌, 스탯) 기본 키 순서대로 한 번의 쿼리로 조회합니다.
+const MAX_LIMIT = 50;
+
+interface LeaderboardRow {
+    rank: number;
+    player_id: bigint;
+    player_name: string | null;
+    team_id: bigint | null;
+    team_name: string | null;
+    value: number;
+    year: number;
+}
+
+export async function GET(request: NextRequest) {
+    const { searchParams } = new URL(request.url);
+    const leagueSlug = searchParams.get("league");
+    const stat = searchParams.get("stat");
+    const yearParam = searchParams.get("year");
+    const limit = Math.min(Math.max(Number(searchParams.get("limit")) || 10, 1), MAX_LIMIT);
+
+    if (!leagueSlug || !stat) {
+        return NextResponse.json({ error: "League slug and stat are required" }, { status: 400 });
+    }
+    const year = yearParam ? Number(yearParam) : null;
+    if (yearParam && !Number.isInteger(year)) {
+        return NextResponse.json({ error: "Invalid year" }, { status: 400 });
+    }
+
+    try {
+        // 연도를 주지 않으면 현재 시즌
+        const seasonFilter = year === null ? Prisma.sql`se.is_current` : Prisma.sql`se.year = ${year}`;
+        const rows = await prisma.$queryRaw<LeaderboardRow[]>`
+            SELECT b.rank, b.player_id, b.player_name, b.team_id, b.team_name, b.value, se.year
+            FROM sl_leagues l
+            JOIN sl_seasons se ON se.league_id = l.id
+            JOIN sl_leaderboards b ON b.season_id = se.id AND b.stat_key = ${stat}
+            WHERE l.slug = ${leagueSlug} AND ${seasonFilter}
+            ORDER BY b.rank, b.season_id
+            LIMIT ${limit}
+        `;
+
+        return NextResponse.json(rows.map(row => ({
+            ...row,
+            player_id: row.player_id.toString(),
+            team_id: row.team_id === null ? null : row.team_id.toString(),
+        })));
+    } catch (error) {
+        console.error("API Leaderboards Error:", error);
+        return NextResponse.json({ error: "Internal Server Error" }, { status: 500 });
+    }
+}
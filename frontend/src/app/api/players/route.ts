@@ -1,57 +1,172 @@
 import { NextRequest, NextResponse } from "next/server";
+import { Prisma } from "@prisma/client";
 import { prisma } from "@/lib/prisma";
+import { getCached, setCached } from "@/lib/apiCache";
+
+// 선수 목록 (현재 시즌 선수단)
+// - 선수 이름, 선수단 id 순 keyset 페이지네이션: ?cursor=<이전 응답의 nextCursor>
+// - 검색: ?q=<이름 앞부분> (대소문자 구분 없음, idx_players_name_lower 조회, 팀 이름은 검색하지 않음)
+// - 팀 필터: ?team=<sl_teams.id>
+// - 첫 페이지(cursor 없음) 응답에는 팀 선택용 시즌 전체 팀 목록(teams)을 함께 담음
+// - 화면에 쓰는 컬럼만 조회하고, 응답은 (리그, 시즌, cursor, q, team, limit) 단위로 메모리 캐시
+const DEFAULT_LIMIT = 60;
+const MAX_LIMIT = 200;
+
+interface SquadRow {
+    id: number;
+    player_id: bigint;
+    team_id: bigint | null;
+    position: string | null;
+    jersey_number: number | null;
+    name: string;
+    firstname: string | null;
+    lastname: string | null;
+    photo_url: string | null;
+    team_name: string | null;
+    team_code: string | null;
+}
+
+// cursor: 마지막 행의 (선수 이름, 선수단 id)
+function encodeCursor(name: string, id: number) {
+    return Buffer.from(JSON.stringify([name, id])).toString("base64url");
+}
+
+// LIKE 패턴용 이스케이프 (%, _ 와 ESCAPE 문자 \ 자체)
+function escapeLike(value: string) {
+    return value.replace(/[\\%_]/g, "\\$&");
+}
+
+function decodeCursor(cursor: string): [string, number] | null {
+    try {
+        const [name, id] = JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"));
+        return typeof name === "string" && Number.isInteger(id) ? [name, id] : null;
+    } catch {
+        return null;
+    }
+}
+
+// 시즌 선수단에 있는 팀 목록 (불러온 페이지와 관계없이 팀 선택 목록을 채움)
+async function seasonTeams(seasonId: number): Promise<{ id: string; name: string }[]> {
+    const key = `players:teams:${seasonId}`;
+    const cached = getCached(key);
+    if (cached !== null) return JSON.parse(cached);
+
+    const rows = await prisma.$queryRaw<{ id: bigint; name: string }[]>`
+        SELECT DISTINCT t.id, t.name
+        FROM sl_player_squads sq
+        JOIN sl_teams t ON t.id = sq.team_id
+        WHERE sq.season_id = ${seasonId}
+        ORDER BY t.name
+    `;
+    const teams = rows.map(row => ({ id: row.id.toString(), name: row.name }));
+    setCached(key, JSON.stringify(teams));
+    return teams;
+}
+
+async function currentSeasonId(leagueSlug: string): Promise<number | null> {
+    const key = `players:season:${leagueSlug}`;
+    const cached = getCached(key);
+    if (cached !== null) return JSON.parse(cached);
+
+    const leagueDb = await prisma.sl_leagues.findFirst({
+        where: { slug: leagueSlug },
+        select: {
+            sl_seasons: {
+                where: { is_current: true },
+                select: { id: true },
+                take: 1
+            }
+        }
+    });
+    const seasonId = leagueDb?.sl_seasons[0]?.id ?? null;
+    setCached(key, JSON.stringify(seasonId));
+    return seasonId;
+}
 
 export async function GET(request: NextRequest) {
     const { searchParams } = new URL(request.url);
     const leagueSlug = searchParams.get("league");
+    const cursorParam = searchParams.get("cursor") || "";
+    const query = searchParams.get("q")?.trim() || "";
+    const teamParam = searchParams.get("team") || "";
+    const limit = Math.min(Math.max(Number(searchParams.get("limit")) || DEFAULT_LIMIT, 1), MAX_LIMIT);
 
     if (!leagueSlug) {
         return NextResponse.json({ error: "League slug is required" }, { status: 400 });
     }
+    const cursor = cursorParam ? decodeCursor(cursorParam) : null;
+    if (cursorParam && !cursor) {
+        return NextResponse.json({ error: "Invalid cursor" }, { status: 400 });
+    }
+    if (teamParam && !/^\d+$/.test(teamParam)) {
+        return NextResponse.json({ error: "Invalid team" }, { status: 400 });
+    }
 
     try {
-        // 리그 정보 및 현재 시즌 조회
-        const leagueDb = await prisma.sl_leagues.findFirst({
-            where: { slug: leagueSlug },
-            include: {
-                sl_seasons: {
-                    where: { is_current: true },
-                    take: 1
-                }
-            }
-        });
+        const seasonId = await currentSeasonId(leagueSlug);
+        if (seasonId === null) {
+            return NextResponse.json({ items: [], nextCursor: null, teams: [] });
+        }
 
-        if (!leagueDb || !leagueDb.sl_seasons[0]) {
-            return NextResponse.json([]);
+        const cacheKey = `players:${leagueSlug}:${seasonId}:${cursorParam}:${query}:${teamParam}:${limit}`;
+        const cached = getCached(cacheKey);
+        if (cached !== null) {
+            return new NextResponse(cached, { headers: { "Content-Type": "application/json" } });
         }
 
-        const currentSeason = leagueDb.sl_seasons[0];
+        // 이름 앞부분 검색: lower(name) text_pattern_ops 인덱스는 DB collation과 관계없이 'abc%' 패턴에 사용됨
+        const search = query
+            ? Prisma.sql`AND lower(p.name) LIKE ${escapeLike(query.toLowerCase()) + "%"}`
+            : Prisma.empty;
+        const team = teamParam
+            ? Prisma.sql`AND sq.team_id = ${BigInt(teamParam)}`
+            : Prisma.empty;
+        const after = cursor
+            ? Prisma.sql`AND (p.name, sq.id) > (${cursor[0]}, ${cursor[1]})`
+            : Prisma.empty;
 
-        // 해당 리그/시즌의 선수단 조회
-        const squads = await prisma.sl_player_squads.findMany({
-            where: {
-                season_id: currentSeason.id
-            },
-            include: {
-                sl_players: true,
-                sl_teams: true
+        // 다음 페이지가 있는지 알기 위해 하나 더 조회
+        const rows = await prisma.$queryRaw<SquadRow[]>`
+            SELECT sq.id, sq.player_id, sq.team_id, sq.position, sq.jersey_number,
+                   p.name, p.firstname, p.lastname, p.photo_url,
+                   t.name AS team_name, t.code AS team_code
+            FROM sl_player_squads sq
+            JOIN sl_players p ON p.id = sq.player_id
+            LEFT JOIN sl_teams t ON t.id = sq.team_id
+            WHERE sq.season_id = ${seasonId} ${search} ${team} ${after}
+            ORDER BY p.name, sq.id
+            LIMIT ${limit + 1}
+        `;
+
+        const page = rows.slice(0, limit);
+        const last = page[page.length - 1];
+        const nextCursor = rows.length > limit && last ? encodeCursor(last.name, last.id) : null;
+
+        // BigInt는 응답 객체를 만들 때 한 번에 문자열로 변환
+        const items = page.map(row => ({
+            id: row.id,
+            player_id: row.player_id.toString(),
+            team_id: row.team_id === null ? null : row.team_id.toString(),
+            position: row.position,
+            jersey_number: row.jersey_number,
+            sl_players: {
+                id: row.player_id.toString(),
+                name: row.name,
+                firstname: row.firstname,
+                lastname: row.lastname,
+                photo_url: row.photo_url
             },
-            take: 200, // Increase limit for better search experience
-            orderBy: {
-                sl_players: {
-                    name: 'asc'
-                }
+            sl_teams: row.team_id === null ? null : {
+                id: row.team_id.toString(),
+                name: row.team_name,
+                code: row.team_code
             }
-        });
-
-        // BigInt serialization handle
-        const serializedSquads = JSON.parse(
-            JSON.stringify(squads, (key, value) =>
-                typeof value === 'bigint' ? value.toString() : value
-            )
-        );
+        }));
 
-        return NextResponse.json(serializedSquads);
+        const teams = cursorParam ? undefined : await seasonTeams(seasonId);
+        const body = JSON.stringify({ items, nextCursor, teams });
+        setCached(cacheKey, body);
+        return new NextResponse(body, { headers: { "Content-Type": "application/json" } });
     } catch (error) {
         console.error("API Players Error:", error);
         return NextResponse.json({ error: "Internal Server Error" }, { status: 500 });
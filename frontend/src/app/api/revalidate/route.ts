@@ -0,0 +1,14 @@
+import { NextRequest, NextResponse } from "next/server";
+import { clearCache } from "@/lib/apiCache";
+
+// 수집 완료 알림 (backend/sync_master.py가 SYNC_REVALIDATE_URL로 호출)
+// 헤더 x-sync-token 이 SYNC_REVALIDATE_TOKEN 과 같을 때만 API 캐시를 비웁니다.
+export async function POST(request: NextRequest) {
+    const token = process.env.SYNC_REVALIDATE_TOKEN;
+    if (!token || request.headers.get("x-sync-token") !== token) {
+        return NextResponse.json({ error: "Forbidden" }, { status: 403 });
+    }
+
+    const cleared = clearCache();
+    return NextResponse.json({ cleared });
+}
@@ -0,0 +1,54 @@
+// API 응답 메모리 캐시 (직렬화된 JSON 문자열을 그대로 보관)
+// 수집(sync_master.py)이 끝나면 /api/revalidate 호출로 비워지고, 호출이 없어도 TTL이 지나면 만료됩니다.
+// 인스턴스(프로세스)마다 따로 가지는 캐시입니다.
+
+const TTL_MS = Number(process.env.API_CACHE_TTL_MS ?? 10 * 60 * 1000);
+const MAX_ENTRIES = Number(process.env.API_CACHE_MAX_ENTRIES ?? 500);
+
+interface CacheEntry {
+    body: string;
+    expires: number;
+}
+
+// 개발 모드의 핫 리로드 후에도 같은 캐시를 쓰도록 globalThis에 보관 (lib/prisma.ts와 같은 방식)
+const globalForCache = globalThis as unknown as { apiCache?: Map<string, CacheEntry> };
+const cache = globalForCache.apiCache ?? new Map<string, CacheEntry>();
+globalForCache.apiCache = cache;
+
+export function getCached(key: string): string | null {
+    const entry = cache.get(key);
+    if (!entry) return null;
+    if (entry.expires < Date.now()) {
+        cache.delete(key);
+        return null;
+    }
+    return entry.body;
+}
+
+export function setCached(key: string, body: string) {
+    if (TTL_MS <= 0) return;
+    cache.delete(key);
+    // Map은 넣은 순서를 유지하므로 가장 오래된 항목부터 제거
+    while (cache.size >= MAX_ENTRIES) {
+        const oldest = cache.keys().next().value;
+        if (oldest === undefined) break;
+        cache.delete(oldest);
+    }
+    cache.set(key, { body, expires: Date.now() + TTL_MS });
+}
+
+export function clearCache(prefix?: string): number {
+    if (!prefix) {
+        const size = cache.size;
+        cache.clear();
+        return size;
+    }
+    let cleared = 0;
+    for (const key of Array.from(cache.keys())) {
+        if (key.startsWith(prefix)) {
+            cache.delete(key);
+            cleared++;
+        }
+    }
+    return cleared;
+}